@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""거래 아카이브 조회 스크립트 (로그 정규식 분석 대체)
+
+사용 예:
+    python archive_query.py --date 2026-01-14
+    python archive_query.py --kind raw --from 2026-01-10 --to 2026-01-14 --status 취소
+    python archive_query.py --customer 모드니퍼스트 --csv out.csv
+"""
+
+import argparse
+import sys
+from datetime import date
+from core.archive import TransactionArchive, KINDS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="거래 아카이브 조회")
+    parser.add_argument("--kind", choices=KINDS, default="uploaded", help="raw(조회 원본) / uploaded(업로드 완료)")
+    parser.add_argument("--date", type=date.fromisoformat, help="보관 일자 (YYYY-MM-DD)")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="시작 일자")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="종료 일자")
+    parser.add_argument("--customer", help="거래처명 (부분 일치)")
+    parser.add_argument("--auth-no", help="승인번호")
+    parser.add_argument("--status", help="상태 (승인/취소)")
+    parser.add_argument("--csv", help="결과를 CSV로 저장")
+    args = parser.parse_args()
+
+    date_from = args.date or args.date_from
+    date_to = args.date or args.date_to
+
+    df = TransactionArchive().query(
+        kind=args.kind, date_from=date_from, date_to=date_to,
+        customer=args.customer, auth_no=args.auth_no, status=args.status
+    )
+
+    if df.empty:
+        print("조건에 맞는 데이터가 없습니다.")
+        return 0
+
+    if args.csv:
+        df.to_csv(args.csv, index=False, encoding="utf-8-sig")
+        print(f"{len(df)}건 저장: {args.csv}")
+    else:
+        print(df.to_string(index=False))
+
+    amounts = df["amount"].dropna()
+    print()
+    print(f"총 {len(df)}건 / 금액 합계 {int(amounts.sum()):,}원 / 사이클 {df['cycle_id'].nunique()}회")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
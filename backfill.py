@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""장애 복구용 기간 일괄 처리 (일자별 분할 + 병렬 브라우저 컨텍스트)
+
+상주 프로세스(main.py)를 중지한 뒤 실행한다. 중단되면 같은 명령으로 다시 실행하면
+완료된 일자는 건너뛰고 남은 일자부터 이어서 처리한다 (backfill_progress.json).
+
+사용 예:
+    python backfill.py --from 2026-01-10 --to 2026-01-14
+    python backfill.py --from 2026-01-10 --to 2026-01-14 --workers 4 --chunk-size 30
+    python backfill.py --from 2026-01-10 --to 2026-01-10 --restart
+"""
+
+import argparse
+import sys
+from datetime import date
+from core.process_lock import ProcessLock
+from modules.backfill import BackfillRunner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기간 일괄 처리 (backfill)")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, required=True, help="시작 일자 (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, required=True, help="종료 일자 (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, help="병렬 브라우저 컨텍스트 수 (기본 backfill.workers)")
+    parser.add_argument("--chunk-size", type=int, help="업로드 청크 행 수 (기본 backfill.chunk_size)")
+    parser.add_argument("--restart", action="store_true", help="진행 체크포인트를 무시하고 모든 일자 재처리")
+    args = parser.parse_args()
+
+    if args.date_from > args.date_to:
+        parser.error("--from이 --to보다 늦습니다")
+
+    # 상주 프로세스와 원장을 동시에 갱신하지 않도록 같은 락 사용
+    lock = ProcessLock("runtime.lock")
+    if not lock.acquire():
+        print(f"[ERROR] 실행 중인 프로세스가 있습니다 (PID: {lock.holder()}). 중지 후 실행하세요.")
+        return 1
+    try:
+        summary = BackfillRunner(args.date_from, args.date_to, workers=args.workers,
+                                 chunk_size=args.chunk_size, restart=args.restart).run()
+    finally:
+        lock.release()
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""변환/중복체크 핫패스 벤치마크 (오프라인, 브라우저 불필요)
+
+- ERP 결제내역 그리드 형태의 합성 데이터 생성 (한글 거래처명, 콤마 금액, 취소 행, 승인번호 누락)
+- TransformerModule.transform / 업로드 기록 로드·저장 / 붙여넣기 텍스트 직렬화 측정
+- 처리량(행/초)과 최대 메모리(tracemalloc) 측정 후 JSON으로 저장
+
+사용 예:
+    python benchmarks/bench_hotpaths.py
+    python benchmarks/bench_hotpaths.py --sizes 1000 10000 --repeat 3
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+import subprocess
+from pathlib import Path
+from datetime import datetime, timedelta
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.logger import logger
+from core.tracing import tracer
+from modules.transformer import TransformerModule
+from modules.uploader import prepare_paste_rows, build_paste_text
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+CUSTOMERS = [
+    "감사합니다", "인테리어 웍스", "(주)안양철물만돌이", "(주) 맑은창", "리스토어디자인",
+    "(주)모드니퍼스트", "동아인테리어", "그린인테리어(내손동)", "사팔우드", "나래설비",
+    "다함인테리어", "주식회사 스페이스류",
+]
+ACQUIRERS = ["KB국민카드", "신한카드", "삼성카드", "현대카드", "BC카드", "롯데카드", ""]
+
+
+def generate_rows(n: int, seed: int = 42) -> list:
+    """결제내역조회 그리드(ReaderModule.read_payment_data) 형태의 합성 행"""
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 6, 6, 0, 0)
+    rows = []
+    for i in range(n):
+        ts = base + timedelta(seconds=i * 7)
+        customer = rng.choice(CUSTOMERS)
+        if customer == "감사합니다":
+            customer = f"감사합니다 010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+        status = "취소" if rng.random() < 0.05 else "승인"
+        rows.append({
+            # 실제 그리드와 같이 초 단위까지 포함 → 작업 일시 키가 고유
+            'date_raw': f"{ts:%Y/%m/%d} {'오전' if ts.hour < 12 else '오후'} {ts:%H:%M:%S}.{i % 1000:03d}",
+            'customer': customer,
+            'amount': f"{rng.randint(1, 500) * 1000:,}",
+            'account': rng.choice(ACQUIRERS),
+            'status': status,
+            'auth_no': "" if rng.random() < 0.03 else f"{rng.randint(0, 99999999):08d}",
+        })
+    return rows
+
+
+def measure(func, repeat: int, track_memory: bool) -> dict:
+    """repeat회 실행 중 최소 시간 + (선택) 1회 추가 실행으로 최대 메모리 측정"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    result = {"seconds_min": min(timings), "seconds_all": timings}
+    if track_memory:
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_mem_mb"] = round(peak / 1024 / 1024, 2)
+    return result
+
+
+def bench_size(n: int, workdir: Path, repeat: int, track_memory: bool) -> dict:
+    raw = generate_rows(n)
+    transformer = TransformerModule()
+    transformer.records_file = workdir / "uploaded_records.json"
+    if transformer.records_file.exists():
+        transformer.records_file.unlink()
+
+    results = {}
+
+    # 1. 변환 (빈 원장 기준: 모든 행이 업로드 대상)
+    results["transform"] = measure(lambda: transformer.transform(raw), repeat, track_memory)
+    paste_rows, keys, _ = transformer.transform(raw)
+
+    # 2. 업로드 기록 저장/로드 사이클 (main.single_cycle의 원장 갱신과 동일한 순서)
+    def ledger_cycle():
+        records = transformer.load_uploaded_records()
+        records.update(keys)
+        transformer.save_uploaded_records(records)
+        transformer.load_uploaded_records()
+
+    results["ledger_cycle"] = measure(ledger_cycle, repeat, track_memory)
+
+    # 3. 원장이 채워진 상태의 변환 (로컬 중복 체크 경로)
+    results["transform_dedup"] = measure(lambda: transformer.transform(raw), repeat, track_memory)
+
+    # 4. 붙여넣기 텍스트 직렬화
+    results["paste_text"] = measure(lambda: build_paste_text(prepare_paste_rows(paste_rows)), repeat, track_memory)
+
+    for r in results.values():
+        r["rows_per_sec"] = round(n / r["seconds_min"]) if r["seconds_min"] > 0 else None
+    results["ledger_file_mb"] = round(transformer.records_file.stat().st_size / 1024 / 1024, 2)
+    return results
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True)
+        return out.stdout.strip()
+    except Exception:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="변환/중복체크 핫패스 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=1, help="크기별 반복 횟수 (최소값 기록)")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 측정 생략")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/bench_<시각>.json)")
+    args = parser.parse_args()
+
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        # 로그는 임시 파일에 그대로 기록(실제 I/O 비용 포함), 콘솔 출력만 억제
+        logger.log_file = workdir / "bench.log"
+        tracer.trace_dir = workdir / "traces"
+        for n in args.sizes:
+            print(f"[BENCH] {n:,}행 측정 중...", file=sys.stderr)
+            with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+                result = bench_size(n, workdir, args.repeat, not args.no_memory)
+            report["sizes"][str(n)] = result
+            for name, r in result.items():
+                if isinstance(r, dict):
+                    mem = f", peak {r['peak_mem_mb']}MB" if "peak_mem_mb" in r else ""
+                    print(f"   {name:16s} {r['seconds_min']:8.3f}s  {r['rows_per_sec'] or 0:>12,} rows/s{mem}",
+                          file=sys.stderr)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[BENCH] 결과 저장: {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
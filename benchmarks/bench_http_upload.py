@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""HTTP 업로드 백엔드 벤치마크 (로컬 스텁 서버 대상, 오프라인)
+
+- stub_erp_server를 같은 프로세스의 백그라운드 스레드로 띄우고 HttpUploaderModule로 전송
+- 배치 크기 / 동시성 조합별 처리량과 행 단위 실패 처리 결과를 JSON으로 저장
+
+사용 예:
+    python benchmarks/bench_http_upload.py --rows 10000 --concurrency 1 4 8 --fail-rate 0.01
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import contextlib
+from pathlib import Path
+from datetime import datetime
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.bench_hotpaths import generate_rows, git_revision, RESULTS_DIR
+from core.logger import logger
+from core.tracing import tracer
+from modules.transformer import TransformerModule
+from modules.http_uploader import HttpUploaderModule
+from stub_erp_server import start_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP 업로드 백엔드 벤치마크")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--latency-ms", type=int, default=20, help="스텁 배치당 처리 지연")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    server, state = start_server(port=0, latency_ms=args.latency_ms, fail_rate=args.fail_rate, seed=1)
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+
+    workdir = tempfile.TemporaryDirectory()
+    logger.log_file = Path(workdir.name) / "bench.log"
+    tracer.trace_dir = Path(workdir.name) / "traces"
+    transformer = TransformerModule()
+    transformer.records_file = Path(workdir.name) / "uploaded_records.json"
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        paste_rows, _, _ = transformer.transform(generate_rows(args.rows))
+
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "rows": len(paste_rows),
+        "stub_latency_ms": args.latency_ms,
+        "fail_rate": args.fail_rate,
+        "runs": [],
+    }
+
+    for batch_size in args.batch_sizes:
+        for concurrency in args.concurrency:
+            uploader = HttpUploaderModule(endpoint, dry_run=False)  # 테스트 모드에서도 스텁 서버로 실제 전송
+            uploader.batch_size = batch_size
+            uploader.concurrency = concurrency
+            uploader.pool.close()
+            uploader.pool = type(uploader.pool)(endpoint, size=concurrency)
+
+            started = time.perf_counter()
+            with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+                uploader.upload([list(r) for r in paste_rows])
+            elapsed = time.perf_counter() - started
+            result = uploader.last_result
+            run = {
+                "batch_size": batch_size,
+                "concurrency": concurrency,
+                "seconds": round(elapsed, 3),
+                "rows_per_sec": round(len(paste_rows) / elapsed),
+                "status": result["status"],
+                "success": result["success"],
+                "failed_rows": len(result["failed_rows"]),
+            }
+            report["runs"].append(run)
+            uploader.pool.close()
+            print(f"[BENCH] batch {batch_size:>5} x conc {concurrency:>2}: {elapsed:7.3f}s "
+                  f"{run['rows_per_sec']:>10,} rows/s ({run['status']}, 실패 {run['failed_rows']}건)", file=sys.stderr)
+
+    server.shutdown()
+    workdir.cleanup()
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench_http_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[BENCH] 결과 저장: {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import itertools
+import pandas as pd
+from pathlib import Path
+from datetime import datetime, date
+from core.logger import logger
+from utils.config import ARCHIVE_CONFIG
+
+KINDS = ("raw", "uploaded")
+
+# 같은 사이클이 여러 번 보관하는 경우(청크별 저장, 재시도, 아웃박스 배치) 파일 이름 구분용
+_part_seq = itertools.count(1)
+
+
+class TransactionArchive:
+    """사이클별 원본/업로드 행을 날짜 파티션 컬럼형 파일(Parquet/Feather)로 보관"""
+
+    def __init__(self, base_dir=None, fmt=None):
+        self.base_dir = Path(base_dir or ARCHIVE_CONFIG.get("dir", "archive"))
+        self.fmt = fmt or ARCHIVE_CONFIG.get("format", "parquet")  # 'parquet' | 'feather'
+        self.ext = ".feather" if self.fmt == "feather" else ".parquet"
+
+    def _partition_dir(self, kind: str, day: date) -> Path:
+        return self.base_dir / kind / f"date={day.isoformat()}"
+
+    def _write(self, kind: str, df: pd.DataFrame, cycle_id: str) -> Path:
+        now = datetime.now()
+        part_dir = self._partition_dir(kind, now.date())
+        part_dir.mkdir(parents=True, exist_ok=True)
+        # 사이클 ID + 보관 시각 + 순번: 같은 사이클의 이전 보관 파일을 덮어쓰지 않음
+        path = part_dir / f"{cycle_id}-{now.strftime('%H%M%S%f')}-{next(_part_seq)}{self.ext}"
+        if self.fmt == "feather":
+            df.reset_index(drop=True).to_feather(path)
+        else:
+            df.to_parquet(path, index=False)
+        return path
+
+    @staticmethod
+    def _txn_date(date_raw: str) -> str:
+        # '2026/01/14 오후 ...' -> '2026-01-14'
+        return date_raw.split(' ')[0].replace('/', '-') if date_raw else ""
+
+    @staticmethod
+    def _amount(value: str):
+        text = "".join(str(value).split()).replace(',', '')
+        try:
+            return int(text)
+        except ValueError:
+            return None
+
+    def append_raw(self, raw_data: list, cycle_id: str):
+        """ERP에서 읽은 원본 행 보관"""
+        if not raw_data:
+            return None
+        df = pd.DataFrame([{
+            "cycle_id": cycle_id,
+            "archived_at": datetime.now().isoformat(timespec="seconds"),
+            "record_key": row.get("date_raw", ""),
+            "txn_date": self._txn_date(row.get("date_raw", "")),
+            "customer": row.get("customer", ""),
+            "amount": self._amount(row.get("amount", "")),
+            "account": row.get("account", ""),
+            "status": row.get("status", ""),
+            "auth_no": row.get("auth_no", ""),
+        } for row in raw_data])
+        return self._write("raw", df, cycle_id)
+
+    def append_uploaded(self, paste_rows: list, record_keys: list, raw_data: list, cycle_id: str):
+        """업로드 완료된 입금보고서 행 보관 (원본 행과 작업 일시로 연결)"""
+        if not paste_rows:
+            return None
+        raw_by_key = {row.get("date_raw", ""): row for row in raw_data or []}
+        records = []
+        for row, key in zip(paste_rows, record_keys):
+            raw = raw_by_key.get(key, {})
+            records.append({
+                "cycle_id": cycle_id,
+                "archived_at": datetime.now().isoformat(timespec="seconds"),
+                "record_key": key,
+                "txn_date": row[0].replace('/', '-'),
+                "account": row[3],
+                "customer_code": row[5],
+                "customer": row[6],
+                "amount": self._amount(row[7]),
+                "status": raw.get("status", ""),
+                "auth_no": raw.get("auth_no", ""),
+            })
+        return self._write("uploaded", pd.DataFrame(records), cycle_id)
+
+    def query(self, kind: str = "uploaded", date_from: date = None, date_to: date = None,
+              customer: str = None, auth_no: str = None, status: str = None) -> pd.DataFrame:
+        """파티션 범위만 읽어 조건 필터링 (date_from/date_to는 보관 일자 기준)"""
+        kind_dir = self.base_dir / kind
+        if not kind_dir.exists():
+            return pd.DataFrame()
+
+        frames = []
+        for part_dir in sorted(kind_dir.glob("date=*")):
+            try:
+                day = date.fromisoformat(part_dir.name.split("=", 1)[1])
+            except ValueError:
+                continue
+            if (date_from and day < date_from) or (date_to and day > date_to):
+                continue
+            for path in sorted(part_dir.glob(f"*{self.ext}")):
+                df = pd.read_feather(path) if self.fmt == "feather" else pd.read_parquet(path)
+                df["archive_date"] = day.isoformat()
+                frames.append(df)
+
+        if not frames:
+            return pd.DataFrame()
+
+        df = pd.concat(frames, ignore_index=True)
+        if customer:
+            df = df[df["customer"].str.contains(customer, regex=False, na=False)]
+        if auth_no:
+            df = df[df["auth_no"] == auth_no]
+        if status:
+            df = df[df["status"] == status]
+        return df.reset_index(drop=True)
+
+
+def archive_cycle(kind: str, cycle_id: str, *args):
+    """사이클 흐름을 막지 않도록 보관 실패는 경고만 남김"""
+    if not ARCHIVE_CONFIG.get("enabled", True):
+        return
+    try:
+        archive = TransactionArchive()
+        if kind == "raw":
+            path = archive.append_raw(*args, cycle_id=cycle_id)
+        else:
+            path = archive.append_uploaded(*args, cycle_id=cycle_id)
+        if path:
+            logger.info(f"[ARCHIVE] {kind} 행 보관 완료: {path}")
+    except Exception as e:
+        logger.warning(f"[WARN] 거래 아카이브 기록 실패 ({kind}): {e}")
@@ -4,16 +4,19 @@ from pathlib import Path
 from datetime import datetime
 from playwright.sync_api import sync_playwright
 from core.logger import logger
+from core.tracing import traced
 from utils.config import HEADLESS_MODE
 
 class BrowserManager:
-    def __init__(self):
+    def __init__(self, session_file=None, cdp_endpoint=None):
         self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
-        self.session_file = Path("sessions/session.json")
+        self.session_file = Path(session_file or "sessions/session.json")
+        self.cdp_endpoint = cdp_endpoint  # 공유 브라우저 프로세스에 연결 (다중 회사 모드)
 
+    @traced()
     def start(self, headless=None):
         """브라우저 시작"""
         if headless is None:
@@ -24,11 +27,15 @@ class BrowserManager:
         # Playwright 인스턴스를 매번 새로 생성 (event loop 문제 해결)
         self.playwright = sync_playwright().start()
 
-        # 브라우저는 매번 새로 생성 (리소스 정리)
-        self.browser = self.playwright.chromium.launch(
-            headless=headless,
-            slow_mo=300
-        )
+        if self.cdp_endpoint:
+            # 공유 브라우저에는 컨텍스트만 새로 만들고, 종료 시 연결만 끊음 (프로세스는 유지)
+            self.browser = self.playwright.chromium.connect_over_cdp(self.cdp_endpoint, slow_mo=300)
+        else:
+            # 브라우저는 매번 새로 생성 (리소스 정리)
+            self.browser = self.playwright.chromium.launch(
+                headless=headless,
+                slow_mo=300
+            )
 
         self.context = self.browser.new_context(
             permissions=['clipboard-read', 'clipboard-write']
@@ -37,6 +44,7 @@ class BrowserManager:
         logger.info("[OK] 브라우저 시작 완료")
         return self.page
 
+    @traced()
     def load_session(self) -> bool:
         """저장된 세션 로드"""
         if not self.session_file.exists():
@@ -130,3 +138,33 @@ class BrowserManager:
             logger.info("[STOP] Playwright 완전 종료")
         except Exception as e:
             logger.error(f"[WARN] Playwright 종료 중 오류: {e}")
+
+
+def launch_shared_browser(port: int = 9222, headless: bool = None, user_data_dir: str = "sessions/shared_browser"):
+    """다중 회사 모드용 공유 Chromium 프로세스 시작 → (프로세스, CDP 엔드포인트)
+
+    회사별 워커는 BrowserManager(cdp_endpoint=...)로 연결해 각자 컨텍스트(쿠키 분리)를 사용한다.
+    """
+    import subprocess
+    import urllib.request
+
+    if headless is None:
+        headless = HEADLESS_MODE
+    with sync_playwright() as p:
+        executable = p.chromium.executable_path
+    args = [executable, f"--remote-debugging-port={port}", f"--user-data-dir={Path(user_data_dir).resolve()}",
+            "--no-first-run", "--no-default-browser-check"]
+    if headless:
+        args.append("--headless=new")
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    endpoint = f"http://127.0.0.1:{port}"
+    for _ in range(60):
+        try:
+            with urllib.request.urlopen(f"{endpoint}/json/version", timeout=1):
+                logger.info(f"[BROWSER] 공유 브라우저 시작 완료 ({endpoint}, PID: {process.pid})")
+                return process, endpoint
+        except OSError:
+            time.sleep(0.5)
+    process.kill()
+    raise RuntimeError(f"공유 브라우저 시작 실패 ({endpoint})")
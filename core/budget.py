@@ -0,0 +1,61 @@
+import time
+from utils.config import UPLOAD_CONFIG
+
+STAGES = ("session", "reflected", "unreflected", "transform", "upload")
+DEFAULT_SHARES = {"session": 0.15, "reflected": 0.15, "unreflected": 0.2, "transform": 0.05, "upload": 0.45}
+DEFAULT_MIN_SECONDS = {"reflected": 45, "upload": 30}
+
+
+class CycleBudget:
+    """사이클 마감 시간 예산
+
+    단계별 제한 시간 = 남은 시간 × (해당 단계 비중 / 아직 실행하지 않은 단계 비중 합)
+    → 앞 단계가 일찍 끝나면 남은 시간이 뒤 단계로 넘어간다.
+    affordable()이 False면 단계를 축소 실행(캐시 사용, 부분 업로드)해 마감을 넘기지 않는다.
+    부분 업로드도 최소 1청크(min_rows)는 올려 처리 속도를 계속 측정한다 (전부 이월되면 속도가 갱신되지 않음).
+    """
+
+    def __init__(self, total_seconds: float, shares: dict = None, min_seconds: dict = None, min_rows: int = None):
+        self.total = total_seconds
+        self.min_rows = min_rows or UPLOAD_CONFIG.get("chunk_size") or 1
+        self.shares = {**DEFAULT_SHARES, **(shares or {})}
+        self.min_seconds = {**DEFAULT_MIN_SECONDS, **(min_seconds or {})}
+        self.deadline = None
+        self.done = set()
+        self.seconds_per_row = None  # 업로드 처리 속도 (사이클 간 지수 이동 평균)
+
+    def start(self):
+        self.deadline = time.time() + self.total
+        self.done = set()
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.time()) if self.deadline else float("inf")
+
+    def stage_timeout(self, stage: str) -> float:
+        rest = [s for s in STAGES if s not in self.done]
+        weight = sum(self.shares.get(s, 0) for s in rest) or 1
+        return self.remaining() * self.shares.get(stage, 0) / weight
+
+    def affordable(self, stage: str) -> bool:
+        return self.stage_timeout(stage) >= self.min_seconds.get(stage, 0)
+
+    def finish(self, stage: str):
+        self.done.add(stage)
+
+    def observe_upload(self, rows: int, seconds: float):
+        """업로드 속도 갱신 (rows: 저장된 행 수, seconds: 붙여넣기+저장 시간만, 페이지 이동/재시도 대기 제외)
+
+        저장된 행이 없으면 측정값을 버려 다음 사이클은 다시 전체 업로드부터 측정한다.
+        """
+        if not rows:
+            self.seconds_per_row = None
+            return
+        rate = seconds / rows
+        self.seconds_per_row = rate if self.seconds_per_row is None else 0.7 * self.seconds_per_row + 0.3 * rate
+
+    def rows_within(self, stage: str, total_rows: int, overhead: float = 30) -> int:
+        """남은 단계 시간 안에 업로드 가능한 행 수 (속도 측정 전에는 전체, 최소 1청크)"""
+        if self.seconds_per_row is None:
+            return total_rows
+        fit = int((self.stage_timeout(stage) - overhead) / max(self.seconds_per_row, 1e-6))
+        return min(total_rows, max(self.min_rows, fit))
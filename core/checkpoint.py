@@ -0,0 +1,78 @@
+import json
+import time
+import random
+from pathlib import Path
+from datetime import datetime
+from core.logger import logger
+
+
+def retry_stage(name: str, func, retries: int = 0, base_delay: float = 2.0, max_delay: float = 60.0,
+                on_retry=None, deadline: float = None):
+    """단계 실행 + 실패 시 해당 단계만 재시도 (지수 백오프 + full jitter, deadline 이후에는 재시도 안 함)"""
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            if deadline and time.time() + delay >= deadline:
+                logger.warning(f"[RETRY] '{name}' 단계 시간 예산 소진 - 재시도 생략")
+                raise
+            logger.warning(f"[RETRY] '{name}' 단계 실패 ({attempt+1}/{retries}회 재시도, {delay:.1f}초 후): {e}")
+            if on_retry:
+                on_retry(e)
+            time.sleep(delay)
+
+
+class CycleCheckpoint:
+    """사이클 단계별 출력 체크포인트 (메모리 + 디스크 JSON)
+
+    같은 사이클 안의 재시도에서 앞 단계 출력을 재사용한다. 사이클이 (성공/실패와 무관하게)
+    끝나면 폐기하므로, 디스크에 남는 경우는 프로세스가 사이클 도중 중단된 때뿐이고
+    재시작 후 max_age 이내에 시작한 첫 사이클만 그 출력부터 이어서 진행한다.
+    """
+
+    def __init__(self, checkpoint_file="cycle_checkpoint.json", max_age_seconds=600):
+        self.checkpoint_file = Path(checkpoint_file)
+        self.max_age = max_age_seconds
+        self.stages = {}
+
+    def load(self) -> list:
+        """디스크 체크포인트 복원 (유효 기간 지난 체크포인트는 폐기) → 복원된 단계 이름 목록"""
+        self.stages = {}
+        if not self.checkpoint_file.exists():
+            return []
+        try:
+            with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            age = (datetime.now() - datetime.fromisoformat(data["saved_at"])).total_seconds()
+        except Exception:
+            self.clear()
+            return []
+        if age > self.max_age:
+            logger.info(f"[CHECKPOINT] 만료된 체크포인트 폐기 ({age:.0f}초 경과)")
+            self.clear()
+            return []
+        self.stages = data.get("stages", {})
+        logger.info(f"[CHECKPOINT] 이전 사이클 단계 출력 복원: {', '.join(self.stages) or '-'}")
+        return list(self.stages)
+
+    def get(self, stage: str):
+        return self.stages.get(stage)
+
+    def has(self, stage: str) -> bool:
+        return stage in self.stages
+
+    def save(self, stage: str, value):
+        """단계 출력 기록 (JSON 직렬화 가능한 값)"""
+        self.stages[stage] = value
+        tmp = self.checkpoint_file.with_suffix(".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"saved_at": datetime.now().isoformat(), "stages": self.stages}, f, ensure_ascii=False)
+        tmp.replace(self.checkpoint_file)
+
+    def clear(self):
+        self.stages = {}
+        if self.checkpoint_file.exists():
+            self.checkpoint_file.unlink()
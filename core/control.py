@@ -0,0 +1,136 @@
+import sys
+import hmac
+import json
+import secrets
+import threading
+import urllib.request
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core.logger import logger
+from utils.config import SCHEDULE_CONFIG
+
+TOKEN_HEADER = "X-Control-Token"
+TOKEN_FILE = Path("control.token")  # 설정(schedule.control.token)이 없을 때 자동 생성되는 공유 토큰
+
+
+def load_token(create: bool = False) -> str:
+    """제어 토큰: 설정값 우선, 없으면 control.token 파일 (create=True면 없을 때 생성)"""
+    token = SCHEDULE_CONFIG.get("control", {}).get("token")
+    if token:
+        return token
+    if TOKEN_FILE.exists():
+        return TOKEN_FILE.read_text(encoding="utf-8").strip()
+    if not create:
+        return ""
+    token = secrets.token_hex(16)
+    TOKEN_FILE.write_text(token, encoding="utf-8")
+    return token
+
+
+class ControlServer:
+    """로컬 제어 HTTP 서버 (127.0.0.1 전용, 백그라운드 스레드)
+
+    route(method, path, func)로 등록한 함수의 반환값을 응답한다.
+    dict → JSON, str → text/plain (예: 메트릭)
+    로컬 브라우저의 웹 페이지가 보내는 요청(교차 사이트 POST, DNS 리바인딩)을 막기 위해
+    Host가 127.0.0.1/localhost:<port>가 아니거나 Origin 헤더가 있는 요청은 거부하고,
+    상태를 바꾸는 POST는 공유 토큰(X-Control-Token)이 일치해야 실행한다.
+    """
+
+    def __init__(self, port: int = 8766, host: str = "127.0.0.1", token: str = None):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.routes = {}
+        self.server = None
+        self.thread = None
+
+    def route(self, method: str, path: str, func):
+        self.routes[(method, path)] = func
+
+    def start(self):
+        if self.token is None:
+            self.token = load_token(create=True)
+        routes = self.routes
+        token = self.token
+        allowed_hosts = {f"127.0.0.1:{self.port}", f"localhost:{self.port}"}
+
+        class Handler(BaseHTTPRequestHandler):
+            def _dispatch(self, method):
+                if self.headers.get("Host", "") not in allowed_hosts or self.headers.get("Origin"):
+                    logger.warning(f"[CONTROL] 외부 요청 거부: {method} {self.path} "
+                                   f"(Host={self.headers.get('Host')}, Origin={self.headers.get('Origin')})")
+                    return self._reply(403, {"error": "forbidden"})
+                if method == "POST" and not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), token or ""):
+                    logger.warning(f"[CONTROL] 토큰 불일치 요청 거부: {method} {self.path}")
+                    return self._reply(403, {"error": "invalid control token"})
+                func = routes.get((method, self.path.split("?")[0]))
+                if not func:
+                    return self._reply(404, {"error": f"unknown command: {method} {self.path}"})
+                try:
+                    self._reply(200, func())
+                except Exception as e:
+                    logger.error(f"[CONTROL] '{self.path}' 처리 오류: {e}")
+                    self._reply(500, {"error": str(e)})
+
+            def _reply(self, code, body):
+                if isinstance(body, str):
+                    data, content_type = body.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+                else:
+                    data, content_type = json.dumps(body, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def log_message(self, format, *args):
+                pass  # 요청마다 콘솔에 출력하지 않음
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="control-server", daemon=True)
+        self.thread.start()
+        logger.info(f"[CONTROL] 제어 서버 시작 (http://{self.host}:{self.port})")
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def main():
+    """명령줄 클라이언트: python -m core.control run-now|status|pause|resume [--port 8766]
+
+    토큰은 schedule.control.token 또는 상주 프로세스 폴더의 control.token에서 읽는다.
+    """
+    commands = {"run-now": "POST", "status": "GET", "pause": "POST", "resume": "POST"}
+    args = sys.argv[1:]
+    port = 8766
+    if "--port" in args:
+        i = args.index("--port")
+        port = int(args[i + 1])
+        del args[i:i + 2]
+    if len(args) != 1 or args[0] not in commands:
+        print(f"사용법: python -m core.control {'|'.join(commands)} [--port 8766]")
+        return 2
+    request = urllib.request.Request(f"http://127.0.0.1:{port}/{args[0]}", method=commands[args[0]],
+                                     headers={TOKEN_HEADER: load_token()})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            print(json.dumps(json.loads(response.read()), ensure_ascii=False, indent=2))
+    except OSError as e:
+        print(f"[ERROR] 제어 서버 연결 실패: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import os
+import json
+import uuid
+import threading
+from pathlib import Path
+from datetime import datetime
+from core.logger import logger
+
+PENDING = "pending"
+COMMITTED = "committed"
+ABORTED = "aborted"
+MANUAL = "manual"  # ERP에서 저장 여부를 확인할 수 없어 수동 확인 필요
+
+
+class UploadIntentLog:
+    """F8 저장 전 업로드 의도를 먼저 기록하는 선기록(Write-Ahead) 로그 (JSONL, append-only)"""
+
+    def __init__(self, log_file="upload_intents.jsonl"):
+        self.log_file = Path(log_file)
+        self.lock = threading.RLock()  # 업로드 워커 스레드와 공유
+        self.active = set()  # 이 프로세스에서 저장 진행 중인 의도 (복구 대상 아님)
+
+    def _append(self, entry: dict):
+        entry["at"] = datetime.now().isoformat()
+        with self.lock:
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())  # F8 전에 디스크 반영 보장
+
+    def begin(self, record_keys: list, auth_nos: list) -> str:
+        """F8 직전 호출: 저장하려는 행의 키/승인번호 기록"""
+        intent_id = uuid.uuid4().hex[:12]
+        self.active.add(intent_id)
+        self._append({
+            "id": intent_id,
+            "state": PENDING,
+            "keys": list(record_keys),
+            "auth_nos": list(auth_nos),
+        })
+        logger.info(f"[INTENT] 업로드 의도 기록 ({intent_id}, {len(record_keys)}건)")
+        return intent_id
+
+    def resolve(self, intent_id: str, state: str, **extra):
+        self._append({"id": intent_id, "state": state, **extra})
+        self.active.discard(intent_id)
+
+    def release(self, intent_id: str):
+        """저장 결과를 확인하지 못한 의도를 미해결로 남겨 다음 복구 단계에 넘김"""
+        self.active.discard(intent_id)
+
+    def commit(self, intent_id: str, success_count: int = None):
+        self.resolve(intent_id, COMMITTED, success_count=success_count)
+
+    def abort(self, intent_id: str, reason: str = ""):
+        self.resolve(intent_id, ABORTED, reason=reason)
+
+    def pending(self) -> list:
+        """마지막 상태가 pending인 의도 목록"""
+        if not self.log_file.exists():
+            return []
+        intents = {}
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 기록 도중 중단된 마지막 줄
+                if entry.get("state") == PENDING:
+                    intents[entry["id"]] = entry
+                else:
+                    intents.pop(entry.get("id"), None)
+        return list(intents.values())
+
+    def compact(self):
+        """미해결 의도가 없으면 로그 비우기"""
+        with self.lock:
+            if self.log_file.exists() and not self.pending():
+                self.log_file.unlink()
+
+    def recover(self, reflected_nos: set, transformer, notifier=None) -> set:
+        """미해결 의도를 ERP '회계반영' 내역과 행 단위로 대조해 정리 (새 작업 시작 전 호출)
+
+        승인번호가 회계반영된 행은 저장된 것으로 보고 원장에 기록하고, 반영되지 않은 행은
+        재업로드 대상으로 남긴다 (부분 저장 대응). 승인번호가 없는 행은 같은 의도의 다른
+        행이 반영되었으면 중복 방지를 우선해 기록하고 수동 확인을 요청한다.
+        대조할 회계반영 내역이 없으면 정리하지 않고, 아직 미해결인 키 집합을 반환한다.
+        notifier: 수동 확인(MANUAL) 의도가 생기면 알림 발송 (NotifierModule)
+        """
+        pending = [intent for intent in self.pending() if intent["id"] not in self.active]
+        if not pending:
+            return set()
+
+        if not reflected_nos:
+            unresolved = {k for intent in pending for k in intent["keys"]}
+            logger.warning(f"[RECOVER] 회계반영 내역 없음 -> 미해결 의도 {len(pending)}건 보류 ({len(unresolved)}건 업로드 제외)")
+            return unresolved
+
+        logger.warning(f"[RECOVER] 미해결 업로드 의도 {len(pending)}건 복구 시작")
+        recovered_keys = []
+        manual_intents = []
+        for intent in pending:
+            rows = list(zip(intent["keys"], intent.get("auth_nos", [])))
+            saved = [k for k, n in rows if n and n in reflected_nos]
+            unknown = [k for k, n in rows if not n]
+            if saved or not any(n for _, n in rows):
+                # 저장이 확인되었거나(일부라도) 대조 자체가 불가능한 의도
+                manual = unknown
+            else:
+                manual = []
+            recovered_keys.extend(saved + manual)
+
+            if manual:
+                self.resolve(intent["id"], MANUAL, saved=len(saved), manual=manual)
+                logger.error(f"   [RECOVER] {intent['id']}: 승인번호 없는 행 대조 불가 -> 기록 후 수동 확인 필요 ({manual})")
+                manual_intents.append((intent["id"], manual))
+            elif saved:
+                self.commit(intent["id"], success_count=len(saved))
+            else:
+                self.abort(intent["id"], reason="ERP 미반영 확인")
+            logger.info(f"   [RECOVER] {intent['id']}: 반영 확인 {len(saved)}건 기록 / 재업로드 대상 {len(rows) - len(saved) - len(manual)}건")
+
+        if recovered_keys:
+            transformer.add_uploaded_records(recovered_keys)
+
+        if manual_intents and notifier:
+            rows = sum(len(manual) for _, manual in manual_intents)
+            msg = (f"[RECOVER] 저장 여부 확인 불가 업로드 {rows}건 (의도 {len(manual_intents)}건) "
+                   f"-> 업로드 완료로 기록, 입금보고서 수동 확인 필요")
+            detail = "\n".join(f"{intent_id}: {', '.join(manual)}" for intent_id, manual in manual_intents[:50])
+            notifier.send_error_notification(msg, detail)
+
+        self.compact()
+        return set()
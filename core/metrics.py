@@ -0,0 +1,161 @@
+import os
+import time
+import threading
+
+try:
+    import psutil  # requirements.txt 포함 (설치되지 않은 환경에서는 브라우저 메모리(RSS) 지표만 생략)
+except ImportError:
+    psutil = None
+
+# 단위: 초 (사이클/단계/ERP 화면 조작 소요 시간 분포 기준)
+DEFAULT_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def _labels(labels: dict, le: str = None) -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in sorted(labels.items())]
+    if le is not None:
+        parts.append(f'le="{le}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.lock = threading.Lock()
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        super().__init__(name, help)
+        self.values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> list:
+        with self.lock:
+            return self.header() + [f"{self.name}{_labels(dict(k))} {_number(v)}" for k, v in self.values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = tuple(buckets)
+        self.series = {}  # 라벨 → [버킷별 누적 건수..., 합계, 건수]
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list:
+        lines = self.header()
+        with self.lock:
+            for key, series in self.series.items():
+                labels = dict(key)
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f"{self.name}_bucket{_labels(labels, bound)} {count}")
+                lines.append(f"{self.name}_bucket{_labels(labels, '+Inf')} {series[-1]}")
+                lines.append(f"{self.name}_sum{_labels(labels)} {_number(series[-2])}")
+                lines.append(f"{self.name}_count{_labels(labels)} {series[-1]}")
+        return lines
+
+
+class AutomationMetrics:
+    """사이클/단계 성능 지표 (Prometheus 텍스트 형식)
+
+    구간 기록(core.tracing)의 리스너로 사이클/단계/모듈 소요 시간과 행 수를 집계하고,
+    원장 크기/브라우저 메모리/마지막 업로드 경과 시간 등은 수집(scrape) 시점에 계산한다.
+    """
+
+    def __init__(self):
+        self.cycles = Counter("ecount_cycles_total", "Automation cycles by result")
+        self.cycle_seconds = Histogram("ecount_cycle_duration_seconds", "Cycle wall time")
+        self.stage_seconds = Histogram("ecount_stage_duration_seconds", "Cycle stage wall time (including retries)")
+        self.span_seconds = Histogram("ecount_span_duration_seconds", "Browser/module operation wall time")
+        self.rows_read = Counter("ecount_rows_read_total", "Unreflected rows read from ERP")
+        self.rows_uploaded = Counter("ecount_rows_uploaded_total", "Rows saved to the deposit report")
+        self.rows_deduplicated = Counter("ecount_rows_deduplicated_total", "Rows skipped as already uploaded/reflected")
+        self.relogins = Counter("ecount_session_relogins_total", "Logins performed because the saved session was missing or expired")
+        for counter in (self.rows_read, self.rows_uploaded, self.rows_deduplicated, self.relogins):
+            counter.inc(0)  # 첫 수집부터 0으로 노출
+        self.last_upload_at = None
+        self.started_at = time.time()
+
+    def observe_span(self, record: dict):
+        """구간 기록 리스너"""
+        name, seconds, attrs = record["name"], record["ms"] / 1000, record.get("attrs", {})
+        if name == "cycle":
+            ok = attrs.get("ok", record["status"] == "ok")
+            self.cycles.inc(result="success" if ok else "failure")
+            self.cycle_seconds.observe(seconds)
+            self.rows_read.inc(attrs.get("rows_read", 0))
+        elif name.startswith("stage."):
+            self.stage_seconds.observe(seconds, stage=name[len("stage."):], status=record["status"])
+        else:
+            self.span_seconds.observe(seconds, span=name)
+            if name == "LoginModule.login":
+                self.relogins.inc()
+            elif name == "TransformerModule.transform":
+                self.rows_deduplicated.inc(attrs.get("duplicates", 0))
+
+    def mark_uploaded(self, rows: int):
+        if rows:
+            self.rows_uploaded.inc(rows)
+            self.last_upload_at = time.time()
+
+    def browser_rss(self) -> int:
+        """이 프로세스의 자식 프로세스(브라우저 워커, Playwright 드라이버, Chromium) RSS 합계"""
+        total = 0
+        for child in psutil.Process(os.getpid()).children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    def render(self, state: dict = None) -> str:
+        """state: 수집 시점 게이지 {이름: 값} (ecount_<이름>으로 노출, 예: ledger_records)"""
+        now = time.time()
+        gauges = {"uptime_seconds": round(now - self.started_at, 1)}
+        if self.last_upload_at:
+            gauges["seconds_since_last_upload"] = round(now - self.last_upload_at, 1)
+        if psutil:
+            gauges["browser_rss_bytes"] = self.browser_rss()
+        gauges.update(state or {})
+
+        lines = []
+        for metric in (self.cycles, self.cycle_seconds, self.stage_seconds, self.span_seconds, self.rows_read,
+                       self.rows_uploaded, self.rows_deduplicated, self.relogins):
+            lines.extend(metric.render())
+        for name, value in gauges.items():
+            lines.extend([f"# TYPE ecount_{name} gauge", f"ecount_{name} {_number(value)}"])
+        return "\n".join(lines) + "\n"
+
+
+metrics = AutomationMetrics()
@@ -0,0 +1,96 @@
+import os
+import json
+import threading
+from pathlib import Path
+from datetime import datetime
+from core.logger import logger
+
+
+class UploadOutbox:
+    """읽기 단계와 업로드 단계 사이의 디스크 큐 (JSONL, append-only)
+
+    put    - 변환된 행 적재 {"op": "put", "key", "row", "raw"}
+    ack    - 결과가 확정된 행 제거 (원장/실패 기록/업로드 의도로 이관)
+    fail   - 저장 시도 실패 (행은 큐에 남고 시도 횟수 누적)
+    재시작 후에도 남은 행은 다시 읽지 않고 그대로 업로드한다.
+    """
+
+    def __init__(self, queue_file="upload_outbox.jsonl"):
+        self.queue_file = Path(queue_file)
+        self.lock = threading.RLock()
+
+    def _append(self, entries: list):
+        at = datetime.now().isoformat()
+        with self.lock:
+            with open(self.queue_file, 'a', encoding='utf-8') as f:
+                for entry in entries:
+                    entry["at"] = at
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def put(self, record_keys: list, paste_rows: list, raw_rows: list):
+        self._append([
+            {"op": "put", "key": key, "row": list(row), "raw": raw}
+            for key, row, raw in zip(record_keys, paste_rows, raw_rows)
+        ])
+        logger.info(f"[OUTBOX] {len(record_keys)}건 적재 (대기 {len(self.pending())}건)")
+
+    def ack(self, record_keys: list):
+        if record_keys:
+            self._append([{"op": "ack", "keys": list(record_keys)}])
+
+    def fail(self, record_keys: list, reason: str = ""):
+        if record_keys:
+            self._append([{"op": "fail", "keys": list(record_keys), "reason": reason[:200]}])
+
+    def pending(self, limit: int = None) -> list:
+        """대기 중인 행 (적재 순서) [{'key', 'row', 'raw', 'attempts', 'reason'}, ...]"""
+        with self.lock:
+            if not self.queue_file.exists():
+                return []
+            entries = {}
+            with open(self.queue_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # 기록 도중 중단된 마지막 줄
+                    op = entry.get("op")
+                    if op == "put":
+                        entries[entry["key"]] = {"key": entry["key"], "row": entry["row"],
+                                                 "raw": entry.get("raw", {}), "attempts": 0, "reason": ""}
+                    elif op == "ack":
+                        for key in entry["keys"]:
+                            entries.pop(key, None)
+                    elif op == "fail":
+                        for key in entry["keys"]:
+                            if key in entries:
+                                entries[key]["attempts"] += 1
+                                entries[key]["reason"] = entry.get("reason", "")
+        pending = list(entries.values())
+        return pending[:limit] if limit else pending
+
+    def keys(self) -> set:
+        return {entry["key"] for entry in self.pending()}
+
+    def compact(self):
+        """대기 행만 남기도록 재작성 (비어 있으면 파일 삭제)"""
+        with self.lock:
+            pending = self.pending()
+            if not pending:
+                if self.queue_file.exists():
+                    self.queue_file.unlink()
+                return
+            tmp = self.queue_file.with_suffix(".tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                for entry in pending:
+                    f.write(json.dumps({"op": "put", "key": entry["key"], "row": entry["row"],
+                                        "raw": entry["raw"], "at": datetime.now().isoformat()},
+                                       ensure_ascii=False) + '\n')
+                    for _ in range(entry["attempts"]):
+                        f.write(json.dumps({"op": "fail", "keys": [entry["key"]],
+                                            "reason": entry["reason"]}, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.queue_file)
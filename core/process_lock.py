@@ -0,0 +1,76 @@
+import os
+from pathlib import Path
+from core.logger import logger
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# Windows 잠금 영역: 파일 내용(PID) 밖의 바이트를 잠가 다른 프로세스도 PID를 읽을 수 있게 함
+_LOCK_OFFSET = 1 << 30
+
+
+class ProcessLock:
+    """OS 수준 배타 락 (POSIX fcntl.flock / Windows msvcrt.locking)
+
+    열린 파일 핸들에 락을 걸므로 확인과 확보가 한 번에 이루어지고, 프로세스가 죽으면 OS가
+    자동으로 해제한다 (남은 락 파일을 지울 필요 없음). 파일에는 보유 프로세스 PID를 기록한다.
+    """
+
+    def __init__(self, lock_file="runtime.lock"):
+        self.lock_file = Path(lock_file)
+        self.fp = None
+
+    @property
+    def locked(self) -> bool:
+        return self.fp is not None
+
+    def holder(self):
+        """락 파일에 기록된 PID (없으면 None)"""
+        try:
+            return int(self.lock_file.read_text().strip())
+        except (OSError, ValueError):
+            return None
+
+    def acquire(self) -> bool:
+        if self.fp:
+            return True
+        fp = open(self.lock_file, 'a+')  # 잠그기 전에는 기존 내용(보유자 PID)을 지우지 않음
+        try:
+            if os.name == "nt":
+                fp.seek(_LOCK_OFFSET)
+                msvcrt.locking(fp.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fp.close()
+            logger.error(f"[LOCK] 이미 실행 중인 프로세스 (PID: {self.holder()})")
+            return False
+        fp.seek(0)
+        fp.truncate()
+        fp.write(str(os.getpid()))
+        fp.flush()
+        self.fp = fp
+        logger.info(f"[LOCK] 프로세스 락 확보 (PID: {os.getpid()})")
+        return True
+
+    def release(self):
+        """락 해제 (파일은 남겨 둠: 삭제하면 다른 프로세스가 새 파일에 중복 락을 걸 수 있음)"""
+        if not self.fp:
+            return
+        try:
+            self.fp.seek(0)
+            self.fp.truncate()
+            self.fp.flush()
+            if os.name == "nt":
+                self.fp.seek(_LOCK_OFFSET)
+                msvcrt.locking(self.fp.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self.fp.fileno(), fcntl.LOCK_UN)
+            logger.info("[LOCK] 프로세스 락 해제")
+        except OSError as e:
+            logger.warning(f"[LOCK] 락 해제 실패: {e}")
+        finally:
+            self.fp.close()
+            self.fp = None
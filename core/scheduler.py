@@ -0,0 +1,53 @@
+import time
+from core.logger import logger
+
+
+class ChangeTriggeredScheduler:
+    """변경 감지 기반 사이클 트리거 (프로브 주기 + 최대 지연 보장)
+
+    due()가 사이클 실행 사유를 반환:
+        'first'   - 시작 후 첫 사이클
+        'changed' - 프로브 서명이 마지막 사이클 시점과 다름
+        'probe'   - 프로브 실패 (변경 여부를 알 수 없으므로 실행)
+        'stale'   - 마지막 사이클 후 max_staleness 경과
+    실행할 필요가 없으면 None.
+    """
+
+    def __init__(self, probe, probe_interval=60, max_staleness=1800, min_gap=120):
+        self.probe = probe
+        self.probe_interval = probe_interval
+        self.max_staleness = max_staleness
+        self.min_gap = min_gap  # 연속 사이클 최소 간격 (변경이 잦을 때 ERP 부하 제한)
+        self.baseline = None
+        self.pending = None
+        self.last_cycle = None
+
+    def due(self, now=None):
+        now = time.time() if now is None else now
+        if self.last_cycle is None:
+            reason = "first"
+        elif now - self.last_cycle >= self.max_staleness:
+            reason = "stale"
+        elif now - self.last_cycle < self.min_gap:
+            return None
+        else:
+            reason = None
+
+        signature = self.probe.signature()
+        if reason is None:
+            if signature is None:
+                reason = "probe"
+            elif signature != self.baseline:
+                reason = "changed"
+                logger.info(f"[PROBE] 변경 감지: {self.baseline} -> {signature}")
+            else:
+                return None
+        # 트리거 시점의 서명을 기준선으로 사용 (이후 사이클이 읽는 데이터는 이보다 최신)
+        self.pending = signature
+        return reason
+
+    def mark_cycle(self, ok=True, now=None):
+        """사이클 실행 후 호출: 최근 실행 시각 갱신, 성공 시에만 기준선 갱신 (실패 시 다음 프로브에서 재시도)"""
+        self.last_cycle = time.time() if now is None else now
+        if ok:
+            self.baseline = self.pending
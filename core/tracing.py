@@ -0,0 +1,202 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import functools
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime, timedelta
+from utils.config import TRACING_CONFIG
+
+
+class Span:
+    """진행 중인 구간 (set()으로 행 수, 탭 이름 등 속성 추가)"""
+
+    def __init__(self, name: str, span_id: str = None, parent_id: str = None, attrs: dict = None):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attrs = attrs or {}
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+_NOOP = Span("noop")
+
+
+class Tracer:
+    """사이클 단위 구간(span) 기록기 (JSONL: <trace_dir>/YYYYMMDD/<cycle_id>.jsonl)
+
+    구간은 스레드별 스택으로 중첩되고, 끝날 때 한 줄씩 기록된다.
+    사이클 밖(업로드 워커 등)에서 끝난 구간은 background.jsonl에 기록한다.
+    listeners에 등록한 함수는 구간이 끝날 때마다 기록(dict)을 받는다 (지표 집계).
+    브라우저 워커 프로세스는 context()/attach()로 부모의 사이클과 상위 구간을 이어받는다.
+    """
+
+    def __init__(self, trace_dir="traces", enabled=True, retention_days=30):
+        self.trace_dir = Path(trace_dir)
+        self.enabled = enabled
+        self.retention_days = retention_days
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.pruned_on = None
+        self.listeners = []
+
+    def _stack(self) -> list:
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def start_cycle(self, cycle_id: str):
+        self.local.cycle_id = cycle_id
+        self.local.remote_parent = None
+        self.prune()
+
+    def end_cycle(self):
+        self.local.cycle_id = None
+
+    def context(self) -> tuple:
+        """다른 프로세스에 넘길 추적 문맥 (사이클 ID, 현재 구간 ID)"""
+        stack = self._stack()
+        return getattr(self.local, "cycle_id", None), stack[-1].span_id if stack else None
+
+    def attach(self, context):
+        self.local.cycle_id, self.local.remote_parent = context or (None, None)
+
+    def current(self) -> Span:
+        stack = self._stack()
+        return stack[-1] if stack else _NOOP
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        if not self.enabled and not self.listeners:
+            yield _NOOP
+            return
+        stack = self._stack()
+        parent_id = stack[-1].span_id if stack else getattr(self.local, "remote_parent", None)
+        span = Span(name, uuid.uuid4().hex[:12], parent_id, attrs)
+        stack.append(span)
+        started_at = datetime.now()
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield span
+        except BaseException as e:
+            status = "error"
+            span.attrs["error"] = f"{type(e).__name__}: {e}"[:200]
+            raise
+        finally:
+            stack.pop()
+            record = {
+                "cycle": getattr(self.local, "cycle_id", None),
+                "span": span.span_id,
+                "parent": span.parent_id,
+                "name": name,
+                "start": started_at.isoformat(),
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+                "status": status,
+                "pid": os.getpid(),
+                "attrs": span.attrs,
+            }
+            if self.enabled:
+                self._write(record)
+            self.emit(record)
+
+    def emit(self, record: dict):
+        """리스너에 구간 기록 전달 (브라우저 워커에서 넘어온 기록 포함)"""
+        for listener in self.listeners:
+            try:
+                listener(record)
+            except Exception:
+                pass  # 지표 집계 오류가 작업을 중단시키지 않음
+
+    def _write(self, record: dict):
+        day_dir = self.trace_dir / record["start"][:10].replace("-", "")
+        path = day_dir / f"{record['cycle'] or 'background'}.jsonl"
+        try:
+            with self.lock:
+                day_dir.mkdir(parents=True, exist_ok=True)
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        except OSError:
+            pass  # 추적 기록 실패가 작업을 중단시키지 않음
+
+    def prune(self):
+        """보관 기간이 지난 일자 폴더 삭제 (하루 1회)"""
+        today = datetime.now().date()
+        if self.pruned_on == today or not self.trace_dir.exists():
+            return
+        self.pruned_on = today
+        cutoff = (today - timedelta(days=self.retention_days)).strftime("%Y%m%d")
+        for day_dir in self.trace_dir.iterdir():
+            if day_dir.is_dir() and day_dir.name < cutoff:
+                shutil.rmtree(day_dir, ignore_errors=True)
+
+    def load(self, date_from=None, date_to=None) -> list:
+        """기간 내 구간 기록 목록 (date_from/date_to: datetime.date, 포함)"""
+        records = []
+        if not self.trace_dir.exists():
+            return records
+        low = date_from.strftime("%Y%m%d") if date_from else ""
+        high = date_to.strftime("%Y%m%d") if date_to else "99999999"
+        for day_dir in sorted(self.trace_dir.iterdir()):
+            if not day_dir.is_dir() or not (low <= day_dir.name <= high):
+                continue
+            for path in sorted(day_dir.glob("*.jsonl")):
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            records.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            continue
+        return records
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """최근접 순위 백분위수 (정렬된 목록)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(-(-pct * len(sorted_values) // 100)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(records: list) -> list:
+    """구간 이름별 [(이름, 건수, 오류 수, p50, p95, p99, 최대)] (ms)"""
+    by_name = {}
+    for record in records:
+        by_name.setdefault(record["name"], []).append(record)
+    rows = []
+    for name, items in sorted(by_name.items()):
+        durations = sorted(item["ms"] for item in items)
+        errors = sum(1 for item in items if item.get("status") == "error")
+        rows.append((name, len(items), errors, percentile(durations, 50), percentile(durations, 95),
+                     percentile(durations, 99), durations[-1]))
+    return rows
+
+
+tracer = Tracer(
+    TRACING_CONFIG.get("dir", "traces"),
+    enabled=TRACING_CONFIG.get("enabled", True),
+    retention_days=TRACING_CONFIG.get("retention_days", 30),
+)
+span = tracer.span
+current_span = tracer.current
+
+
+def traced(name: str = None):
+    """함수 전체를 구간으로 기록하는 데코레이터 (기본 이름: 클래스.메서드), False 반환은 failed로 표시"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(span_name) as s:
+                result = func(*args, **kwargs)
+                if result is False:
+                    s.set(failed=True)
+                return result
+        return wrapper
+    return decorator
@@ -7,34 +7,65 @@
 
 import pandas as pd
 import sys
+import json
 import time
 import ctypes
 import traceback
 import os
-from datetime import datetime
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, date
 from pathlib import Path
-from core.browser import BrowserManager
+from core.browser import BrowserManager, launch_shared_browser
 from core.logger import logger
-from modules.login import LoginModule
-from modules.reader import ReaderModule
 from modules.transformer import TransformerModule
-from modules.uploader import UploaderModule
 from modules.notifier import NotifierModule
+from modules.reconciler import ReconcilerModule, DEPOSIT_LIST_HASH
+from modules.browser_stages import BrowserStages, BrowserWorkerClient, WORKER_CONFIG
+from modules.upload_worker import UploadWorker, upload_rows, OUTBOX_CONFIG
+from modules.uploader import uses_clipboard
+from modules.probe import ChangeProbe, PROBE_CONFIG
+from core.archive import archive_cycle
+from core.intent_log import UploadIntentLog
+from core.outbox import UploadOutbox
+from core.checkpoint import CycleCheckpoint, retry_stage
+from core.budget import CycleBudget
+from core.scheduler import ChangeTriggeredScheduler
+from core.control import ControlServer
+from core.process_lock import ProcessLock
+from core.tracing import tracer, span, current_span
+from core.metrics import metrics
 from utils.config import (
-    TEST_MODE, MODE, SCHEDULE_CONFIG, URLS
+    TEST_MODE, MODE, SCHEDULE_CONFIG, URLS, CUSTOMER_MASTER_CONFIG,
+    RECONCILE_CONFIG, TENANTS, MULTI_TENANT_CONFIG, CYCLE_CONFIG, METRICS_CONFIG
 )
 
+BUDGET_CONFIG = CYCLE_CONFIG.get("budget", {})
+CONTROL_CONFIG = SCHEDULE_CONFIG.get("control", {})
+ROLLOVER_CONFIG = SCHEDULE_CONFIG.get("rollover", {})
+
 class EcountAutomationOrchestrator:
-    def __init__(self):
-        self.lock_file = Path("runtime.lock")
-        self.lock_fp = None
+    def __init__(self, tenant: dict = None, cdp_endpoint: str = None):
+        # 다중 회사 모드: tenant가 주어지면 회사별 작업 폴더(cwd)에서 단일 사이클만 수행
+        self.tenant = tenant
+        self.lock = ProcessLock("runtime.lock")
+        self.lock_file = self.lock.lock_file
 
         # 프로세스 락 확보 (중복 실행 방지)
         if not self.acquire_lock():
+            if tenant:
+                raise RuntimeError(f"회사 '{tenant['name']}' 사이클이 이미 실행 중입니다")
             print("[ERROR] 이미 실행 중인 프로세스가 있습니다. 프로그램을 종료합니다.")
             sys.exit(1)
 
-        self.browser = BrowserManager()
+        self.browser = BrowserManager(cdp_endpoint=cdp_endpoint)
+        self.credentials = (tenant or {}).get("credentials")
+        # [V13.13] 브라우저 단계 실행기: browser.worker.enabled면 별도 워커 프로세스(단계별 제한 시간)
+        if WORKER_CONFIG.get("enabled", False):
+            self.stages = BrowserWorkerClient(self.credentials, cdp_endpoint)
+        else:
+            self.stages = BrowserStages(self.browser, self.credentials)
+        self.stages_started_at = time.time()
         self.notifier = NotifierModule()
         self.stats = {
             "total": 0,
@@ -43,59 +74,85 @@ class EcountAutomationOrchestrator:
             "count": 0,
             "cancellations": 0  # 취소 거래 건수
         }
+        self.intent_log = UploadIntentLog()
+        self.checkpoint = CycleCheckpoint(max_age_seconds=CYCLE_CONFIG.get("checkpoint_max_age_seconds", 600))
+        # [V13.14] 사이클 시간 예산 (cycle.budget.total_seconds > 0이면 사용)
+        self.budget = None
+        if BUDGET_CONFIG.get("total_seconds"):
+            self.budget = CycleBudget(BUDGET_CONFIG["total_seconds"], BUDGET_CONFIG.get("shares"),
+                                      BUDGET_CONFIG.get("min_seconds"))
+        self.reflected_cache_file = Path("reflected_cache.json")
+        # 다중 회사 모드 (부모 프로세스): 회사별 사이클을 프로세스 풀에 분배
+        self.tenant_pool = None
+        self.tenant_pool_started_at = None
+        self.shared_browser = None
+        self.tenant_stats = {}
+        # 백그라운드 작업(대사/아웃박스/변경 감지)은 단일 회사 상주 프로세스에서만 사용
+        background = not tenant and not TENANTS
+        # 저장 후 입금보고서 대사 (백그라운드)
+        self.reconciler = None
+        if RECONCILE_CONFIG.get("enabled", False) and background:
+            if DEPOSIT_LIST_HASH:
+                self.reconciler = ReconcilerModule(self.notifier)
+            else:
+                logger.warning("[RECONCILE] reconcile.enabled이지만 urls.deposit_list_hash 미설정 - 대사 비활성화")
+        # 읽기/업로드 단계 분리 (upload.outbox.enabled, 운영 모드 전용)
+        self.outbox = None
+        self.upload_worker = None
+        if OUTBOX_CONFIG.get("enabled", False) and not TEST_MODE and background:
+            self.outbox = UploadOutbox(OUTBOX_CONFIG.get("queue_file", "upload_outbox.jsonl"))
+            self.upload_worker = UploadWorker(self.outbox, self.intent_log, self.notifier, self.reconciler,
+                                              on_saved=self.count_saved)
+        # 변경 감지 트리거 (schedule.trigger = "change"): 프로브로 변경 시에만 전체 사이클 실행
+        self.scheduler = None
+        if SCHEDULE_CONFIG.get("trigger", "interval") == "change" and background:
+            self.scheduler = ChangeTriggeredScheduler(
+                ChangeProbe(),
+                probe_interval=PROBE_CONFIG.get("interval_seconds", 60),
+                max_staleness=PROBE_CONFIG.get("max_staleness_minutes", SCHEDULE_CONFIG.get("interval_minutes", 30)) * 60,
+                min_gap=PROBE_CONFIG.get("min_gap_seconds", 120),
+            )
+        # [V13.15] 로컬 제어 서버 (schedule.control.enabled): run-now/status/pause/resume
+        self.wake = threading.Event()  # 대기 중인 메인 루프를 즉시 깨움
+        self.run_requested = False
+        self.paused = False
+        self.cycle_running = False
+        self.last_cycle = {}
+        self.next_cycle_at = 0
+        self.control = None
+        if CONTROL_CONFIG.get("enabled", False) and not tenant:
+            self.control = ControlServer(CONTROL_CONFIG.get("port", 8766))
+            self.control.route("POST", "/run-now", self.request_run_now)
+            self.control.route("GET", "/status", self.status)
+            self.control.route("POST", "/pause", lambda: self.set_paused(True))
+            self.control.route("POST", "/resume", lambda: self.set_paused(False))
+        # [V13.17] Prometheus 지표 (metrics.enabled): 제어 서버가 있으면 같은 포트의 /metrics, 없으면 전용 포트
+        if METRICS_CONFIG.get("enabled", False) and not tenant:
+            tracer.listeners.append(metrics.observe_span)
+            if not self.control:
+                self.control = ControlServer(METRICS_CONFIG.get("port", 9108))
+            self.control.route("GET", "/metrics", self.render_metrics)
         self.is_keep_alive = False
         self.daily_report_sent = False  # 일일 보고서 발송 여부
+        self.day = date.today()  # 통계/로그 기준 일자 (일일 전환 시 갱신)
 
     def acquire_lock(self):
-        """프로세스 중복 실행 방지 (Windows)"""
+        """프로세스 중복 실행 방지 (OS 파일 락, 프로세스 종료 시 자동 해제)"""
         try:
-            # 락 파일이 이미 있는지 확인
-            if self.lock_file.exists():
-                with open(self.lock_file, 'r') as f:
-                    old_pid = f.read().strip()
-
-                # PID가 유효한지 확인
-                try:
-                    old_pid_int = int(old_pid)
-                    # Windows에서 프로세스 존재 여부 확인
-                    import subprocess
-                    result = subprocess.run(
-                        ['tasklist', '/FI', f'PID eq {old_pid_int}'],
-                        capture_output=True,
-                        text=True
-                    )
-                    # tasklist 출력에 PID가 포함되어 있으면 프로세스가 실행 중
-                    if str(old_pid_int) in result.stdout:
-                        logger.error(f"[LOCK] 이미 실행 중인 프로세스 (PID: {old_pid_int})")
-                        return False
-                    else:
-                        # 프로세스 없음 → 락 파일 삭제
-                        logger.warning(f"[LOCK] 이전 프로세스 (PID: {old_pid_int}) 종료됨. 락 파일 삭제")
-                        self.lock_file.unlink()
-                except (ValueError, subprocess.SubprocessError) as e:
-                    # PID 파싱 실패 또는 tasklist 실패 → 락 파일 삭제
-                    logger.warning(f"[LOCK] 락 파일 검증 실패: {e}. 락 파일 삭제")
-                    self.lock_file.unlink()
-
-            # 새 락 파일 생성
-            current_pid = os.getpid()
-            with open(self.lock_file, 'w') as f:
-                f.write(str(current_pid))
-
-            logger.info(f"[LOCK] 프로세스 락 확보 (PID: {current_pid})")
-            return True
+            return self.lock.acquire()
         except Exception as e:
             logger.error(f"[LOCK] 락 파일 생성 실패: {e}")
             return False
 
     def release_lock(self):
         """프로세스 종료 시 락 해제"""
-        try:
-            if self.lock_file.exists():
-                self.lock_file.unlink()
-                logger.info("[LOCK] 프로세스 락 해제")
-        except Exception as e:
-            logger.warning(f"[LOCK] 락 파일 삭제 실패: {e}")
+        self.lock.release()
+
+    def count_saved(self, saved_rows: list):
+        """저장된 행 통계 반영 (업로드 워커 스레드에서도 호출)"""
+        self.stats["count"] += len(saved_rows)
+        self.stats["cancellations"] += sum(1 for row in saved_rows if row[7].startswith('-'))
+        metrics.mark_uploaded(len(saved_rows))
 
     def heartbeat(self):
         """프로세스 생존 신호 기록"""
@@ -130,6 +187,125 @@ class EcountAutomationOrchestrator:
         except Exception as e:
             logger.warning(f"[WARN] 절전 모드 설정 변경 실패: {e}")
 
+    def wait(self, seconds: float):
+        """다음 확인까지 대기 (제어 요청 시 즉시 깨어남)"""
+        self.wake.wait(max(0, seconds))
+        self.wake.clear()
+
+    def request_run_now(self) -> dict:
+        self.run_requested = True
+        self.wake.set()
+        logger.info("[CONTROL] 즉시 실행 요청 수신")
+        return {"ok": True, "queued": True, "cycle_running": self.cycle_running}
+
+    def set_paused(self, paused: bool) -> dict:
+        self.paused = paused
+        self.wake.set()
+        logger.info(f"[CONTROL] 예약 사이클 {'일시 중지' if paused else '재개'}")
+        return {"ok": True, "paused": paused}
+
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "mode": MODE,
+            "paused": self.paused,
+            "cycle_running": self.cycle_running,
+            "run_requested": self.run_requested,
+            "work_time": self.is_work_time(),
+            "last_cycle": self.last_cycle,
+            "next_cycle_at": datetime.fromtimestamp(self.next_cycle_at).isoformat() if self.next_cycle_at else None,
+            "stats": self.stats,
+        }
+
+    def reset_daily_stats(self, reason: str):
+        """일일 통계를 daily_stats.jsonl에 보관 후 초기화"""
+        if self.stats["total"] > 0:
+            try:
+                with open("daily_stats.jsonl", 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({
+                        "date": self.day.isoformat(),
+                        "closed_at": datetime.now().isoformat(),
+                        "reason": reason,
+                        "stats": self.stats,
+                        "tenants": self.tenant_stats,
+                        "report_sent": self.daily_report_sent,
+                    }, ensure_ascii=False) + '\n')
+            except Exception as e:
+                logger.warning(f"[STATS] 일일 통계 보관 실패: {e}")
+        self.stats = {
+            "total": 0,
+            "success": 0,
+            "failure": 0,
+            "count": 0,
+            "cancellations": 0
+        }
+        self.tenant_stats = {}
+        self.daily_report_sent = False
+
+    def rollover_day(self):
+        """[V13.16] 날짜 변경 시 프로세스 재시작 대신 내부 전환
+
+        로그 파일 교체, 통계 보관/초기화, 일일 캐시 정리 후 사용 기간이 지난 자원만 재생성한다.
+        세션/거래처 마스터 등 나머지 상태는 그대로 유지한다.
+        """
+        logger.rotate_log_file()
+        logger.info("=" * 60)
+        logger.info(f"[ROLLOVER] 새로운 날 시작 ({self.day} -> {date.today()}) - 일일 전환")
+        self.reset_daily_stats("rollover")
+
+        # 전날 사이클 상태 (체크포인트/회계반영 캐시/변경 감지 기준선)
+        self.checkpoint.clear()
+        self.reflected_cache_file.unlink(missing_ok=True)
+        if self.scheduler:
+            self.scheduler.probe.close()
+            self.scheduler.last_cycle = None  # 첫 사이클은 변경 여부와 무관하게 실행
+        self.intent_log.compact()
+        if self.outbox:
+            self.outbox.compact()
+
+        # 사용 기간이 지난 자원만 재생성 (다음 사이클에서 다시 시작)
+        max_age = ROLLOVER_CONFIG.get("resource_max_age_hours", 24) * 3600
+        if time.time() - self.stages_started_at >= max_age:
+            logger.info("[ROLLOVER] 브라우저(워커) 재생성")
+            self.stages.stop()
+            self.stages_started_at = time.time()
+        if self.tenant_pool and time.time() - self.tenant_pool_started_at >= max_age:
+            logger.info("[ROLLOVER] 회사별 프로세스 풀 재생성")
+            self.shutdown_tenants()
+
+        self.day = date.today()
+        logger.info("=" * 60)
+
+    def render_metrics(self) -> str:
+        """/metrics 응답 (수집 시점 값: 일일 통계, 원장 크기, 제어 상태, 아웃박스 대기)"""
+        state = {f"today_{key}": value for key, value in self.stats.items()}
+        state["paused"] = int(self.paused)
+        state["cycle_running"] = int(self.cycle_running)
+        if not TENANTS:
+            state["ledger_records"] = len(TransformerModule().load_uploaded_records())
+        if self.outbox:
+            state["outbox_pending"] = len(self.outbox.pending())
+        return metrics.render(state)
+
+    def triggered_cycle(self, reason: str):
+        """사이클 1회 실행 (변경 감지 모드면 결과를 스케줄러 기준점에 반영)"""
+        logger.info(f"[TRIGGER] 사이클 실행 사유: {reason}")
+        if self.scheduler:
+            self.scheduler.probe.close()
+        failures = self.stats["failure"]
+        self.cycle_running = True
+        started = datetime.now()
+        try:
+            self.single_cycle()
+        finally:
+            self.cycle_running = False
+        ok = self.stats["failure"] == failures
+        if self.scheduler:
+            self.scheduler.mark_cycle(ok=ok)
+        self.last_cycle = {"reason": reason, "started_at": started.isoformat(),
+                           "ended_at": datetime.now().isoformat(), "ok": ok}
+        self.next_cycle_at = time.time() + SCHEDULE_CONFIG.get("interval_minutes", 30) * 60
+
     def is_work_time(self):
         """현재 시간이 업무 시간인지 확인 (06:00 ~ 18:00)"""
         if not SCHEDULE_CONFIG.get("enabled", True):
@@ -146,69 +322,258 @@ class EcountAutomationOrchestrator:
         
         return start_time <= current_time <= end_time
 
+    def run_stage(self, name: str, func, on_retry=None):
+        """사이클 단계 실행 (cycle.retries.<단계> 횟수만큼 지수 백오프 + jitter 재시도)
+
+        시간 예산 사용 시 단계 제한 시간(브라우저 워커 호출 제한, 재시도 마감)을 예산 몫으로 제한
+        """
+        deadline = time.time() + self.budget.stage_timeout(name) if self.budget else None
+        self.stages.deadline = deadline
+        try:
+            with span(f"stage.{name}"):
+                return retry_stage(
+                    name, func,
+                    retries=CYCLE_CONFIG.get("retries", {}).get(name, 2),
+                    base_delay=CYCLE_CONFIG.get("backoff_base_seconds", 2),
+                    max_delay=CYCLE_CONFIG.get("backoff_max_seconds", 60),
+                    on_retry=on_retry,
+                    deadline=deadline,
+                )
+        finally:
+            self.stages.deadline = None
+            if self.budget:
+                self.budget.finish(name)
+
+    def load_reflected_cache(self):
+        """마지막으로 읽은 회계반영 승인번호 (예산 부족 시 대체용, 유효 기간 지나면 None)"""
+        max_age = BUDGET_CONFIG.get("reflected_cache_max_age_minutes", 1440) * 60
+        try:
+            with open(self.reflected_cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if (datetime.now() - datetime.fromisoformat(cache["saved_at"])).total_seconds() <= max_age:
+                return set(cache["auth_nos"])
+        except Exception:
+            pass
+        return None
+
+    def save_reflected_cache(self, auth_nos: list):
+        try:
+            with open(self.reflected_cache_file, 'w', encoding='utf-8') as f:
+                json.dump({"saved_at": datetime.now().isoformat(), "auth_nos": list(auth_nos)}, f, ensure_ascii=False)
+        except Exception as e:
+            logger.warning(f"[BUDGET] 회계반영 캐시 저장 실패: {e}")
+
+    def run_tenant_cycles(self):
+        """[V13.11] 다중 회사 모드: 회사별 사이클을 프로세스 풀에서 병렬 실행 후 통계 합산"""
+        if self.tenant_pool is None:
+            if MULTI_TENANT_CONFIG.get("shared_browser", False):
+                self.shared_browser, endpoint = launch_shared_browser(MULTI_TENANT_CONFIG.get("cdp_port", 9222))
+            else:
+                endpoint = MULTI_TENANT_CONFIG.get("cdp_endpoint") or None
+            self.cdp_endpoint = endpoint
+            max_workers = MULTI_TENANT_CONFIG.get("max_workers", min(len(TENANTS), os.cpu_count() or 1))
+            if max_workers > 1 and uses_clipboard():
+                # 회사별 프로세스가 같은 클립보드(시스템/공유 브라우저)를 쓰면 다른 회사 행이 붙여넣어질 수 있음
+                logger.warning("[TENANT] 클립보드 업로드 방식은 병렬 실행 불가 - 회사별 사이클 순차 실행 "
+                               "(병렬 실행은 upload.method=file 또는 upload.backend=http)")
+                max_workers = 1
+            self.tenant_pool = ProcessPoolExecutor(max_workers=max_workers)
+            self.tenant_pool_started_at = time.time()
+            logger.info(f"[TENANT] 다중 회사 모드: {len(TENANTS)}개 회사, 워커 {max_workers}개")
+
+        futures = {}
+        for tenant in TENANTS:
+            # 풀 워커의 cwd는 직전 회사 폴더이므로 작업 폴더는 부모 기준 절대 경로로 전달
+            data_dir = Path(tenant.get("data_dir", Path("tenants") / tenant["name"])).resolve()
+            future = self.tenant_pool.submit(run_tenant_cycle, {**tenant, "data_dir": str(data_dir)}, self.cdp_endpoint)
+            futures[future] = tenant["name"]
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                stats = future.result()
+            except Exception as e:
+                stats = {"total": 1, "failure": 1}
+                msg = f"[TENANT] {name} 사이클 실행 오류: {e}"
+                logger.error(msg)
+                self.notifier.send_error_notification(msg, traceback.format_exc())
+            totals = self.tenant_stats.setdefault(name, dict.fromkeys(self.stats, 0))
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+                self.stats[key] = self.stats.get(key, 0) + value
+            # 회사별 사이클은 풀 프로세스에서 실행되므로 지표는 반환된 통계로 집계
+            metrics.cycles.inc(stats.get("success", 0), result="success")
+            metrics.cycles.inc(stats.get("failure", 0), result="failure")
+            metrics.mark_uploaded(stats.get("count", 0))
+            logger.info(f"[TENANT] {name}: 성공 {stats.get('success', 0)} / 실패 {stats.get('failure', 0)} / 업로드 {stats.get('count', 0)}건")
+
+    def shutdown_tenants(self):
+        if self.tenant_pool:
+            self.tenant_pool.shutdown(wait=True, cancel_futures=True)
+            self.tenant_pool = None
+        if self.shared_browser:
+            self.shared_browser.kill()
+            self.shared_browser = None
+
     def single_cycle(self):
-        """단일 자동화 사이클 실행"""
+        """단일 자동화 사이클 실행 (구간 기록: traces/YYYYMMDD/<cycle_id>.jsonl)"""
+        if TENANTS and not self.tenant:
+            return self.run_tenant_cycles()
+        cycle_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        failures = self.stats["failure"]
+        tracer.start_cycle(cycle_id)
+        try:
+            with span("cycle", tenant=(self.tenant or {}).get("name")) as cycle_span:
+                self.run_cycle(cycle_id)
+                cycle_span.set(ok=self.stats["failure"] == failures)
+        finally:
+            tracer.end_cycle()
+
+    def run_cycle(self, cycle_id: str):
         logger.info(f"[{datetime.now().strftime('%H:%M:%S')}] [CYCLE] 자동화 사이클 시작")
         self.stats["total"] += 1
         
         try:
-            # 1. 브라우저 시작
-            page = self.browser.start()
-
-            # 2. 세션 로드 또는 로그인
-            if not self.browser.load_session():
-                page = self.browser.page 
-                login_mod = LoginModule(page)
-                if not login_mod.login():
-                    raise Exception("로그인 실패")
-                self.browser.save_session()
-            
-            page = self.browser.page
+            if self.budget:
+                self.budget.start()
+            # [V13.12] 단계별 체크포인트: 실패한 단계만 백오프 재시도, 앞 단계 출력은 재사용
+            checkpoint = self.checkpoint
+            resumed = checkpoint.load()
+
+            # 1~2. 브라우저 시작 + 세션 로드 또는 로그인
+            self.run_stage("session", self.stages.session, on_retry=lambda e: self.stages.close())
+
+            # [V13.1] 거래처 마스터 캐시 (만료 시에만 ERP 거래처 목록 증분 갱신)
+            customer_index = None
+            if CUSTOMER_MASTER_CONFIG.get("enabled", False):
+                customer_index = self.stages.customer_index()
+                logger.info(f"[CUSTOMER] 거래처 마스터 인덱스: {len(customer_index)}건")
 
             # 3. 데이터 읽기
-            reader = ReaderModule(page)
-            
             # [V10] 실시간 ERP 회계반영 내역 수집 (중복 제로 달성용)
-            if not reader.navigate_to_payment_query():
-                raise Exception("결제조회 페이지 이동 실패")
-            
-            # get_reflected_status 내부에서 '회계반영' 확인 후 자동으로 '미반영'으로 복구함
-            reflected_nos = reader.get_reflected_status()
+            # [V13.14] 예산이 부족하거나 시간 초과 시 마지막 회계반영 캐시로 대체 (축소 실행)
+            cached_reflected = None
+            if not checkpoint.has("reflected"):
+                if self.budget and not self.budget.affordable("reflected"):
+                    cached_reflected = self.load_reflected_cache()
+                if cached_reflected is None:
+                    try:
+                        checkpoint.save("reflected", self.run_stage("reflected", self.stages.read_reflected))
+                        self.save_reflected_cache(checkpoint.get("reflected"))
+                    except Exception as e:
+                        cached_reflected = self.load_reflected_cache() if self.budget else None
+                        if cached_reflected is None:
+                            raise
+                        logger.warning(f"[BUDGET] 회계반영 조회 실패({e}) - 캐시 사용")
+                else:
+                    self.budget.finish("reflected")
+                    logger.warning(f"[BUDGET] 시간 예산 부족 - 회계반영 조회 생략, 캐시 {len(cached_reflected)}건 사용")
+            reflected_nos = cached_reflected if cached_reflected is not None else set(checkpoint.get("reflected"))
             
-            raw_data = reader.read_payment_data()
+            # [V13.3] 이전 실행에서 F8 이후 기록 전에 중단된 업로드 의도 정리 (새 작업 전)
+            transformer = TransformerModule(customer_index=customer_index)
+            # 적재되어 업로드 대기 중인 행 (워커가 의도를 넘긴 뒤 큐에서 빼므로 복구 전에 조회)
+            queued_keys = self.outbox.keys() if self.outbox else set()
+            # 캐시된 회계반영 내역으로는 의도를 정리하지 않음 (미해결 행은 이번 업로드에서 제외)
+            in_flight_keys = self.intent_log.recover(set() if cached_reflected is not None else reflected_nos,
+                                                     transformer, notifier=self.notifier) | queued_keys
+
+            attempts = []
+
+            def read_unreflected():
+                # 재시도이거나 복원된 회계반영 내역을 쓰는 경우 미반영 탭으로 다시 이동
+                renavigate = bool(attempts) or "reflected" in resumed or cached_reflected is not None
+                attempts.append(1)
+                return self.stages.read_unreflected(renavigate)
+
+            if not checkpoint.has("unreflected"):
+                raw_data = self.run_stage("unreflected", read_unreflected)
+                archive_cycle("raw", cycle_id, raw_data)
+                checkpoint.save("unreflected", raw_data)
+            raw_data = checkpoint.get("unreflected")
+            current_span().set(rows_read=len(raw_data or []))
 
             if not raw_data:
                 logger.info("[INFO] 처리할 데이터가 없습니다.")
+                checkpoint.clear()
                 self.stats["success"] += 1
                 return
 
-            # 4. 데이터 변환 (실시간 내역 전달)
-            transformer = TransformerModule()
-            paste_rows, new_keys, cycle_stats = transformer.transform(raw_data, reflected_nos=reflected_nos)
-            
+            # 4. 데이터 변환 (실시간 내역 전달, 원장 상태에 의존하므로 체크포인트하지 않고 매번 수행)
+            paste_rows, new_keys, cycle_stats = transformer.transform(raw_data, reflected_nos=reflected_nos,
+                                                                  exclude_keys=in_flight_keys, notifier=self.notifier)
+            if self.budget:
+                self.budget.finish("transform")
+
+            # 상계된 승인/취소 쌍은 업로드 없이 원장에 바로 기록 (다음 사이클 재처리 방지)
+            if cycle_stats.get("netted_pairs") and not TEST_MODE:
+                transformer.add_uploaded_records(cycle_stats["netted_keys"])
+                transformer.save_netted_pairs(cycle_stats["netted_pairs"])
+                logger.info(f"[RECORD] 상계 {len(cycle_stats['netted_pairs'])}쌍 원장 기록")
+
             if not paste_rows:
                 logger.info("[INFO] 업로드할 새 데이터가 없습니다.")
+                checkpoint.clear()
                 self.stats["success"] += 1
                 return
 
-            # 5. 업로드
-            uploader = uploader = UploaderModule(page)
-            if not uploader.navigate_to_deposit_report():
-                raise Exception("입금보고서 페이지 이동 실패")
-            
-            if uploader.upload(paste_rows):
-                if not TEST_MODE:
-                    uploaded_records = transformer.load_uploaded_records()
-                    uploaded_records.update(new_keys)
-                    transformer.save_uploaded_records(uploaded_records)
-                    logger.info(f"[RECORD] {len(new_keys)}건 업로드 기록 저장")
-                
+            # [V13.10] 아웃박스 모드: 적재만 하고 업로드는 워커가 별도 주기로 처리
+            if self.outbox:
+                raw_by_key = {row['date_raw']: row for row in raw_data}
+                self.outbox.put(new_keys, paste_rows, [raw_by_key.get(k, {}) for k in new_keys])
+                self.upload_worker.notify()
+                checkpoint.clear()
                 self.stats["success"] += 1
-                self.stats["count"] += len(paste_rows)
-                self.stats["cancellations"] += cycle_stats.get("cancellations", 0)
-                logger.info(f"[OK] 사이클 완료 ({len(paste_rows)}건 처리)")
-            else:
-                raise Exception("업로드 과정 중 오류")
+                logger.info(f"[OK] 사이클 완료 ({len(paste_rows)}건 아웃박스 적재)")
+                return
+
+            # 5. 업로드 (붙여넣기 + 저장)
+            # 재시도 대상은 저장 시도 자체가 안 된(미확정) 행뿐: 저장됐거나 결과를 모르는 행은 다시 올리지 않음
+            pending = list(range(len(paste_rows)))
+            saved_indices = []
+            # [V13.14] 남은 예산 안에 올릴 수 있는 행만 업로드, 나머지는 다음 사이클로 이월 (원장 미기록)
+            deferred = 0
+            if self.budget:
+                limit = self.budget.rows_within("upload", len(paste_rows))
+                deferred = len(paste_rows) - limit
+                if deferred:
+                    pending = pending[:limit]
+                    logger.warning(f"[BUDGET] 시간 예산 부족 - {limit}/{len(paste_rows)}건만 업로드, {deferred}건 다음 사이클로 이월")
+            upload_seconds = [0.0]  # 붙여넣기+저장 시간만 (페이지 이동/재시도 대기 제외)
+
+            def upload_pending():
+                uploader = self.stages.uploader()
+                if not uploader.navigate_to_deposit_report():
+                    raise Exception("입금보고서 페이지 이동 실패")
+                started = time.time()
+                try:
+                    saved, settled = upload_rows(
+                        uploader, transformer, self.intent_log,
+                        [paste_rows[i] for i in pending], [new_keys[i] for i in pending], raw_data,
+                        cycle_id, reconciler=self.reconciler, record=not TEST_MODE)
+                finally:
+                    upload_seconds[0] += time.time() - started
+                saved_indices.extend(pending[i] for i in saved)
+                settled = set(settled)
+                pending[:] = [idx for i, idx in enumerate(pending) if i not in settled]
+                if pending:
+                    raise Exception(f"저장 미수행 {len(pending)}건: {uploader.last_result.get('reason', '')}")
+
+            try:
+                if pending:
+                    self.run_stage("upload", upload_pending)
+            finally:
+                saved_rows = [paste_rows[i] for i in sorted(saved_indices)]
+                self.count_saved(saved_rows)
+                current_span().set(rows_uploaded=len(saved_rows), rows_deferred=deferred)
+                if self.budget and upload_seconds[0]:
+                    self.budget.observe_upload(len(saved_rows), upload_seconds[0])
+
+            checkpoint.clear()
+            if len(saved_rows) < len(paste_rows) - deferred:
+                raise Exception(f"업로드 과정 중 오류 ({len(saved_rows)}/{len(paste_rows) - deferred}건 저장)")
+
+            self.stats["success"] += 1
+            logger.info(f"[OK] 사이클 완료 ({len(paste_rows)}건 처리)")
 
         except Exception as e:
             self.stats["failure"] += 1
@@ -218,9 +583,13 @@ class EcountAutomationOrchestrator:
             self.notifier.send_error_notification(err_msg, traceback.format_exc())
         
         finally:
+            # 실패한 사이클의 단계 출력(회계반영/미반영 조회)을 다음 사이클이 재사용하지 않도록 폐기
+            # (다음 사이클은 변경 감지/즉시 실행/주기 실행 모두 새로 조회해야 새 결제를 놓치지 않음)
+            self.checkpoint.clear()
+
             # [지능형 제어] 사이클 종료 시 무조건 브라우저를 닫아 화면을 정리함
             try:
-                self.browser.close()
+                self.stages.close()
             except:
                 pass
 
@@ -239,7 +608,7 @@ class EcountAutomationOrchestrator:
                 self.single_cycle()
                 logger.info("[TEST] 테스트 완료. 화면을 유지합니다.")
                 input(">>> Enter를 누르면 브라우저를 종료합니다...")
-                self.browser.close()
+                self.stages.stop()
             else:
                 # 운영 모드: 무한 루프
                 interval = SCHEDULE_CONFIG.get("interval_minutes", 30) * 60
@@ -247,8 +616,10 @@ class EcountAutomationOrchestrator:
                     # 프로그램 실행 중에는 항상 절전 방지 활성화
                     self.set_keep_alive(True)
 
-                    # 프로그램 시작 날짜 기록
-                    start_date = datetime.now().date()
+                    if self.upload_worker:
+                        self.upload_worker.start()
+                    if self.control:
+                        self.control.start()
 
                     while True:
                         # 프로세스 생존 신호 기록
@@ -258,13 +629,9 @@ class EcountAutomationOrchestrator:
                         current_time = now.strftime("%H:%M")
                         current_date = now.date()
 
-                        # 날짜가 바뀌고 업무시간(06:00) 이후가 되면 프로그램 재시작 (로그 파일 갱신)
-                        if current_date > start_date and current_time >= "06:00":
-                            logger.info("[RESTART] 새로운 날 시작 - 프로그램 재시작 (로그 파일 갱신)")
-                            self.set_keep_alive(False)
-                            self.browser.shutdown()
-                            logger.info("=" * 60)
-                            sys.exit(0)
+                        # 날짜가 바뀌고 업무시간(06:00) 이후가 되면 일일 전환 (프로세스는 유지)
+                        if current_date > self.day and current_time >= ROLLOVER_CONFIG.get("at", "06:00"):
+                            self.rollover_day()
 
                         # 17:45 이후이고 아직 보고서를 보내지 않았다면 발송
                         if current_time >= "17:45" and not self.daily_report_sent and self.stats["total"] > 0:
@@ -272,32 +639,71 @@ class EcountAutomationOrchestrator:
                             self.notifier.send_summary_notification(self.stats)
                             self.daily_report_sent = True
 
-                        if self.is_work_time():
-                            self.single_cycle()
-                            logger.info(f"[WAIT] {interval//60}분 대기 중...")
-                            time.sleep(interval)
+                        if self.run_requested:
+                            # 제어 서버 즉시 실행 요청 (업무 시간/일시 중지와 무관, 다음 예약 주기는 여기서부터)
+                            self.run_requested = False
+                            self.triggered_cycle("run-now")
+                        elif self.paused and self.is_work_time():
+                            self.wait(self.scheduler.probe_interval if self.scheduler else interval)
+                        elif self.is_work_time() and self.scheduler:
+                            reason = self.scheduler.due()
+                            if reason:
+                                self.triggered_cycle(reason)
+                            self.wait(self.scheduler.probe_interval)
+                        elif self.is_work_time():
+                            if time.time() >= self.next_cycle_at:
+                                self.triggered_cycle("interval")
+                                logger.info(f"[WAIT] {interval//60}분 대기 중...")
+                            self.wait(self.next_cycle_at - time.time())
                         else:
+                            if self.scheduler:
+                                self.scheduler.probe.close()
                             # 다음 날을 위해 통계 및 플래그 초기화
                             if self.stats["total"] > 0 or self.daily_report_sent:
                                 logger.info("[SLEEP] 업무 시간 종료. 통계 초기화")
-                                self.stats = {
-                                    "total": 0,
-                                    "success": 0,
-                                    "failure": 0,
-                                    "count": 0,
-                                    "cancellations": 0
-                                }
-                                self.daily_report_sent = False
+                                self.reset_daily_stats("work_hours_end")
 
                             logger.info(f"[SLEEP] 업무 시간 외 (다음 확인 10분 후)")
-                            time.sleep(600)
+                            self.wait(600)
                 finally:
                     self.set_keep_alive(False) # 프로그램 종료 시 무조건 절전 허용 복구
-                    self.browser.shutdown()  # Playwright 완전 종료
+                    self.stages.stop()  # Playwright(또는 브라우저 워커) 완전 종료
+                    if self.scheduler:
+                        self.scheduler.probe.close()
+                    if self.upload_worker:
+                        self.upload_worker.stop()
+                    if self.control:
+                        self.control.stop()
+                    self.shutdown_tenants()
+                    if self.reconciler:
+                        self.reconciler.shutdown()
         finally:
             # 프로그램 종료 시 반드시 락 해제
             self.release_lock()
 
+def run_tenant_cycle(tenant: dict, cdp_endpoint: str = None) -> dict:
+    """프로세스 풀 워커: 회사별 작업 폴더에서 사이클 1회 실행 후 통계 반환
+
+    작업 폴더(data_dir, 기본 tenants/<name>, 절대 경로)를 cwd로 사용하므로 세션, 원장, 업로드 의도,
+    실패 기록, 아카이브, 로그 등 상대 경로 상태 파일이 회사별로 분리된다.
+    """
+    data_dir = Path(tenant["data_dir"])
+    data_dir.mkdir(parents=True, exist_ok=True)
+    os.chdir(data_dir)
+    logger.log_dir = Path("logs")
+    logger.log_dir.mkdir(exist_ok=True)
+    logger.prefix = f"v9_{tenant['name']}"
+    logger.rotate_log_file(initial=True)
+
+    orchestrator = EcountAutomationOrchestrator(tenant=tenant, cdp_endpoint=cdp_endpoint)
+    try:
+        orchestrator.single_cycle()
+        return orchestrator.stats
+    finally:
+        orchestrator.stages.stop()
+        orchestrator.release_lock()
+
+
 if __name__ == "__main__":
     orchestrator = EcountAutomationOrchestrator()
     orchestrator.run()
@@ -0,0 +1,229 @@
+import json
+import queue
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from core.logger import logger
+from core.browser import BrowserManager, launch_shared_browser
+from core.intent_log import UploadIntentLog
+from modules.login import LoginModule
+from modules.notifier import NotifierModule
+from modules.reader import ReaderModule
+from modules.transformer import TransformerModule
+from modules.uploader import create_uploader
+from modules.upload_worker import upload_rows
+from modules.customer_master import CustomerMasterModule
+from utils.config import BACKFILL_CONFIG, CUSTOMER_MASTER_CONFIG, TEST_MODE
+
+
+def day_range(date_from, date_to) -> list:
+    return [date_from + timedelta(days=i) for i in range((date_to - date_from).days + 1)]
+
+
+def rows_on(raw_data: list, day) -> list:
+    """결제요청일시(date_raw, 2026/01/06 ...)가 해당 일자인 행"""
+    prefix = day.strftime("%Y/%m/%d")
+    return [row for row in raw_data if row['date_raw'].startswith(prefix)]
+
+
+class BackfillProgress:
+    """일자별 진행 체크포인트 (JSON) - 다시 실행하면 완료된 일자는 건너뛴다"""
+
+    def __init__(self, progress_file="backfill_progress.json"):
+        self.progress_file = Path(progress_file)
+        self.lock = threading.Lock()
+        self.days = {}
+        if self.progress_file.exists():
+            try:
+                with open(self.progress_file, 'r', encoding='utf-8') as f:
+                    self.days = json.load(f)
+            except Exception:
+                self.days = {}
+
+    def is_done(self, day) -> bool:
+        return self.days.get(day.isoformat(), {}).get("status") == "done"
+
+    def get(self, day) -> dict:
+        return self.days.get(day.isoformat(), {})
+
+    def update(self, day, **fields):
+        with self.lock:
+            self.days[day.isoformat()] = {**fields, "at": datetime.now().isoformat()}
+            tmp = self.progress_file.with_suffix(".tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.days, f, ensure_ascii=False, indent=2)
+            tmp.replace(self.progress_file)
+
+    def reset(self, days: list):
+        with self.lock:
+            for day in days:
+                self.days.pop(day.isoformat(), None)
+
+
+class BackfillRunner:
+    """장애 복구용 기간 일괄 처리: 일자별 분할 → 병렬 브라우저 컨텍스트에서 조회/청크 업로드
+
+    워커 스레드마다 자체 Playwright/컨텍스트를 사용하고 남은 일자를 큐에서 가져간다.
+    원장/실패 기록/업로드 의도는 프로세스 내 잠금으로 공유하므로 중복 업로드가 없다.
+    클립보드 붙여넣기는 워커 간에 직렬화된다 (공유 클립보드로 다른 워커의 행이 붙여넣어지지 않음).
+    조회 기간 필터(backfill.date_filter)가 없으면 전체 목록을 한 번 읽어 일자별로 나누고
+    업로드만 병렬로 수행한다.
+    """
+
+    def __init__(self, date_from, date_to, workers: int = None, chunk_size: int = None, restart: bool = False):
+        self.days = day_range(date_from, date_to)
+        self.workers = workers or BACKFILL_CONFIG.get("workers", 3)
+        self.chunk_size = chunk_size or BACKFILL_CONFIG.get("chunk_size", 50)
+        self.progress = BackfillProgress(BACKFILL_CONFIG.get("progress_file", "backfill_progress.json"))
+        if restart:
+            self.progress.reset(self.days)
+        self.intent_log = UploadIntentLog()
+        self.notifier = NotifierModule()
+        self.cdp_endpoint = BACKFILL_CONFIG.get("cdp_endpoint") or None
+        self.login_lock = threading.Lock()  # 세션 만료 시 한 워커만 로그인
+        self.local = threading.local()
+        self.date_filter = False
+        self.full_rows = None
+        self.reflected_nos = set()
+        self.in_flight_keys = set()
+        self.customer_index = None
+
+    def run(self) -> dict:
+        pending = [day for day in self.days if not self.progress.is_done(day)]
+        if len(pending) < len(self.days):
+            logger.info(f"[BACKFILL] 완료된 일자 {len(self.days) - len(pending)}일 건너뜀 (체크포인트)")
+        if not pending:
+            return self.summary()
+
+        shared_browser = None
+        if BACKFILL_CONFIG.get("shared_browser", False):
+            shared_browser, self.cdp_endpoint = launch_shared_browser(BACKFILL_CONFIG.get("cdp_port", 9223))
+        try:
+            self.prepare(pending[0], pending[-1])
+            days = queue.Queue()
+            for day in pending:
+                days.put(day)
+            workers = min(self.workers, len(pending))
+            logger.info(f"[BACKFILL] {pending[0]} ~ {pending[-1]} ({len(pending)}일) / 컨텍스트 {workers}개 / 청크 {self.chunk_size}행")
+            threads = [threading.Thread(target=self._worker, args=(days,), name=f"backfill-{i + 1}")
+                       for i in range(workers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            if shared_browser:
+                shared_browser.kill()
+        return self.summary()
+
+    def _session(self, browser: BrowserManager):
+        browser.start()
+        if not browser.load_session():
+            with self.login_lock:
+                if not LoginModule(browser.page).login():
+                    raise Exception("로그인 실패")
+                browser.save_session()
+        return browser.page
+
+    def _page(self):
+        """현재 워커 스레드의 브라우저 페이지 (없으면 시작)"""
+        browser = getattr(self.local, "browser", None)
+        if browser and browser.page and not browser.page.is_closed():
+            return browser.page
+        if browser:
+            browser.close()
+        self.local.browser = BrowserManager(cdp_endpoint=self.cdp_endpoint)
+        return self._session(self.local.browser)
+
+    def _close_page(self):
+        browser = getattr(self.local, "browser", None)
+        if browser:
+            browser.close()
+            self.local.browser = None
+
+    def prepare(self, date_from, date_to):
+        """회계반영 내역(중복 차단) 조회 + 미해결 업로드 의도 정리 (일자 분할 전 1회)"""
+        try:
+            page = self._page()
+            if CUSTOMER_MASTER_CONFIG.get("enabled", False):
+                self.customer_index = CustomerMasterModule(page).get_index()
+            reader = ReaderModule(page)
+            if not reader.navigate_to_payment_query() or not reader.click_unreflected_filter():
+                raise Exception("결제조회 페이지 이동 실패")
+            self.date_filter = reader.set_date_range(date_from, date_to)
+            self.reflected_nos = reader.get_reflected_status()
+            if not self.date_filter:
+                logger.warning("[BACKFILL] 조회 기간 필터 미설정 - 전체 목록을 한 번 읽어 일자별로 분할")
+                self.full_rows = reader.read_payment_data(raise_errors=True)
+        finally:
+            self._close_page()
+        # 기간으로 좁힌 회계반영 내역으로는 기간 밖 의도를 판정할 수 없으므로 보류만 한다
+        self.in_flight_keys = self.intent_log.recover(set() if self.date_filter else self.reflected_nos,
+                                                      TransformerModule(customer_index=self.customer_index),
+                                                      notifier=self.notifier)
+
+    def _worker(self, days: queue.Queue):
+        try:
+            while True:
+                try:
+                    day = days.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    result = self.run_shard(day)
+                    self.progress.update(day, status="done", **result)
+                    logger.info(f"[BACKFILL] {day} 완료: 조회 {result['read']}건 / 업로드 {result['saved']}/{result['uploaded']}건")
+                except Exception as e:
+                    logger.error(f"[BACKFILL] {day} 실패: {e}")
+                    self.progress.update(day, status="failed", reason=str(e)[:200])
+                    self._close_page()  # 다음 일자는 새 컨텍스트에서 시작
+        finally:
+            self._close_page()
+
+    def run_shard(self, day) -> dict:
+        """일자 1개: 기간 조회 → 변환 → 청크 업로드 (모든 행 저장 시 완료)"""
+        if self.full_rows is None:
+            reader = ReaderModule(self._page())
+            if not reader.navigate_to_payment_query() or not reader.click_unreflected_filter():
+                raise Exception("결제조회 페이지 이동 실패")
+            if not reader.set_date_range(day, day):
+                raise Exception("조회 기간 설정 실패")
+            raw_data = reader.read_payment_data(raise_errors=True)
+        else:
+            raw_data = self.full_rows
+        raw_data = rows_on(raw_data, day)  # 기간 필터가 적용되지 않은 행 제외
+        result = {"read": len(raw_data), "uploaded": 0, "saved": 0}
+        if not raw_data:
+            return result
+
+        transformer = TransformerModule(customer_index=self.customer_index)
+        paste_rows, new_keys, cycle_stats = transformer.transform(raw_data, reflected_nos=self.reflected_nos,
+                                                                  exclude_keys=self.in_flight_keys, notifier=self.notifier)
+        if cycle_stats.get("netted_pairs") and not TEST_MODE:
+            transformer.add_uploaded_records(cycle_stats["netted_keys"])
+            transformer.save_netted_pairs(cycle_stats["netted_pairs"])
+        result["uploaded"] = len(paste_rows)
+        if not paste_rows:
+            return result
+
+        uploader = create_uploader(self._page())
+        if not uploader.navigate_to_deposit_report():
+            raise Exception("입금보고서 페이지 이동 실패")
+        saved, _ = upload_rows(uploader, transformer, self.intent_log, paste_rows, new_keys, raw_data,
+                               f"backfill_{day:%Y%m%d}", record=not TEST_MODE, chunk_size=self.chunk_size)
+        result["saved"] = len(saved)
+        if len(saved) < len(paste_rows):
+            raise Exception(f"{len(saved)}/{len(paste_rows)}건 저장: {uploader.last_result.get('reason', '')}")
+        return result
+
+    def summary(self) -> dict:
+        entries = [self.progress.get(day) for day in self.days]
+        summary = {
+            "days": len(self.days),
+            "done": sum(1 for e in entries if e.get("status") == "done"),
+            "failed": [day.isoformat() for day, e in zip(self.days, entries) if e.get("status") == "failed"],
+            "saved": sum(e.get("saved", 0) for e in entries),
+        }
+        logger.info(f"[BACKFILL] 완료 {summary['done']}/{summary['days']}일 / 저장 {summary['saved']}건"
+                    + (f" / 실패 일자: {', '.join(summary['failed'])}" if summary['failed'] else ""))
+        return summary
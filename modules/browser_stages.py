@@ -0,0 +1,275 @@
+import os
+import time
+import traceback
+import subprocess
+import multiprocessing
+from pathlib import Path
+from core.logger import logger
+from core.tracing import tracer, span
+from core.browser import BrowserManager
+from modules.login import LoginModule
+from modules.reader import ReaderModule
+from modules.uploader import BaseUploader, create_uploader
+from modules.customer_master import CustomerMasterModule
+from utils.config import BROWSER_CONFIG
+
+WORKER_CONFIG = BROWSER_CONFIG.get("worker", {})
+
+# 단계별 벽시계 제한 시간 (초): 초과 시 워커 프로세스를 종료하고 다음 호출에서 재시작
+DEFAULT_TIMEOUTS = {
+    "session": 180,
+    "customer_index": 300,
+    "read_reflected": 180,
+    "read_unreflected": 300,
+    "navigate_deposit": 120,
+    "upload": 900,
+    "close": 60,
+}
+
+
+class BrowserStages:
+    """사이클의 브라우저 단계 (같은 프로세스에서 실행)"""
+
+    def __init__(self, browser: BrowserManager, credentials: dict = None):
+        self.browser = browser
+        self.credentials = credentials
+        self.deadline = None  # 같은 프로세스에서는 강제 중단 불가 (단계 사이 축소 판단에만 사용)
+
+    def session(self):
+        """브라우저/세션 준비 (살아 있는 페이지는 재사용, 없으면 시작 후 세션 로드 또는 로그인)"""
+        if self.browser.page and not self.browser.page.is_closed():
+            return self.browser.page
+        self.browser.close()
+        self.browser.start()
+        if not self.browser.load_session():
+            login_mod = LoginModule(self.browser.page, credentials=self.credentials)
+            if not login_mod.login():
+                raise Exception("로그인 실패")
+            self.browser.save_session()
+        return self.browser.page
+
+    def customer_index(self):
+        return CustomerMasterModule(self.session()).get_index()
+
+    def read_reflected(self) -> list:
+        reader = ReaderModule(self.session())
+        if not reader.navigate_to_payment_query():
+            raise Exception("결제조회 페이지 이동 실패")
+        # get_reflected_status 내부에서 '회계반영' 확인 후 자동으로 '미반영'으로 복구함
+        return sorted(reader.get_reflected_status())
+
+    def read_unreflected(self, renavigate: bool = False) -> list:
+        reader = ReaderModule(self.session())
+        if renavigate:
+            if not reader.navigate_to_payment_query() or not reader.click_unreflected_filter():
+                raise Exception("미반영 목록 이동 실패")
+        return reader.read_payment_data()
+
+    def uploader(self) -> BaseUploader:
+        return create_uploader(self.session())
+
+    def close(self):
+        self.browser.close()
+
+    def stop(self):
+        self.browser.shutdown()
+
+
+def _worker_main(conn, credentials, cdp_endpoint, log_file):
+    """브라우저 워커 프로세스: 파이프로 받은 단계 명령을 BrowserStages로 실행"""
+    logger.log_file = Path(log_file)  # 부모와 같은 로그 파일에 기록
+    stages = BrowserStages(BrowserManager(cdp_endpoint=cdp_endpoint), credentials)
+    tracer.listeners.append(lambda record: conn.send(("span", record)))  # 부모 프로세스 지표 집계용
+    uploader = None
+    while True:
+        try:
+            cmd, args, trace_context = conn.recv()
+        except EOFError:
+            break
+        tracer.attach(trace_context)  # 부모 프로세스의 사이클/단계 구간 아래에 기록
+        try:
+            if cmd == "stop":
+                stages.close()
+                conn.send(("ok", None))
+                break
+            with span(f"worker.{cmd}"):
+                if cmd == "navigate_deposit":
+                    uploader = stages.uploader()
+                    result = uploader.navigate_to_deposit_report()
+                elif cmd == "upload":
+                    result = _worker_upload(conn, uploader, *args)
+                else:
+                    result = getattr(stages, cmd)(*args)
+                    if cmd == "session":
+                        result = True  # 페이지 객체는 프로세스 경계를 넘길 수 없음
+            conn.send(("ok", result))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}", traceback.format_exc()))
+
+
+def _worker_upload(conn, uploader, paste_rows: list, chunk_size: int):
+    """업로드 실행, 저장 직전/청크 결과 시점마다 부모에 알림 (before_save는 부모 응답 후 진행)"""
+    def before_save(start=0, end=len(paste_rows)):
+        conn.send(("before_save", start, end))
+        conn.recv()  # 부모가 업로드 의도를 디스크에 기록할 때까지 대기
+
+    def on_chunk_result(start, end, ok):
+        conn.send(("chunk", start, end, ok, uploader.last_result))
+
+    if chunk_size:
+        uploader.upload_chunked(paste_rows, chunk_size, before_save=before_save, on_chunk_result=on_chunk_result)
+    else:
+        ok = uploader.upload(paste_rows, before_save=before_save)
+        on_chunk_result(0, len(paste_rows), ok)
+    return None
+
+
+class RemoteUploader(BaseUploader):
+    """브라우저 워커 프로세스의 업로더 대리 객체 (upload_rows에서 로컬 업로더와 동일하게 사용)"""
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+
+    def navigate_to_deposit_report(self) -> bool:
+        return self.client.call("navigate_deposit")
+
+    def upload(self, paste_rows: list, before_save=None) -> bool:
+        results = []
+        self._run(paste_rows, 0, lambda start, end: before_save and before_save(),
+                  lambda start, end, ok: results.append(ok))
+        return bool(results and results[-1])
+
+    def upload_chunked(self, paste_rows: list, chunk_size: int, before_save=None, on_chunk_result=None) -> list:
+        results = []
+
+        def on_chunk(start, end, ok):
+            results.append({'start': start, 'end': end, 'ok': ok})
+            if on_chunk_result:
+                on_chunk_result(start, end, ok)
+
+        self._run(paste_rows, chunk_size, lambda start, end: before_save and before_save(start, end), on_chunk)
+        return results
+
+    def _run(self, paste_rows, chunk_size, before_save, on_chunk):
+        def handle(msg):
+            if msg[0] == "before_save":
+                before_save(msg[1], msg[2])
+                return ("ack",)
+            if msg[0] == "chunk":
+                self.last_result = msg[4]
+                on_chunk(msg[1], msg[2], msg[3])
+            return None
+
+        self.client.call("upload", [list(r) for r in paste_rows], chunk_size, handler=handle)
+
+
+class BrowserWorkerClient:
+    """브라우저 단계를 별도 워커 프로세스에서 실행 (파이프 통신 + 단계별 제한 시간)
+
+    제한 시간을 넘긴 워커는 PID 단위로 강제 종료하고 TimeoutError를 올린다 (다음 호출에서 재시작).
+    오케스트레이터/스케줄러/통계/알림은 메인 프로세스에서 계속 동작한다.
+    """
+
+    def __init__(self, credentials: dict = None, cdp_endpoint: str = None):
+        self.credentials = credentials
+        self.cdp_endpoint = cdp_endpoint
+        self.timeouts = {**DEFAULT_TIMEOUTS, **WORKER_CONFIG.get("timeouts", {})}
+        self.process = None
+        self.conn = None
+        self.deadline = None  # 사이클 시간 예산: 설정 시 단계 제한 시간을 마감까지로 축소
+
+    def _spawn(self):
+        ctx = multiprocessing.get_context("spawn")
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, self.credentials, self.cdp_endpoint, str(logger.log_file)),
+                                   name="browser-worker", daemon=True)
+        self.process.start()
+        child_conn.close()
+        logger.info(f"[WORKER] 브라우저 워커 시작 (PID: {self.process.pid})")
+
+    def kill(self, reason: str = ""):
+        if self.process:
+            logger.error(f"[WORKER] 브라우저 워커 강제 종료 (PID: {self.process.pid}) {reason}")
+            if os.name == "nt":
+                # 워커가 띄운 Playwright 드라이버/브라우저까지 PID 트리 단위로 종료
+                subprocess.run(["taskkill", "/F", "/T", "/PID", str(self.process.pid)], capture_output=True)
+            else:
+                self.process.kill()
+            self.process.join(10)
+        if self.conn:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def call(self, cmd: str, *args, handler=None):
+        """명령 실행 → 결과 (handler: 중간 알림 메시지 처리, 응답이 있으면 워커에 회신)"""
+        if not self.process or not self.process.is_alive():
+            self._spawn()
+        timeout = self.timeouts.get(cmd, 300)
+        if self.deadline:
+            timeout = min(timeout, max(1.0, self.deadline - time.time()))
+        deadline = time.time() + timeout
+        self._send((cmd, args, tracer.context()), cmd)
+        while True:
+            try:
+                ready = self.conn.poll(max(0, deadline - time.time()))
+                msg = self.conn.recv() if ready else None
+            except (EOFError, ConnectionError) as e:
+                self.kill(f"- 연결 끊김: {e}")
+                raise RuntimeError(f"브라우저 워커 비정상 종료 ('{cmd}' 단계): {e}")
+            if msg is None:
+                self.kill(f"- '{cmd}' {timeout}초 초과")
+                raise TimeoutError(f"브라우저 워커 '{cmd}' 단계 제한 시간({timeout}초) 초과")
+            if msg[0] == "ok":
+                return msg[1]
+            if msg[0] == "error":
+                logger.error(f"[WORKER] '{cmd}' 오류\n{msg[2]}")
+                raise RuntimeError(msg[1])
+            if msg[0] == "span":
+                tracer.emit(msg[1])
+                continue
+            try:
+                reply = handler(msg) if handler else None
+            except Exception:
+                self.kill(f"- '{cmd}' 중간 처리 오류")  # 응답을 기다리는 워커를 남기지 않음
+                raise
+            if reply:
+                self._send(reply, cmd)
+
+    def _send(self, msg, cmd: str):
+        try:
+            self.conn.send(msg)
+        except (EOFError, ConnectionError) as e:
+            self.kill(f"- 연결 끊김: {e}")
+            raise RuntimeError(f"브라우저 워커 비정상 종료 ('{cmd}' 단계): {e}")
+
+    # BrowserStages와 같은 인터페이스
+    def session(self):
+        return self.call("session")
+
+    def customer_index(self):
+        return self.call("customer_index")
+
+    def read_reflected(self) -> list:
+        return self.call("read_reflected")
+
+    def read_unreflected(self, renavigate: bool = False) -> list:
+        return self.call("read_unreflected", renavigate)
+
+    def uploader(self) -> BaseUploader:
+        return RemoteUploader(self)
+
+    def close(self):
+        if self.process and self.process.is_alive():
+            self.call("close")
+
+    def stop(self):
+        if self.process and self.process.is_alive():
+            try:
+                self.call("stop")
+                self.process.join(10)
+            except Exception:
+                pass
+        if self.process and self.process.is_alive():
+            self.kill("- 종료 응답 없음")
@@ -0,0 +1,168 @@
+import re
+import json
+import time
+import difflib
+from collections import OrderedDict
+from pathlib import Path
+from datetime import datetime
+from core.logger import logger
+from utils.config import CUSTOMER_LIST_HASH, CUSTOMER_MASTER_CONFIG
+
+# 법인 표기 / 전화번호 접미사 패턴
+CORP_PATTERN = re.compile(r"\(\s*주\s*\)|㈜|주식회사|\(\s*유\s*\)|유한회사")
+PHONE_PATTERN = re.compile(r"[\s(\[]*0\d{1,2}[-\s.)]?\d{3,4}[-\s.]?\d{4}[\s)\]]*$")
+
+
+def normalize_name(name: str) -> str:
+    """거래처명 정규화 (공백, (주)/주식회사, 전화번호 접미사 제거)"""
+    if not name:
+        return ""
+    text = PHONE_PATTERN.sub("", name.strip())
+    text = CORP_PATTERN.sub("", text)
+    return "".join(text.split()).lower()
+
+
+class CustomerIndex:
+    """거래처 마스터 인메모리 인덱스 (정확 일치 / 정규화 일치 / 유사도 LRU)
+
+    유사도 일치는 이름이 다른 거래처에 코드를 붙일 수 있으므로 lookup()으로 일치 방식과
+    마스터 거래처명을 함께 돌려주어 호출 측이 검토 대상으로 기록하게 한다.
+    """
+
+    def __init__(self, customers: dict = None, lru_size: int = 512, fuzzy_cutoff: float = 0.85):
+        self.exact = {}
+        self.normalized = {}
+        self.names = {}  # 정규화 키 -> 마스터 거래처명 (유사도 일치 검토용)
+        self.lru_size = lru_size
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.fuzzy_cache = OrderedDict()
+        if customers:
+            self.update(customers)
+
+    def __len__(self):
+        return len(self.exact)
+
+    def update(self, customers: dict):
+        """{거래처명: 거래처코드} 병합 (증분 갱신)"""
+        for name, code in customers.items():
+            if not name or not code:
+                continue
+            self.exact[name.strip()] = code
+            key = normalize_name(name)
+            if key:
+                self.normalized.setdefault(key, code)
+                self.names.setdefault(key, name.strip())
+        # 마스터가 바뀌면 유사도 결과는 무효
+        self.fuzzy_cache.clear()
+
+    def resolve(self, name: str) -> str:
+        """거래처명 -> 거래처코드 (찾지 못하면 빈 문자열)"""
+        return self.lookup(name)[0]
+
+    def lookup(self, name: str) -> tuple:
+        """거래처명 -> (거래처코드, 일치 방식 'exact'|'normalized'|'fuzzy'|'', 마스터 거래처명)"""
+        if not name:
+            return "", "", ""
+        code = self.exact.get(name.strip())
+        if code:
+            return code, "exact", name.strip()
+
+        key = normalize_name(name)
+        if not key:
+            return "", "", ""
+        code = self.normalized.get(key)
+        if code:
+            return code, "normalized", self.names.get(key, "")
+
+        if key in self.fuzzy_cache:
+            self.fuzzy_cache.move_to_end(key)
+            matched = self.fuzzy_cache[key]
+        else:
+            matches = difflib.get_close_matches(key, self.normalized.keys(), n=1, cutoff=self.fuzzy_cutoff)
+            matched = matches[0] if matches else ""
+            self.fuzzy_cache[key] = matched
+            if len(self.fuzzy_cache) > self.lru_size:
+                self.fuzzy_cache.popitem(last=False)
+        if not matched:
+            return "", "", ""
+        return self.normalized[matched], "fuzzy", self.names.get(matched, matched)
+
+
+class CustomerMasterModule:
+    """ERP 거래처 목록 캐시 관리 (customer_master.json)"""
+
+    def __init__(self, page=None):
+        self.page = page
+        self.cache_file = Path(CUSTOMER_MASTER_CONFIG.get("cache_file", "customer_master.json"))
+        self.refresh_minutes = CUSTOMER_MASTER_CONFIG.get("refresh_minutes", 360)
+        # 거래처등록 목록의 '거래처코드' 열: ECount 필드 ID는 BUSINESS_NO (OpenAPI 거래처등록의 거래처코드와 동일,
+        # 사업자등록번호를 거래처코드로 쓰는 관행에서 온 이름). 목록 화면 열 ID가 다르면 code_column으로 지정
+        self.code_column = CUSTOMER_MASTER_CONFIG.get("code_column", "BUSINESS_NO")
+        self.name_column = CUSTOMER_MASTER_CONFIG.get("name_column", "CUST_NAME")
+
+    def load_cache(self) -> dict:
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                return {}
+        return {}
+
+    def save_cache(self, cache: dict):
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+
+    def is_stale(self, cache: dict) -> bool:
+        updated_at = cache.get("updated_at")
+        if not updated_at:
+            return True
+        try:
+            age = datetime.now() - datetime.fromisoformat(updated_at)
+        except ValueError:
+            return True
+        return age.total_seconds() > self.refresh_minutes * 60
+
+    def read_customer_list(self) -> dict:
+        """거래처등록 목록에서 {거래처명: 거래처코드} 읽기"""
+        logger.info("[CUSTOMER] 거래처 목록 조회 페이지로 이동...")
+        self.page.evaluate(f"window.location.hash = '{CUSTOMER_LIST_HASH}';")
+        time.sleep(10)
+
+        # 셀 단위 inner_text 반복 대신 한 번의 evaluate로 일괄 수집
+        rows = self.page.evaluate(
+            """([codeCol, nameCol]) => {
+                const codes = [...document.querySelectorAll(`span[data-column-id="${codeCol}"]`)];
+                const names = [...document.querySelectorAll(`span[data-column-id="${nameCol}"]`)];
+                const n = Math.min(codes.length, names.length);
+                const out = [];
+                for (let i = 0; i < n; i++) {
+                    out.push([names[i].innerText.trim(), codes[i].innerText.trim()]);
+                }
+                return out;
+            }""",
+            [self.code_column, self.name_column]
+        )
+        return {name: code for name, code in rows if name and code}
+
+    def get_index(self) -> CustomerIndex:
+        """캐시 로드 + 필요 시 ERP에서 증분 갱신 후 인덱스 반환"""
+        cache = self.load_cache()
+        customers = cache.get("customers", {})
+
+        if self.page and CUSTOMER_LIST_HASH and self.is_stale(cache):
+            try:
+                fetched = self.read_customer_list()
+                added = {k: v for k, v in fetched.items() if customers.get(k) != v}
+                if added:
+                    customers.update(added)
+                logger.info(f"[CUSTOMER] 거래처 마스터 갱신: 신규/변경 {len(added)}건 (전체 {len(customers)}건)")
+                self.save_cache({"updated_at": datetime.now().isoformat(), "customers": customers})
+            except Exception as e:
+                logger.warning(f"[WARN] 거래처 마스터 갱신 실패, 기존 캐시 사용: {e}")
+
+        return CustomerIndex(
+            customers,
+            lru_size=CUSTOMER_MASTER_CONFIG.get("fuzzy_cache_size", 512),
+            fuzzy_cutoff=CUSTOMER_MASTER_CONFIG.get("fuzzy_cutoff", 0.85)
+        )
@@ -0,0 +1,186 @@
+import json
+import time
+import uuid
+import queue
+import http.client
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+from core.logger import logger
+from core.tracing import traced
+from modules.uploader import BaseUploader, UPLOAD_COLUMNS, prepare_paste_rows
+from utils.config import UPLOAD_CONFIG, TEST_MODE
+
+HTTP_CONFIG = UPLOAD_CONFIG.get("http", {})
+
+
+class ConnectionPool:
+    """keep-alive HTTP 연결 풀 (스레드 간 공유, 연결은 재사용)"""
+
+    def __init__(self, base_url: str, size: int = 4, timeout: float = 30):
+        parsed = urlparse(base_url)
+        self.scheme = parsed.scheme or "http"
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        for _ in range(size):
+            self._idle.put(None)
+
+    def _new_connection(self):
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    @contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        if conn is None:
+            conn = self._new_connection()
+        try:
+            yield conn
+        except Exception:
+            conn.close()
+            conn = None
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def request(self, method: str, path: str, body: dict = None, headers: dict = None) -> dict:
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json; charset=utf-8", "Connection": "keep-alive", **(headers or {})}
+        with self.connection() as conn:
+            conn.request(method, self.base_path + path, body=payload, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+            if resp.status >= 400:
+                raise RuntimeError(f"HTTP {resp.status}: {data[:200].decode('utf-8', 'replace')}")
+            return json.loads(data) if data else {}
+
+    def close(self):
+        while not self._idle.empty():
+            conn = self._idle.get_nowait()
+            if conn:
+                conn.close()
+
+
+class HttpUploaderModule(BaseUploader):
+    """HTTP API 업로드 백엔드 (배치 POST + 연결 풀 + 동시 전송)
+
+    계약 (stub_erp_server.py와 동일):
+        POST {endpoint}/api/deposits   헤더 Idempotency-Key, 본문 {"rows": [{열 이름: 값}, ...]}
+        -> {"success": N, "fail": M, "failed": [{"index": 배치 내 0-based 행 번호, "reason": "..."}]}
+    """
+
+    def __init__(self, endpoint: str = None, dry_run: bool = None):
+        super().__init__()
+        # dry_run: 저장 전송 생략 (기본: 테스트 모드). 스텁 서버 벤치마크는 False로 실제 전송
+        self.dry_run = TEST_MODE if dry_run is None else dry_run
+        self.endpoint = endpoint or HTTP_CONFIG.get("endpoint", "http://127.0.0.1:8765")
+        self.batch_size = HTTP_CONFIG.get("batch_size", 200)
+        self.concurrency = HTTP_CONFIG.get("concurrency", 4)
+        self.retries = HTTP_CONFIG.get("retries", 2)
+        headers = {}
+        if HTTP_CONFIG.get("api_key"):
+            headers["Authorization"] = f"Bearer {HTTP_CONFIG['api_key']}"
+        self.headers = headers
+        self.pool = ConnectionPool(self.endpoint, size=self.concurrency, timeout=HTTP_CONFIG.get("timeout", 30))
+
+    def post_batch(self, rows: list) -> dict:
+        """배치 1건 전송 (멱등 키로 재시도 시 중복 저장 방지)"""
+        body = {"rows": [dict(zip(UPLOAD_COLUMNS, (str(c) for c in row))) for row in rows]}
+        headers = {**self.headers, "Idempotency-Key": uuid.uuid4().hex}
+        for attempt in range(self.retries + 1):
+            try:
+                return self.pool.request("POST", "/api/deposits", body, headers)
+            except (OSError, http.client.HTTPException) as e:
+                if attempt == self.retries:
+                    raise
+                logger.warning(f"   [HTTP] 배치 전송 재시도 ({attempt+1}/{self.retries}): {e}")
+                time.sleep(0.5 * (2 ** attempt))
+
+    def _submit(self, rows: list) -> dict:
+        """rows를 batch_size로 나눠 동시 전송 후 결과 집계 (last_result 형식)"""
+        batches = [(i, rows[i:i + self.batch_size]) for i in range(0, len(rows), self.batch_size)]
+        failed_rows, success, unknown = {}, 0, []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {executor.submit(self.post_batch, batch): offset for offset, batch in batches}
+            for future in as_completed(futures):
+                offset = futures[future]
+                try:
+                    resp = future.result()
+                except Exception as e:
+                    unknown.append(str(e))
+                    continue
+                success += resp.get("success", 0)
+                for item in resp.get("failed", []):
+                    failed_rows[offset + item["index"]] = item.get("reason", "")
+
+        if unknown:
+            status = "unknown"  # 전송 결과를 확인하지 못한 배치가 있음 → 의도 로그로 복구
+        elif not failed_rows:
+            status = "saved"
+        elif success:
+            status = "partial"
+        else:
+            status = "failed"
+        return {"status": status, "failed_rows": failed_rows, "success": success,
+                "reason": "; ".join(unknown)[:200]}
+
+    @staticmethod
+    def _dry_run_result(rows: int) -> dict:
+        return {"status": "saved", "failed_rows": {}, "success": rows, "reason": "테스트 모드 (전송 생략)"}
+
+    @traced()
+    def upload(self, paste_rows: list, before_save=None) -> bool:
+        self.last_result = {}
+        if not paste_rows:
+            logger.info("[INFO] 업로드할 데이터가 없습니다")
+            return False
+
+        rows = prepare_paste_rows(paste_rows)
+        if self.dry_run:
+            # UI 백엔드와 동일: 저장 생략 (업로드 의도도 기록하지 않음)
+            logger.warning(f"[TEST] 테스트 모드: HTTP 저장 전송 생략 ({len(rows)}건)")
+            self.last_result = self._dry_run_result(len(rows))
+            return True
+        if before_save:
+            before_save()
+
+        started = time.time()
+        self.last_result = self._submit(rows)
+        elapsed = time.time() - started
+        logger.info(f"[HTTP] {len(rows)}건 전송 완료 ({elapsed:.2f}초, {len(rows) / max(elapsed, 1e-6):,.0f}건/초) "
+                    f"- 결과: {self.last_result['status']}")
+        for idx, reason in sorted(self.last_result["failed_rows"].items()):
+            logger.error(f"   [ROW-FAIL] {idx+1}행: {reason}")
+        return self.last_result["status"] == "saved"
+
+    @traced()
+    def upload_chunked(self, paste_rows: list, chunk_size: int, before_save=None, on_chunk_result=None) -> list:
+        """청크를 동시에 전송하고, 완료되는 순서대로 메인 스레드에서 결과 콜백 호출"""
+        ranges = [(i, min(i + chunk_size, len(paste_rows))) for i in range(0, len(paste_rows), chunk_size)]
+        rows = prepare_paste_rows(paste_rows)
+        results = []
+        if self.dry_run:
+            logger.warning(f"[TEST] 테스트 모드: HTTP 저장 전송 생략 ({len(rows)}건, {len(ranges)}개 청크)")
+            for start, end in ranges:
+                self.last_result = self._dry_run_result(end - start)
+                results.append({'start': start, 'end': end, 'ok': True, 'elapsed': 0.0})
+                if on_chunk_result:
+                    on_chunk_result(start, end, True)
+            return results
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {}
+            for start, end in ranges:
+                if before_save:
+                    before_save(start, end)  # 의도 로그는 전송 전에 메인 스레드에서 기록
+                futures[executor.submit(self._submit, rows[start:end])] = (start, end, time.time())
+            for future in as_completed(futures):
+                start, end, started = futures[future]
+                self.last_result = future.result()
+                ok = self.last_result["status"] == "saved"
+                results.append({'start': start, 'end': end, 'ok': ok, 'elapsed': round(time.time() - started, 2)})
+                if on_chunk_result:
+                    on_chunk_result(start, end, ok)
+        return results
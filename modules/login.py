@@ -1,11 +1,14 @@
 import time
 from core.logger import logger
+from core.tracing import traced
 from utils.config import LOGIN_URL, CREDENTIALS
 
 class LoginModule:
-    def __init__(self, page):
+    def __init__(self, page, credentials: dict = None):
         self.page = page
+        self.credentials = credentials or CREDENTIALS  # 다중 회사 모드: 회사별 계정
 
+    @traced()
     def login(self) -> bool:
         """이카운트 로그인"""
         try:
@@ -15,15 +18,15 @@ class LoginModule:
 
             # 회사코드 입력
             logger.info("   회사코드 입력...")
-            self.page.locator('input[name="com_code"]').fill(CREDENTIALS.get('company_code', ''))
+            self.page.locator('input[name="com_code"]').fill(self.credentials.get('company_code', ''))
 
             # 아이디 입력
             logger.info("   아이디 입력...")
-            self.page.locator('input[name="id"]').fill(CREDENTIALS.get('username', ''))
+            self.page.locator('input[name="id"]').fill(self.credentials.get('username', ''))
 
             # 비밀번호 입력
             logger.info("   비밀번호 입력...")
-            self.page.locator('input[name="passwd"]').fill(CREDENTIALS.get('password', ''))
+            self.page.locator('input[name="passwd"]').fill(self.credentials.get('password', ''))
 
             time.sleep(1)
 
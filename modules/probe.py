@@ -0,0 +1,71 @@
+import time
+import hashlib
+import urllib.request
+from core.logger import logger
+from core.browser import BrowserManager
+from modules.reader import ReaderModule
+from utils.config import SCHEDULE_CONFIG
+
+PROBE_CONFIG = SCHEDULE_CONFIG.get("probe", {})
+
+# 미반영 그리드의 행 수 + 최신 결제요청일시 (헤더 행 제외, evaluate 1회)
+PROBE_JS = """() => {
+    const cells = [...document.querySelectorAll('span[data-column-id="SETL_REQST_DTM"]')]
+        .map(el => el.innerText.trim())
+        .filter(t => t && !t.includes('결제요청'));
+    return [cells.length, cells.reduce((a, b) => (b > a ? b : a), '')];
+}"""
+
+
+class ChangeProbe:
+    """미반영 결제내역 변경 감지용 경량 프로브
+
+    - probe.url 설정 시: HTTP GET 응답 본문 해시를 서명으로 사용
+    - 그 외: 헤드리스 브라우저를 결제내역조회(미반영) 화면에 띄워 둔 채(warm) 재조회
+    세션이 없거나 만료되면 로그인하지 않고 None 반환 (전체 사이클이 로그인 담당)
+    """
+
+    def __init__(self):
+        self.url = PROBE_CONFIG.get("url", "")
+        self.timeout = PROBE_CONFIG.get("timeout_seconds", 10)
+        self.settle = PROBE_CONFIG.get("settle_seconds", 5)
+        self.browser = None
+        self.reader = None
+
+    def signature(self):
+        """현재 상태 서명 반환 (변경 감지용, 실패 시 None)"""
+        try:
+            if self.url:
+                with urllib.request.urlopen(self.url, timeout=self.timeout) as resp:
+                    return hashlib.md5(resp.read()).hexdigest()
+            return self._page_signature()
+        except Exception as e:
+            logger.warning(f"[PROBE] 변경 확인 실패: {e}")
+            self.close()
+            return None
+
+    def _page_signature(self):
+        if self.reader is None:
+            self.browser = BrowserManager()
+            self.browser.start(headless=True)
+            if not self.browser.load_session():
+                self.close()
+                return None
+            self.reader = ReaderModule(self.browser.page)
+            if not self.reader.navigate_to_payment_query() or not self.reader.click_unreflected_filter():
+                self.close()
+                return None
+        else:
+            # warm 페이지: 미반영 탭 재선택으로 목록만 재조회
+            if not self.reader.click_unreflected_filter():
+                self.close()
+                return None
+        time.sleep(self.settle)
+        return tuple(self.browser.page.evaluate(PROBE_JS))
+
+    def close(self):
+        """프로브 브라우저 종료 (전체 사이클 시작 전 호출: 같은 스레드의 Playwright 중복 실행 방지)"""
+        if self.browser:
+            self.browser.close()
+        self.browser = None
+        self.reader = None
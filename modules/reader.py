@@ -2,12 +2,14 @@ import time
 import pandas as pd
 from pathlib import Path
 from core.logger import logger
-from utils.config import PAYMENT_QUERY_HASH
+from core.tracing import traced, current_span
+from utils.config import PAYMENT_QUERY_HASH, BACKFILL_CONFIG
 
 class ReaderModule:
     def __init__(self, page):
         self.page = page
 
+    @traced()
     def navigate_to_payment_query(self) -> bool:
         """결제내역조회 페이지로 이동"""
         try:
@@ -22,8 +24,10 @@ class ReaderModule:
             logger.error(f"[ERROR] 페이지 이동 실패: {e}")
             return False
 
+    @traced()
     def click_unreflected_filter(self) -> bool:
         """'미반영' 필터 클릭"""
+        current_span().set(tab="미반영")
         try:
             logger.info("[CLICK] '미반영' 버튼 클릭 시도...")
             
@@ -76,8 +80,43 @@ class ReaderModule:
             logger.error(f"[ERROR] 미반영 버튼 클릭 실패: {e}")
             return False
 
-    def read_payment_data(self) -> list:
-        """결제내역조회 테이블에서 데이터 읽기"""
+    @traced()
+    def set_date_range(self, date_from, date_to) -> bool:
+        """결제일자 조회 기간 설정 후 검색 (backfill.date_filter 셀렉터 미설정 시 False)"""
+        current_span().set(date_from=str(date_from), date_to=str(date_to))
+        date_filter = BACKFILL_CONFIG.get("date_filter", {})
+        if not date_filter.get("from_selector") or not date_filter.get("to_selector"):
+            return False
+        fmt = date_filter.get("format", "%Y/%m/%d")
+        try:
+            logger.info(f"[FILTER] 조회 기간 설정: {date_from} ~ {date_to}")
+            for frame in self.page.frames:
+                from_input = frame.locator(date_filter["from_selector"]).first
+                try:
+                    if not from_input.is_visible(timeout=3000):
+                        continue
+                except:
+                    continue
+                from_input.fill(date_from.strftime(fmt))
+                frame.locator(date_filter["to_selector"]).first.fill(date_to.strftime(fmt))
+                if date_filter.get("search_selector"):
+                    frame.locator(date_filter["search_selector"]).first.click(force=True)
+                else:
+                    from_input.press("Enter")
+                time.sleep(date_filter.get("wait_seconds", 8))
+                return True
+            logger.warning("   [WARN] 조회 기간 입력란을 찾지 못했습니다.")
+            return False
+        except Exception as e:
+            logger.error(f"[ERROR] 조회 기간 설정 실패: {e}")
+            return False
+
+    @traced()
+    def read_payment_data(self, raise_errors: bool = False) -> list:
+        """결제내역조회 테이블에서 데이터 읽기
+
+        raise_errors: 읽기 실패를 빈 목록 대신 예외로 전달 (backfill: 실패한 일자를 '데이터 없음'으로 완료 처리하지 않음)
+        """
         logger.info("[READ] 결제내역 데이터 읽기 프로세스 진입...")
         try:
             # 데이터 로딩 시간 확보
@@ -93,6 +132,7 @@ class ReaderModule:
 
             row_count = len(date_cells)
             logger.info(f"   감지된 데이터 행: {row_count}건")
+            current_span().set(grid_rows=row_count)
 
             if row_count <= 1:
                 logger.info("[INFO] 현재 미반영 데이터가 없거나 로딩되지 않았습니다.")
@@ -124,12 +164,17 @@ class ReaderModule:
                     continue
 
             logger.info(f"[OK] 총 {len(data)}건의 유효 데이터 추출 완료")
+            current_span().set(rows=len(data))
             return data
         except Exception as e:
             logger.error(f"[ERROR] 데이터 읽기 실패: {e}")
+            if raise_errors:
+                raise
             return []
+    @traced()
     def get_reflected_status(self) -> set:
         """'회계반영' 탭에서 이미 처리된 승인번호 목록 수집 (실시간 중복 체크용)"""
+        current_span().set(tab="회계반영")
         logger.info("[CHECK] 실시간 '회계반영' 내역 확인 중...")
         try:
             # 탭 로딩 대기 강화
@@ -165,6 +210,7 @@ class ReaderModule:
                     reflected_nos.add(text)
             
             logger.info(f"   [OK] 실시간 회계반영 {len(reflected_nos)}건 감지됨")
+            current_span().set(rows=len(reflected_nos))
             
             # 다시 '미반영' 탭으로 복구 (다음 작업을 위해)
             self.click_unreflected_filter()
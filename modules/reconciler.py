@@ -0,0 +1,165 @@
+import json
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from datetime import datetime
+from core.logger import logger
+from core.browser import BrowserManager
+from modules.transformer import TransformerModule
+from modules.uploader import parse_amount
+from utils.config import URLS, RECONCILE_CONFIG
+
+# 입금보고서 '목록' 화면 (저장된 행 조회용). 입력 화면(deposit_report_hash)은 저장 행을 보여주지 않으므로
+# 대체하지 않는다: 설정이 없으면 대사를 생략한다.
+DEPOSIT_LIST_HASH = URLS.get("deposit_list_hash", "")
+
+
+def reconcile_rows(intended: list, saved: list) -> list:
+    """(일자, 거래처명, 금액) 해시 조인 → ERP에서 찾지 못한 의도 행 목록
+
+    intended: [{'key', 'date', 'customer', 'amount'}, ...]
+    saved: [(일자, 거래처명, 금액), ...] (ERP 입금보고서 목록)
+    """
+    available = Counter((d, c.strip(), parse_amount(a)) for d, c, a in saved)
+    missing = []
+    for row in intended:
+        join_key = (row['date'], row['customer'].strip(), parse_amount(row['amount']))
+        if available[join_key] > 0:
+            available[join_key] -= 1
+        else:
+            missing.append(row)
+    return missing
+
+
+class ReconcilerModule:
+    """저장 후 입금보고서 대사 (별도 스레드 / 별도 브라우저, 사이클 흐름과 분리)"""
+
+    def __init__(self, notifier=None):
+        self.notifier = notifier
+        self.results_file = Path(RECONCILE_CONFIG.get("results_file", "reconcile_results.jsonl"))
+        self.delay = RECONCILE_CONFIG.get("delay_seconds", 60)
+        self.columns = RECONCILE_CONFIG.get("columns", {
+            "date": "IO_DATE", "customer": "CUST_DES", "amount": "SUPPLY_AMT"
+        })
+        # 목록 전체 건수 표시 / 다음 페이지 버튼 (완결된 조회인지 판단하는 기준)
+        self.total_selector = RECONCILE_CONFIG.get("total_count_selector", "#totalCount")
+        self.next_selector = RECONCILE_CONFIG.get("next_page_selector", "a.next:not(.disabled)")
+        self.max_pages = RECONCILE_CONFIG.get("max_pages", 50)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reconcile")
+
+    def submit(self, cycle_id: str, paste_rows: list, record_keys: list):
+        """저장된 행의 대사 작업 예약 (즉시 반환)"""
+        if not DEPOSIT_LIST_HASH:
+            logger.warning("[RECONCILE] urls.deposit_list_hash 미설정 - 대사 생략")
+            return
+        intended = [
+            {'key': key, 'date': row[0], 'customer': row[6], 'amount': row[7]}
+            for row, key in zip(paste_rows, record_keys)
+        ]
+        if intended:
+            self.executor.submit(self._run, cycle_id, intended)
+            logger.info(f"[RECONCILE] 대사 작업 예약 ({len(intended)}건, {self.delay}초 후)")
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def read_saved_entries(self, page, dates: set) -> tuple:
+        """입금보고서 목록을 페이지 끝까지 읽어 (해당 일자 행, 완결 여부) 반환
+
+        완결 여부: 읽은 전체 행 수가 목록에 표시된 전체 건수와 일치할 때만 True.
+        0건이거나 건수를 확인할 수 없거나 일부 페이지만 읽은 경우는 판단 불가(False).
+        """
+        page.evaluate(f"window.location.hash = '{DEPOSIT_LIST_HASH}';")
+        time.sleep(10)
+        columns = [self.columns["date"], self.columns["customer"], self.columns["amount"]]
+        rows = []
+        for _ in range(self.max_pages):
+            rows.extend(page.evaluate(
+                """([dateCol, custCol, amtCol]) => {
+                    const col = id => [...document.querySelectorAll(`span[data-column-id="${id}"]`)]
+                        .map(el => el.innerText.trim());
+                    const d = col(dateCol), c = col(custCol), a = col(amtCol);
+                    const n = Math.min(d.length, c.length, a.length);
+                    const out = [];
+                    for (let i = 0; i < n; i++) out.push([d[i], c[i], a[i]]);
+                    return out;
+                }""",
+                columns
+            ))
+            next_button = page.locator(self.next_selector)
+            if next_button.count() == 0:
+                break
+            next_button.first.click()
+            time.sleep(2)
+
+        total = self.read_total_count(page)
+        complete = bool(rows) and total == len(rows)
+        if not complete:
+            logger.warning(f"[RECONCILE] 목록 조회 불완전 (읽은 행 {len(rows)}건 / 표시 건수 {total})")
+
+        # 목록 일자 표기(2026/01/06, 2026-01-06, 2026/01/06-1 등)를 업로드 형식으로 정규화
+        normalized = [(d.replace('-', '/')[:10], c, a) for d, c, a in rows]
+        return [r for r in normalized if r[0] in dates], complete
+
+    def read_total_count(self, page):
+        """목록 전체 건수 (표시가 없거나 숫자가 아니면 None)"""
+        try:
+            text = page.locator(self.total_selector).first.inner_text(timeout=3000)
+        except Exception:
+            return None
+        digits = "".join(ch for ch in text if ch.isdigit())
+        return int(digits) if digits else None
+
+    def _run(self, cycle_id: str, intended: list):
+        time.sleep(self.delay)
+        browser = BrowserManager()
+        try:
+            browser.start(headless=True)
+            if not browser.load_session():
+                logger.warning("[RECONCILE] 세션 없음/만료 - 대사 생략 (다음 저장 시 재시도)")
+                return
+
+            by_date = defaultdict(list)
+            for row in intended:
+                by_date[row['date']].append(row)
+
+            saved, complete = self.read_saved_entries(browser.page, set(by_date))
+            missing = reconcile_rows(intended, saved)
+            self.record(cycle_id, intended, saved, missing, complete)
+        except Exception as e:
+            logger.warning(f"[RECONCILE] 대사 실패 ({cycle_id}): {e}")
+        finally:
+            browser.close()
+
+    def record(self, cycle_id: str, intended: list, saved: list, missing: list, complete: bool = True):
+        """대사 결과 기록 + 누락 행은 원장에서 제거해 다음 사이클에 재업로드
+
+        complete=False(목록 조회 불완전)이면 결과만 기록하고 원장은 건드리지 않는다
+        (잘못 제거하면 다음 사이클에 이미 저장된 행이 중복 업로드됨).
+        """
+        entry = {
+            'cycle_id': cycle_id,
+            'checked_at': datetime.now().isoformat(),
+            'intended': len(intended),
+            'erp_rows': len(saved),
+            'complete': complete,
+            'missing': missing,
+        }
+        with open(self.results_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+        if not complete:
+            logger.warning(f"[RECONCILE] 대사 판단 불가 ({cycle_id}): 목록을 끝까지 읽지 못함 - 원장 유지")
+            return
+
+        if not missing:
+            logger.info(f"[RECONCILE] 대사 일치 ({cycle_id}): {len(intended)}건 모두 입금보고서에서 확인")
+            return
+
+        TransformerModule().remove_uploaded_records([row['key'] for row in missing])
+        msg = f"[RECONCILE] 입금보고서 누락 {len(missing)}/{len(intended)}건 ({cycle_id}) -> 원장에서 제거, 재업로드 대상"
+        logger.error(msg)
+        if self.notifier:
+            detail = "\n".join(f"{r['date']} / {r['customer']} / {r['amount']}" for r in missing[:50])
+            self.notifier.send_error_notification(msg, detail)
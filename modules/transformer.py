@@ -1,33 +1,163 @@
+import os
 import json
+import threading
+from collections import defaultdict
 from pathlib import Path
+from datetime import datetime
 from core.logger import logger
+from core.tracing import traced, current_span
+from utils.config import TRANSFORM_CONFIG, CUSTOMER_MASTER_CONFIG
+
+# 업로드 기록(원장)/실패 기록 파일 갱신 직렬화 (백그라운드 대사 작업, 업로드 워커와 공유)
+_records_lock = threading.RLock()
+
+
+def _write_json(path: Path, data):
+    """임시 파일에 쓴 뒤 교체 (쓰는 도중 다른 스레드/프로세스가 빈 파일이나 잘린 JSON을 읽지 않음)"""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
 
 class TransformerModule:
-    def __init__(self):
-        self.records_file = Path("uploaded_records.json")
+    def __init__(self, customer_index=None, records_file=None):
+        self.records_file = Path(records_file or "uploaded_records.json")
+        self.netted_file = Path("netted_pairs.json")
+        self.failures_file = Path("upload_failures.json")
+        self.max_row_retries = TRANSFORM_CONFIG.get("max_row_retries", 3)
+        self.netting_mode = TRANSFORM_CONFIG.get("cancellation_netting", "off")  # 'off' | 'drop'
+        self.customer_index = customer_index  # CustomerIndex (거래처코드 자동 매핑)
+        # 유사도 일치 거래처코드를 업로드 행에 쓸지 (기본: 쓰지 않고 검토 목록으로만 알림)
+        self.apply_fuzzy = CUSTOMER_MASTER_CONFIG.get("apply_fuzzy_match", False)
 
     def load_uploaded_records(self) -> set:
-        if self.records_file.exists():
+        """원장 읽기 (쓰기와 같은 잠금 안에서 수행)
+
+        파일이 손상된 경우 빈 원장으로 대체하지 않고 예외를 그대로 올린다
+        (빈 원장으로 진행하면 이미 업로드한 행 전체가 중복 업로드됨).
+        """
+        with _records_lock:
+            if not self.records_file.exists():
+                return set()
             try:
                 with open(self.records_file, 'r', encoding='utf-8') as f:
                     return set(json.load(f))
-            except:
-                return set()
-        return set()
+            except json.JSONDecodeError as e:
+                logger.error(f"[LEDGER] 원장 파일 손상 ({self.records_file}): {e}")
+                raise
 
     def save_uploaded_records(self, records: set):
-        with open(self.records_file, 'w', encoding='utf-8') as f:
-            json.dump(list(records), f, ensure_ascii=False, indent=2)
+        with _records_lock:
+            _write_json(self.records_file, list(records))
+
+    def add_uploaded_records(self, keys):
+        """원장에 키 추가 (읽기-수정-쓰기를 잠금 안에서 수행)"""
+        with _records_lock:
+            records = self.load_uploaded_records()
+            records.update(keys)
+            self.save_uploaded_records(records)
+
+    def remove_uploaded_records(self, keys):
+        """원장에서 키 제거 (대사 결과 ERP에 없는 행을 재업로드 대상으로 복귀)"""
+        with _records_lock:
+            records = self.load_uploaded_records()
+            records.difference_update(keys)
+            self.save_uploaded_records(records)
+
+    def load_failed_rows(self) -> dict:
+        """행 단위 저장 실패 기록 {작업 일시: {'reason', 'attempts', 'last_at'}}"""
+        if self.failures_file.exists():
+            try:
+                with open(self.failures_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                return {}
+        return {}
 
-    def transform(self, raw_data: list, reflected_nos: set = None) -> tuple:
-        """입금보고서 형식으로 변환 + 실시간/로컬 중복 체크"""
+    def record_failed_rows(self, failed: dict, succeeded: list = None):
+        """실패 행은 사유와 시도 횟수를 누적 기록, 이후 성공한 행은 기록에서 제거"""
+        with _records_lock:
+            failures = self.load_failed_rows()
+            for key in succeeded or []:
+                failures.pop(key, None)
+            for key, reason in failed.items():
+                entry = failures.get(key, {'attempts': 0})
+                entry.update({'reason': reason, 'attempts': entry['attempts'] + 1,
+                              'last_at': datetime.now().isoformat()})
+                failures[key] = entry
+            if failures:
+                _write_json(self.failures_file, failures)
+            elif self.failures_file.exists():
+                self.failures_file.unlink()
+
+    def save_netted_pairs(self, pairs: list):
+        """상계 처리된 (승인, 취소) 쌍을 원장에 추가 기록"""
+        if not pairs:
+            return
+        with _records_lock:
+            history = []
+            if self.netted_file.exists():
+                try:
+                    with open(self.netted_file, 'r', encoding='utf-8') as f:
+                        history = json.load(f)
+                except:
+                    history = []
+            history.extend(pairs)
+            _write_json(self.netted_file, history)
+
+    def net_cancellations(self, paste_rows: list, record_keys: list, auth_nos: list) -> tuple:
+        """같은 배치 안의 승인/취소 쌍 상계 (승인번호 + 거래처명 + 금액 해시 인덱스)"""
+        # 승인 행 인덱스: (승인번호, 거래처명, 금액) -> [행 번호, ...]
+        approvals = defaultdict(list)
+        for i, row in enumerate(paste_rows):
+            if auth_nos[i] and not row[7].startswith('-'):
+                approvals[(auth_nos[i], row[6], row[7])].append(i)
+
+        dropped = set()
+        pairs = []
+        for i, row in enumerate(paste_rows):
+            if not auth_nos[i] or not row[7].startswith('-'):
+                continue
+            candidates = approvals.get((auth_nos[i], row[6], row[7][1:]))
+            if not candidates:
+                continue
+            j = candidates.pop(0)
+            dropped.update((i, j))
+            pairs.append({
+                'approval_key': record_keys[j],
+                'cancel_key': record_keys[i],
+                'auth_no': auth_nos[i],
+                'customer': row[6],
+                'amount': row[7][1:],
+                'netted_at': datetime.now().isoformat()
+            })
+            logger.info(f"   [NET] 승인/취소 상계: 승인번호 {auth_nos[i]} / {row[6]} / {row[7][1:]}원")
+
+        kept_rows = [r for i, r in enumerate(paste_rows) if i not in dropped]
+        kept_keys = [k for i, k in enumerate(record_keys) if i not in dropped]
+        return kept_rows, kept_keys, pairs
+
+    @traced()
+    def transform(self, raw_data: list, reflected_nos: set = None, exclude_keys: set = None, notifier=None) -> tuple:
+        """입금보고서 형식으로 변환 + 실시간/로컬 중복 체크
+
+        exclude_keys: 저장 여부가 아직 확정되지 않은(진행 중) 작업 일시 키
+        """
         logger.info("[TRANSFORM] 데이터 변환 중...")
 
         uploaded_records = self.load_uploaded_records()
         logger.info(f"   기존 업로드 기록: {len(uploaded_records)}건")
+        if exclude_keys:
+            uploaded_records = uploaded_records | set(exclude_keys)
+            logger.info(f"   진행 중(미확정) 업로드: {len(exclude_keys)}건 제외")
+        failed_rows = self.load_failed_rows()
 
         paste_rows = []
         new_record_keys = []
+        row_auth_nos = []
 
         # 통계 추적
         stats = {
@@ -35,8 +165,14 @@ class TransformerModule:
             'excluded_invalid': 0,
             'excluded_duplicate_local': 0,
             'excluded_duplicate_erp': 0,
+            'excluded_retry_exhausted': 0,
+            'retried_rows': 0,
             'cancellations': 0,
-            'normal_transactions': 0
+            'normal_transactions': 0,
+            'customer_codes_resolved': 0,
+            'customer_fuzzy_matches': [],  # 유사도로 붙인 거래처코드 (검토 대상)
+            'netted_pairs': [],
+            'netted_keys': []
         }
 
         for row in raw_data:
@@ -64,6 +200,16 @@ class TransformerModule:
                 stats['excluded_duplicate_erp'] += 1
                 continue
 
+            # 3. 이전 저장에서 행 단위로 실패한 데이터: 사유 표시 후 재시도 (최대 횟수 초과 시 제외)
+            if record_key in failed_rows:
+                failure = failed_rows[record_key]
+                if failure['attempts'] >= self.max_row_retries:
+                    logger.error(f"   [SKIP] 재시도 한도 초과 ({failure['attempts']}회, 수동 확인 필요): {record_key} / {customer} - {failure['reason']}")
+                    stats['excluded_retry_exhausted'] += 1
+                    continue
+                logger.warning(f"   [RETRY] 실패 행 재시도 ({failure['attempts']+1}회차): {record_key} / {customer} - 이전 사유: {failure['reason']}")
+                stats['retried_rows'] += 1
+
             if not auth_no:
                 logger.warning(f"   [WARN] 승인번호를 가져오지 못함 (일시: {record_key} / 고객: {customer})")
 
@@ -101,6 +247,21 @@ class TransformerModule:
             else:
                 account = account_raw
 
+            # 4. 거래처코드 매핑 (캐시된 거래처 마스터 인덱스, ERP 왕복 없음)
+            customer_code, match_kind, matched_name = (
+                self.customer_index.lookup(customer) if self.customer_index else ("", "", ""))
+            if match_kind == "fuzzy":
+                # 확인되지 않은 추정값: 기본은 거래처코드를 비워 두고 검토 목록에만 올림
+                stats['customer_fuzzy_matches'].append({'key': record_key, 'customer': customer,
+                                                        'matched': matched_name, 'code': customer_code,
+                                                        'applied': self.apply_fuzzy})
+                logger.warning(f"   [CUSTOMER] 유사도 매핑 (검토 필요): '{customer}' -> '{matched_name}' ({customer_code})"
+                               f"{'' if self.apply_fuzzy else ' - 거래처코드 미입력'}")
+                if not self.apply_fuzzy:
+                    customer_code = ""
+            if customer_code:
+                stats['customer_codes_resolved'] += 1
+
             # 입금보고서 행 구성
             paste_row = [
                 date_part,      # A: 일자
@@ -108,7 +269,7 @@ class TransformerModule:
                 "",             # C: 회계전표No.
                 account,        # D: 입금계좌코드
                 "1089",         # E: 계정코드
-                "",             # F: 거래처코드
+                customer_code,  # F: 거래처코드
                 customer,       # G: 거래처명
                 amount,         # H: 금액
                 "",             # I: 수수료
@@ -119,6 +280,15 @@ class TransformerModule:
 
             paste_rows.append(paste_row)
             new_record_keys.append(record_key)
+            row_auth_nos.append(auth_no)
+
+        # [V13.2] 승인/취소 상계 (선택): 쌍으로 묶인 행은 업로드하지 않고 원장에만 기록
+        if self.netting_mode == 'drop' and stats['cancellations'] > 0:
+            paste_rows, new_record_keys, pairs = self.net_cancellations(paste_rows, new_record_keys, row_auth_nos)
+            stats['netted_pairs'] = pairs
+            stats['netted_keys'] = [k for p in pairs for k in (p['approval_key'], p['cancel_key'])]
+            stats['cancellations'] -= len(pairs)
+            stats['normal_transactions'] -= len(pairs)
 
         # 상세 처리 결과 로깅
         logger.info("=" * 60)
@@ -126,17 +296,36 @@ class TransformerModule:
         logger.info(f"   [IN] 총 조회 데이터: {stats['total_raw']}건")
         logger.info(f"   [OUT] 업로드 대상: {len(paste_rows)}건")
 
-        total_excluded = stats['excluded_invalid'] + stats['excluded_duplicate_local'] + stats['excluded_duplicate_erp']
+        total_excluded = (stats['excluded_invalid'] + stats['excluded_duplicate_local']
+                          + stats['excluded_duplicate_erp'] + stats['excluded_retry_exhausted'])
         logger.info(f"   [SKIP] 제외된 데이터: {total_excluded}건")
         if total_excluded > 0:
             logger.info(f"      - 중복(로컬): {stats['excluded_duplicate_local']}건")
             logger.info(f"      - 중복(ERP 회계반영): {stats['excluded_duplicate_erp']}건")
             logger.info(f"      - 무효 데이터: {stats['excluded_invalid']}건")
+            if stats['excluded_retry_exhausted']:
+                logger.info(f"      - 재시도 한도 초과: {stats['excluded_retry_exhausted']}건")
+        if stats['netted_pairs']:
+            logger.info(f"   [NET] 승인/취소 상계: {len(stats['netted_pairs'])}쌍 ({len(stats['netted_keys'])}건 업로드 생략)")
 
         if len(paste_rows) > 0:
             logger.info(f"   [DETAIL] 업로드 내역:")
             logger.info(f"      - 일반 거래: {stats['normal_transactions']}건")
             logger.info(f"      - 취소 거래: {stats['cancellations']}건")
+            if self.customer_index:
+                logger.info(f"      - 거래처코드 매핑: {stats['customer_codes_resolved']}건")
+                if stats['customer_fuzzy_matches']:
+                    logger.warning(f"      - 유사도 매핑(검토 필요): {len(stats['customer_fuzzy_matches'])}건")
         logger.info("=" * 60)
 
+        if notifier and stats['customer_fuzzy_matches']:
+            matches = stats['customer_fuzzy_matches']
+            msg = (f"[CUSTOMER] 거래처명 유사도 매핑 {len(matches)}건 검토 필요 "
+                   f"({'거래처코드 입력됨' if self.apply_fuzzy else '거래처코드 비워 둠'})")
+            detail = "\n".join(f"{m['key']} / {m['customer']} -> {m['matched']} ({m['code']})" for m in matches[:50])
+            notifier.send_error_notification(msg, detail)
+
+        current_span().set(rows_in=len(raw_data), rows_out=len(paste_rows),
+                           duplicates=stats['excluded_duplicate_local'] + stats['excluded_duplicate_erp'],
+                           customer_fuzzy=len(stats['customer_fuzzy_matches']))
         return paste_rows, new_record_keys, stats
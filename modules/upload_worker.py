@@ -0,0 +1,209 @@
+import threading
+import traceback
+from datetime import datetime
+from core.logger import logger
+from core.browser import BrowserManager
+from core.archive import archive_cycle
+from modules.transformer import TransformerModule
+from modules.uploader import create_uploader
+from utils.config import UPLOAD_CONFIG
+
+OUTBOX_CONFIG = UPLOAD_CONFIG.get("outbox", {})
+
+
+def upload_rows(uploader, transformer, intent_log, paste_rows: list, record_keys: list, raw_data: list,
+                cycle_id: str, reconciler=None, record=True, chunk_size: int = None) -> tuple:
+    """업로드 + 결과 반영 (원장 / 행 실패 기록 / 업로드 의도 / 아카이브 / 대사 예약)
+
+    반환: (저장된 행 인덱스, 결과가 확정된 행 인덱스)
+        확정 = 저장·행 실패 기록·의도 로그 중 하나로 이관되어 다시 올릴 필요가 없는 행
+        (not_saved 또는 업로드 예외로 저장 시도 자체가 안 된 행은 미확정)
+    """
+    auth_by_key = {row['date_raw']: row.get('auth_no', '') for row in raw_data}
+    intents = {}
+    saved, settled = [], []
+
+    # F8 직전 업로드 의도 선기록 (저장 후 원장 기록 전 중단 대비)
+    def before_save(start=0, end=len(record_keys)):
+        keys = record_keys[start:end]
+        intents[(start, end)] = intent_log.begin(keys, [auth_by_key.get(k, '') for k in keys])
+
+    def settle(start=0, end=len(record_keys), ok=False):
+        result = uploader.last_result
+        intent_id = intents.pop((start, end), None)
+        failed = {}
+        if not ok:
+            status = result.get("status")
+            if status == "partial":
+                # [V13.9] 부분 저장: 성공 행만 기록, 실패 행은 사유와 함께 재시도 대상
+                failed = {start + i: reason for i, reason in result["failed_rows"].items()}
+            else:
+                if status in ("failed", "not_saved") and intent_id:
+                    intent_log.abort(intent_id, reason=result.get("reason", ""))
+                    intent_log.compact()
+                if status == "failed" and result.get("failed_rows") and record:
+                    transformer.record_failed_rows(
+                        {record_keys[start + i]: reason for i, reason in result["failed_rows"].items()})
+                if status == "unknown" and intent_id:
+                    # 의도를 남겨 두고 다음 사이클 복구 단계에서 ERP와 대조
+                    intent_log.release(intent_id)
+                if status in ("failed", "unknown"):
+                    settled.extend(range(start, end))
+                return
+
+        # ERP 저장이 끝난 행은 부가 기록보다 먼저 확정: 이후 예외가 나도 다시 올리지 않음
+        indices = [i for i in range(start, end) if i not in failed]
+        saved.extend(indices)
+        settled.extend(range(start, end))
+        if not record:
+            return
+
+        keys = [record_keys[i] for i in indices]
+        try:
+            transformer.add_uploaded_records(keys)
+        except Exception:
+            # 원장 기록 실패: 의도를 남겨 다음 사이클 복구 단계에서 ERP와 대조해 기록
+            if intent_id:
+                intent_log.release(intent_id)
+            raise
+        logger.info(f"[RECORD] {len(keys)}건 업로드 기록 저장")
+        if intent_id:
+            intent_log.commit(intent_id, success_count=len(keys))
+            intent_log.compact()
+        try:
+            transformer.record_failed_rows({record_keys[i]: reason for i, reason in failed.items()}, succeeded=keys)
+            archive_cycle("uploaded", cycle_id, [paste_rows[i] for i in indices], keys, raw_data)
+            if reconciler:
+                reconciler.submit(cycle_id, [paste_rows[i] for i in indices], keys)
+        except Exception as e:
+            logger.warning(f"[WARN] 저장 후 부가 기록 실패 (저장 행은 원장 기록 완료): {e}")
+
+    if chunk_size is None:
+        chunk_size = UPLOAD_CONFIG.get("chunk_size", 0)
+    try:
+        if chunk_size and len(paste_rows) > chunk_size:
+            # [V13.4] 청크 단위 업로드: 저장된 청크(행)는 즉시 원장에 기록
+            uploader.upload_chunked(paste_rows, chunk_size, before_save=before_save, on_chunk_result=settle)
+        else:
+            ok = uploader.upload(paste_rows, before_save=before_save)
+            settle(ok=ok)
+    except Exception as e:
+        # 이미 끝난 청크의 saved/settled는 그대로 반환 (다시 올리지 않음)
+        logger.error(f"[ERROR] 업로드 중 예외 (저장 확정 {len(saved)}건 유지): {e}")
+        uploader.last_result = {"status": "unknown", "reason": str(e)}
+        # 의도 기록 후 중단된 청크는 저장 여부를 알 수 없음 → 복구 단계에서 ERP와 대조
+        for (start, end), intent_id in intents.items():
+            settled.extend(range(start, end))
+            try:
+                intent_log.release(intent_id)
+            except Exception as release_error:
+                logger.warning(f"[WARN] 업로드 의도 해제 실패 ({intent_id}): {release_error}")
+    return sorted(set(saved)), sorted(set(settled))
+
+
+class UploadWorker:
+    """아웃박스 업로드 워커 (별도 스레드 / 별도 브라우저, 읽기 단계와 동시 실행)
+
+    읽기 단계가 적재 후 notify()로 깨우거나 drain_seconds마다 아웃박스를 비운다.
+    세션이 없거나 만료되면 로그인하지 않고 다음 주기로 미룬다 (로그인은 읽기 단계 담당).
+    """
+
+    def __init__(self, outbox, intent_log, notifier=None, reconciler=None, on_saved=None):
+        self.outbox = outbox
+        self.intent_log = intent_log
+        self.notifier = notifier
+        self.reconciler = reconciler
+        self.on_saved = on_saved  # 저장된 붙여넣기 행 목록을 받는 콜백 (통계 집계)
+        self.interval = OUTBOX_CONFIG.get("drain_seconds", 60)
+        self.batch_size = OUTBOX_CONFIG.get("batch_size", 500)
+        self.max_attempts = OUTBOX_CONFIG.get("max_attempts", 5)
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._loop, name="upload-worker", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        logger.info(f"[OUTBOX] 업로드 워커 시작 (대기 {len(self.outbox.pending())}건)")
+
+    def notify(self):
+        self.wake.set()
+
+    def stop(self, timeout=60):
+        self.stopping.set()
+        self.wake.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout)
+
+    def _loop(self):
+        while not self.stopping.is_set():
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            if self.stopping.is_set():
+                break
+            try:
+                self.drain()
+            except Exception as e:
+                msg = f"[OUTBOX] 업로드 워커 오류: {e}"
+                logger.error(msg)
+                if self.notifier:
+                    self.notifier.send_error_notification(msg, traceback.format_exc())
+
+    def drain(self):
+        """대기 행을 batch_size 단위로 업로드 (확정된 행만 큐에서 제거)"""
+        if not self.outbox.pending(limit=1):
+            return
+        browser = None
+        try:
+            page = None
+            if UPLOAD_CONFIG.get("backend", "ui") != "http":
+                browser = BrowserManager()
+                browser.start(headless=True)
+                if not browser.load_session():
+                    logger.warning("[OUTBOX] 세션 없음/만료 - 업로드 보류 (다음 사이클 로그인 후 재시도)")
+                    return
+                page = browser.page
+            uploader = create_uploader(page)
+            if not uploader.navigate_to_deposit_report():
+                raise Exception("입금보고서 페이지 이동 실패")
+
+            transformer = TransformerModule()
+            while not self.stopping.is_set():
+                entries = self.outbox.pending(limit=self.batch_size)
+                if not entries:
+                    break
+                if not self.upload_batch(uploader, transformer, entries):
+                    break  # 미확정 행이 남음 → 다음 주기에 재시도
+            self.outbox.compact()
+        finally:
+            if browser:
+                browser.close()
+
+    def upload_batch(self, uploader, transformer, entries: list) -> bool:
+        """배치 1건 업로드 → 모든 행의 결과가 확정되면 True"""
+        cycle_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        paste_rows = [entry["row"] for entry in entries]
+        keys = [entry["key"] for entry in entries]
+        raw_data = [entry["raw"] for entry in entries]
+        saved, settled = upload_rows(uploader, transformer, self.intent_log, paste_rows, keys, raw_data,
+                                     cycle_id, reconciler=self.reconciler)
+
+        self.outbox.ack([keys[i] for i in settled])
+        if saved and self.on_saved:
+            self.on_saved([paste_rows[i] for i in saved])
+
+        settled_set = set(settled)
+        unsettled = [i for i in range(len(entries)) if i not in settled_set]
+        if not unsettled:
+            logger.info(f"[OUTBOX] {len(saved)}/{len(entries)}건 저장 (대기 {len(self.outbox.pending())}건)")
+            return True
+
+        # 저장 시도가 안 된 행: 시도 횟수 누적, 한도 초과 시 행 실패로 이관 (다음 읽기에서 재적재)
+        reason = uploader.last_result.get("reason", "") or "저장 미수행"
+        self.outbox.fail([keys[i] for i in unsettled], reason)
+        exhausted = [keys[i] for i in unsettled if entries[i]["attempts"] + 1 >= self.max_attempts]
+        if exhausted:
+            transformer.record_failed_rows({key: reason for key in exhausted})
+            self.outbox.ack(exhausted)
+            logger.error(f"[OUTBOX] {len(exhausted)}건 시도 한도({self.max_attempts}회) 초과 -> 행 실패로 이관")
+        logger.warning(f"[OUTBOX] 미확정 {len(unsettled)}건 큐에 유지 ({reason[:100]})")
+        return False
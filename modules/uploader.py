@@ -1,13 +1,197 @@
+import io
+import csv
+import hashlib
 import time
 import re
+import json
+import threading
 import pyperclip
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from openpyxl import Workbook
 from core.logger import logger
-from utils.config import DEPOSIT_REPORT_HASH, TEST_MODE
+from core.tracing import traced, current_span
+from utils.config import DEPOSIT_REPORT_HASH, TEST_MODE, UPLOAD_CONFIG
+
+# 저장 결과 팝업 실패 키워드
+FAIL_KEYWORDS = ["실패", "오류", "에러", "(필수)", "확인바랍니다", "입력하세"]
+
+# F8 직전에 설치: 새 결과 팝업(div.ui-dialog)에 성공/실패 문구가 나타나는 즉시 resolve
+SAVE_RESULT_WATCHER_JS = """([failKeywords, timeoutMs]) => {
+    window.__ecSaveResult = null;  // 이전 청크의 결과(이미 resolve된 Promise) 재사용 방지
+    const existing = new Set(document.querySelectorAll('div.ui-dialog'));
+    window.__ecSaveResult = new Promise(resolve => {
+        let observer = null;
+        const finish = value => { if (observer) observer.disconnect(); resolve(value); };
+        const check = () => {
+            for (const dialog of document.querySelectorAll('div.ui-dialog')) {
+                if (existing.has(dialog) || dialog.offsetParent === null) continue;
+                const text = dialog.innerText || '';
+                const success = text.match(/성공\\s*[:：]\\s*(\\d+)\\s*건/);
+                const fail = text.match(/실패\\s*[:：]\\s*(\\d+)\\s*건/);
+                if (success || failKeywords.some(k => text.includes(k))) {
+                    dialog.setAttribute('data-ec-save-result', '1');
+                    finish({
+                        text: text,
+                        success: success ? parseInt(success[1], 10) : null,
+                        fail: fail ? parseInt(fail[1], 10) : null
+                    });
+                    return;
+                }
+            }
+        };
+        observer = new MutationObserver(check);
+        observer.observe(document.body, {childList: true, subtree: true, characterData: true, attributes: true});
+        setTimeout(() => finish(null), timeoutMs);
+    });
+}"""
+
+# 클립보드 주입~붙여넣기 직렬화: 클립보드는 브라우저 컨텍스트/스레드 간에 공유되므로
+# 병렬 업로드(backfill 워커 스레드) 중 다른 워커의 행이 붙여넣어지지 않게 한 번에 하나만 수행
+_clipboard_lock = threading.Lock()
+
+
+def uses_clipboard() -> bool:
+    """현재 업로드 설정이 클립보드 붙여넣기 방식인지 (프로세스 간 병렬 업로드 가능 여부 판단용)"""
+    # create_uploader와 같은 기준: http 외의 백엔드(ui, browser 등)는 모두 UI 업로더
+    return UPLOAD_CONFIG.get("backend", "ui") != "http" and UPLOAD_CONFIG.get("method", "clipboard") != "file"
+
+
+# 입금보고서 웹자료올리기 열 순서 (TransformerModule paste_row A~L)
+UPLOAD_COLUMNS = ["일자", "순번", "회계전표No.", "입금계좌코드", "계정코드", "거래처코드",
+                  "거래처명", "금액", "수수료", "적요명", "프로젝트", "부서"]
+
+def prepare_paste_rows(paste_rows: list) -> list:
+    """업로드 직전 데이터 정합성 최종 체크"""
+    processed_rows = []
+    for i, row in enumerate(paste_rows):
+        # D열: 입금계좌코드 (인덱스 3)
+        if len(row) > 3 and not row[3]:
+            logger.warning(f"   [WARN] 행 {i+1}의 입금계좌코드 누락 발견 -> '카드사'로 자동 보정")
+            row[3] = '카드사'
+        processed_rows.append(row)
+    return processed_rows
+
+
+def build_paste_text(rows: list) -> str:
+    """그리드 붙여넣기용 TSV 텍스트 생성 (열: 탭, 행: CRLF)"""
+    return "\r\n".join("\t".join(str(cell) for cell in row) for row in rows)
+
+
+def build_upload_file(rows: list, fmt: str = "xlsx") -> tuple:
+    """업로드 파일을 메모리에서 생성 (임시 파일 없음) -> (파일명, MIME, bytes)"""
+    buffer = io.BytesIO()
+    if fmt == "csv":
+        # 탭 구분 텍스트, 열은 붙여넣기와 같은 웹자료올리기 그리드 12열(UPLOAD_COLUMNS).
+        # 업로드26.csv(6열: 일자/거래처코드/거래처명/입금계좌코드/적요/금액, LF, BOM 없음)와는 다르다:
+        # 파일 내용이 그리드 열 순서대로 채워지고 저장 전 verify_grid가 이 12열 기준으로 검증하므로
+        # 붙여넣기 배치를 그대로 쓴다. BOM(utf-8-sig)은 한글 인코딩 자동 판별용, CRLF는 붙여넣기 텍스트와 동일.
+        text = io.StringIO()
+        writer = csv.writer(text, delimiter="\t", lineterminator="\r\n")
+        writer.writerow(UPLOAD_COLUMNS)
+        writer.writerows(rows)
+        buffer.write(text.getvalue().encode("utf-8-sig"))
+        return "deposit_upload.csv", "text/csv", buffer.getvalue()
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("입금보고서")
+    ws.append(UPLOAD_COLUMNS)
+    for row in rows:
+        ws.append([str(cell) for cell in row])
+    wb.save(buffer)
+    return ("deposit_upload.xlsx",
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            buffer.getvalue())
+
+
+ROW_ERROR_PATTERNS = [
+    re.compile(r"(\d+)\s*(?:번째\s*)?(?:행|줄|라인|line)\s*[:：\]\)-]?\s*(.*)", re.IGNORECASE),
+    re.compile(r"(?:행|라인|No\.?)\s*[:#]?\s*(\d+)\s*[:：\]\)-]?\s*(.*)", re.IGNORECASE),
+]
+
+
+def parse_save_result(msg: str, row_count: int) -> dict:
+    """저장 결과 팝업 문구에서 성공/실패 건수와 행별 오류 사유 추출
+
+    반환: {'success': int|None, 'fail': int|None, 'failed_rows': {0-based 행 번호: 사유}}
+    """
+    success = re.search(r"성공\s*[:：]\s*(\d+)\s*건", msg)
+    fail = re.search(r"실패\s*[:：]\s*(\d+)\s*건", msg)
+    failed_rows = {}
+    for line in msg.splitlines():
+        line = line.strip()
+        for pattern in ROW_ERROR_PATTERNS:
+            match = pattern.match(line)
+            if match:
+                idx = int(match.group(1)) - 1
+                if 0 <= idx < row_count:
+                    reason = match.group(2).strip() or line
+                    failed_rows[idx] = f"{failed_rows[idx]} / {reason}" if idx in failed_rows else reason
+                break
+    return {
+        "success": int(success.group(1)) if success else None,
+        "fail": int(fail.group(1)) if fail else None,
+        "failed_rows": failed_rows,
+    }
+
+
+def parse_amount(value) -> int:
+    text = "".join(str(value).split()).replace(',', '')
+    try:
+        return int(float(text))
+    except ValueError:
+        return 0
+
+
+def create_uploader(page):
+    """설정(upload.backend)에 따른 업로드 백엔드 생성: 'ui'(기본, 'browser'도 동일) | 'http'"""
+    backend = UPLOAD_CONFIG.get("backend", "ui")
+    if backend == "http":
+        from modules.http_uploader import HttpUploaderModule
+        return HttpUploaderModule()
+    return UploaderModule(page)
+
+
+class BaseUploader:
+    """업로드 백엔드 공통 인터페이스
+
+    - upload(rows, before_save) -> bool, upload_chunked(rows, chunk_size, ...) -> list
+    - last_result: 마지막 저장 결과 {'status': saved | partial | failed | not_saved | unknown,
+      'failed_rows': {0-based 행 번호: 사유}, 'success': int|None, 'reason': str}
+    """
+
+    def __init__(self):
+        self.last_result = {}
+
+    def navigate_to_deposit_report(self) -> bool:
+        return True
+
+    def upload(self, paste_rows: list, before_save=None) -> bool:
+        raise NotImplementedError
+
+    def upload_chunked(self, paste_rows: list, chunk_size: int, before_save=None, on_chunk_result=None) -> list:
+        """기본 구현: 청크마다 upload를 순차 호출"""
+        results = []
+        for start in range(0, len(paste_rows), chunk_size):
+            end = min(start + chunk_size, len(paste_rows))
+            started = time.time()
+            chunk_before_save = (lambda s=start, e=end: before_save(s, e)) if before_save else None
+            ok = self.upload(paste_rows[start:end], before_save=chunk_before_save)
+            results.append({'start': start, 'end': end, 'ok': ok, 'elapsed': round(time.time() - started, 2)})
+            if on_chunk_result:
+                on_chunk_result(start, end, ok)
+        return results
+
+
+class UploaderModule(BaseUploader):
+    """Playwright 웹자료올리기(UI) 업로드 백엔드"""
 
-class UploaderModule:
     def __init__(self, page):
+        super().__init__()
         self.page = page
+        self.method = UPLOAD_CONFIG.get("method", "clipboard")  # 'clipboard' | 'file'
 
+    @traced()
     def navigate_to_deposit_report(self) -> bool:
         """입금보고서 페이지로 이동"""
         try:
@@ -20,176 +204,436 @@ class UploaderModule:
             logger.error(f"[ERROR] 페이지 이동 실패: {e}")
             return False
 
-    def upload(self, paste_rows: list) -> bool:
-        """클립보드 복사 및 웹자료올리기 실행 [V12.0 - 저장 검증 강화]"""
+    @traced()
+    def upload(self, paste_rows: list, before_save=None) -> bool:
+        """클립보드 복사 및 웹자료올리기 실행 [V12.0 - 저장 검증 강화]
+
+        before_save: F8 직전에 호출되는 콜백 (업로드 의도 선기록용)
+        """
+        self.last_result = {}
         if not paste_rows:
             logger.info("[INFO] 복사할 데이터가 없습니다")
             return False
 
-        # 1. 클립보드 복사 (데이터 정합성 최종 체크 포함)
-        processed_rows = []
-        for i, row in enumerate(paste_rows):
-            # D열: 입금계좌코드 (인덱스 3)
-            if len(row) > 3 and not row[3]:
-                logger.warning(f"   [WARN] 행 {i+1}의 입금계좌코드 누락 발견 -> '카드사'로 자동 보정")
-                row[3] = '카드사'
-            processed_rows.append(row)
-
-        import json
-        lines = ["\t".join([str(cell) for cell in row]) for row in processed_rows]
-        paste_text = "\r\n".join(lines)
-        
+        # 1. 데이터 정합성 최종 체크
+        processed_rows = prepare_paste_rows(paste_rows)
+        current_span().set(rows=len(processed_rows), method=self.method)
+
+        try:
+            if self.method == "file":
+                # [V13.5] 메모리에서 생성한 업로드 파일을 파일 입력 컨트롤로 전달
+                popup = self.upload_file(processed_rows)
+            else:
+                # 2~3. 클립보드 주입 후 웹자료올리기 팝업 열기 및 붙여넣기
+                paste_text = build_paste_text(processed_rows)
+                with _clipboard_lock:
+                    self.inject_clipboard(paste_text, len(paste_rows))
+                    popup = self.paste(processed_rows, paste_text)
+
+            # 4. 저장 (F8) - [V12.1] 팝업 정리 후 저장
+            if TEST_MODE:
+                logger.warning("[TEST] 테스트 모드: F8 저장 생략")
+                return True
+
+            return self.save(popup, before_save=before_save, expected_rows=processed_rows)
+
+        except Exception as e:
+            logger.error(f"[ERROR] 업로드 과정 오류: {e}")
+            return False
+
+    @traced()
+    def upload_chunked(self, paste_rows: list, chunk_size: int, before_save=None, on_chunk_result=None) -> list:
+        """청크 단위 붙여넣기 → 저장 → 검증 반복 [V13.4]
+
+        현재 청크를 붙여넣고 저장(F8)하는 동안 다음 청크의 붙여넣기 텍스트를 미리 준비한다.
+        before_save(start, end): 청크별 F8 직전 콜백
+        on_chunk_result(start, end, ok): 청크별 저장 결과 콜백 (원장 기록용)
+        반환값: 청크별 결과 목록 [{'start', 'end', 'ok', 'elapsed'}, ...]
+        """
+        ranges = [(i, min(i + chunk_size, len(paste_rows))) for i in range(0, len(paste_rows), chunk_size)]
+        current_span().set(rows=len(paste_rows), chunks=len(ranges), method=self.method)
+        logger.info(f"[CHUNK] 청크 업로드 시작: {len(paste_rows)}건 -> {len(ranges)}개 청크 (청크당 {chunk_size}건)")
+
+        def prepare(start, end):
+            rows = prepare_paste_rows(paste_rows[start:end])
+            return rows, build_paste_text(rows)
+
+        results = []
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_payload = executor.submit(prepare, *ranges[0])
+            for idx, (start, end) in enumerate(ranges):
+                chunk_started = time.time()
+                rows, paste_text = next_payload.result()
+                if idx + 1 < len(ranges):
+                    next_payload = executor.submit(prepare, *ranges[idx + 1])
+
+                ok = False
+                self.last_result = {}
+                try:
+                    if self.method == "file":
+                        popup = self.upload_file(rows)
+                    else:
+                        with _clipboard_lock:
+                            self.inject_clipboard(paste_text, len(rows))
+                            popup = self.paste(rows, paste_text)
+                    if TEST_MODE:
+                        logger.warning("[TEST] 테스트 모드: F8 저장 생략")
+                        ok = True
+                    else:
+                        chunk_before_save = (lambda s=start, e=end: before_save(s, e)) if before_save else None
+                        ok = self.save(popup, before_save=chunk_before_save, expected_rows=rows)
+                except Exception as e:
+                    logger.error(f"[ERROR] 청크 {idx+1}/{len(ranges)} 업로드 오류: {e}")
+                    try:
+                        self.page.keyboard.press('Escape')
+                    except: pass
+
+                elapsed = time.time() - chunk_started
+                results.append({'start': start, 'end': end, 'ok': ok, 'elapsed': round(elapsed, 2)})
+                logger.info(f"[CHUNK] {idx+1}/{len(ranges)} ({start+1}~{end}행) {'성공' if ok else '실패'} - {elapsed:.1f}초")
+                if on_chunk_result:
+                    on_chunk_result(start, end, ok)
+
+        saved = sum(r['end'] - r['start'] for r in results if r['ok'])
+        logger.info(f"[CHUNK] 청크 업로드 완료: {saved}/{len(paste_rows)}건 저장")
+        return results
+
+    @traced()
+    def upload_file(self, processed_rows: list):
+        """웹자료올리기 팝업의 파일 업로드 컨트롤에 메모리 버퍼 전달 (팝업 locator 반환)"""
+        fmt = UPLOAD_CONFIG.get("file_format", "xlsx")
+        name, mime_type, data = build_upload_file(processed_rows, fmt)
+        payload = {"name": name, "mimeType": mime_type, "buffer": data}
+        logger.info(f"[FILE] 업로드 파일 생성 완료 ({name}, {len(processed_rows)}건, {len(data):,} bytes)")
+
+        logger.info("[UPLOAD] '웹자료올리기' 버튼 클릭...")
+        self.page.locator('#webUploader').click()
+        time.sleep(3)
+        popup = self.page.locator('div[data-popup-id^="BulkUploadForm"]')
+
+        file_input = popup.locator(UPLOAD_CONFIG.get("file_input_selector", 'input[type="file"]')).first
+        if file_input.count() > 0:
+            file_input.set_input_files(payload)
+        else:
+            # 숨겨진 input이 없으면 엑셀 올리기 버튼의 파일 선택창을 가로채서 전달
+            button_selector = UPLOAD_CONFIG.get("file_button_selector", 'button:has-text("엑셀"), a:has-text("엑셀")')
+            with self.page.expect_file_chooser(timeout=10000) as fc_info:
+                popup.locator(button_selector).first.click()
+            fc_info.value.set_files(payload)
+
+        logger.info("[FILE] 업로드 파일 전달 완료, 그리드 반영 대기...")
+        time.sleep(3)
+        return popup
+
+    @traced()
+    def inject_clipboard(self, paste_text: str, row_count: int):
+        """붙여넣기 텍스트를 클립보드에 주입"""
         try:
             # [V10.7] 브라우저 내부에 직접 클립보드 데이터 주입
             self.page.evaluate(f"navigator.clipboard.writeText({json.dumps(paste_text)})")
-            logger.info(f"[CLIPBOARD] 브라우저 내부 클립보드 데이터 주입 완료 ({len(paste_rows)}건)")
+            logger.info(f"[CLIPBOARD] 브라우저 내부 클립보드 데이터 주입 완료 ({row_count}건)")
         except Exception as e:
             logger.warning(f"[WARN] 브라우저 내부 클립보드 주입 실패, 시스템 클립보드 병행: {e}")
             pyperclip.copy(paste_text)
 
+    @traced()
+    def paste(self, processed_rows: list, paste_text: str):
+        """웹자료올리기 팝업을 열고 그리드에 붙여넣기 (팝업 locator 반환)"""
+        # 2. 웹자료올리기 팝업 열기
+        logger.info("[UPLOAD] '웹자료올리기' 버튼 클릭...")
+        self.page.locator('#webUploader').click()
+        time.sleep(3)
+
+        # 3. 붙여넣기
+        logger.info("[PASTE] 팝업 내 붙여넣기 실행 준비...")
+        popup = self.page.locator('div[data-popup-id^="BulkUploadForm"]')
+        
+        # 그리드 영역 포커스 확보
         try:
-            # 2. 웹자료올리기 팝업 열기
-            logger.info("[UPLOAD] '웹자료올리기' 버튼 클릭...")
-            self.page.locator('#webUploader').click()
-            time.sleep(3)
-
-            # 3. 붙여넣기
-            logger.info("[PASTE] 팝업 내 붙여넣기 실행 준비...")
-            popup = self.page.locator('div[data-popup-id^="BulkUploadForm"]')
+            first_cell = popup.locator('tr[data-index="0"] td').first
+            if not first_cell.is_visible():
+                first_cell = popup.locator('input.form-control').first
             
-            # 그리드 영역 포커스 확보
+            first_cell.click(force=True)
+            time.sleep(1)
+            logger.info("   [FOCUS] 그리드 포커스 확보 완료")
+        except Exception as e:
+            logger.warning(f"   [WARN] 포커스 확보 시도 중 예외(무시 가능): {e}")
+
+        logger.info(f"   [KEY] Control+V 실행 (데이터 주입 방식: Virtual Clipboard)")
+        
+        # [V10.6/V10.7] 저레벨 키 입력 시퀀스
+        self.page.keyboard.down('Control')
+        self.page.keyboard.press('v')
+        self.page.keyboard.up('Control')
+        
+        time.sleep(3)
+        
+        # [V12.0] 붙여넣기 후 그리드 데이터 검증 → [V13.6] 비용 순 폴백 체인
+        try:
+            if not self.grid_has_data(popup, processed_rows):
+                logger.warning("[WARN] 붙여넣기 후 그리드에서 데이터 미감지 -> 폴백 체인 시작")
+                self.paste_fallback(popup, first_cell, processed_rows, paste_text)
+        except Exception as e:
+            logger.warning(f"   [WARN] 붙여넣기 검증/폴백 중 예외: {e}")
+
+        return popup
+
+    def grid_has_data(self, popup, processed_rows: list) -> bool:
+        """그리드에 붙여넣은 행이 하나라도 읽히는지 확인"""
+        return not processed_rows or self.verify_grid(popup, processed_rows)["grid_rows"] > 0
+
+    @traced()
+    def verify_grid(self, popup, processed_rows: list) -> dict:
+        """[V13.8] 그리드를 한 번의 evaluate로 읽어 행 수 / 금액 합계 / 행 해시 비교"""
+        grid = popup.evaluate(
+            """root => [...root.querySelectorAll('tr[data-index]')].map(tr =>
+                [...tr.querySelectorAll('td')].map(td => {
+                    const input = td.querySelector('input, textarea');
+                    return (input ? input.value : td.innerText || '').trim();
+                })
+            )"""
+        )
+        # 행 번호/체크박스 열이 앞에 붙는 경우 첫 데이터 행의 일자 열 위치로 보정
+        offset = UPLOAD_CONFIG.get("grid_column_offset")
+        if offset is None:
+            offset = 0
+            if processed_rows:
+                first = processed_rows[0][0]
+                offset = next((i for cells in grid for i, cell in enumerate(cells) if cell == first), 0)
+
+        # 미리 그려진 빈 행(행 번호/기본값만 있는 행) 제외: 거래처명 또는 금액이 있는 행만 데이터 행
+        grid = [c for c in grid if len(c) > offset + 7 and (c[offset + 6] or parse_amount(c[offset + 7]))]
+
+        def row_hash(date, customer, amount):
+            return hashlib.md5(f"{date}|{customer}|{parse_amount(amount)}".encode("utf-8")).hexdigest()
+
+        expected = Counter(row_hash(r[0], r[6], r[7]) for r in processed_rows)
+        actual = Counter(row_hash(c[offset], c[offset + 6], c[offset + 7]) for c in grid)
+        expected_sum = sum(parse_amount(r[7]) for r in processed_rows)
+        grid_sum = sum(parse_amount(c[offset + 7]) for c in grid)
+
+        missing = [i for i, r in enumerate(processed_rows)
+                   if expected[row_hash(r[0], r[6], r[7])] > actual[row_hash(r[0], r[6], r[7])]]
+        unexpected = sum((actual - expected).values())
+        return {
+            "ok": len(grid) == len(processed_rows) and grid_sum == expected_sum and not missing and not unexpected,
+            "expected_rows": len(processed_rows),
+            "grid_rows": len(grid),
+            "expected_sum": expected_sum,
+            "grid_sum": grid_sum,
+            "missing_rows": missing,
+            "unexpected_rows": unexpected,
+        }
+
+    @traced()
+    def paste_fallback(self, popup, first_cell, processed_rows: list, paste_text: str) -> bool:
+        """Control+V 실패 시 비용이 낮은 순서로 붙여넣기 재시도 (단계별 소요 시간 기록)"""
+        tiers = [
+            ("paste-event", lambda: self._dispatch_paste_event(first_cell, paste_text)),
+            ("insert-text", lambda: (first_cell.click(force=True), self.page.keyboard.insert_text(paste_text))),
+            ("cell-fill", lambda: self._fill_cells(popup, processed_rows)),
+        ]
+        # 키 입력(Type)은 셀 수가 아주 적을 때만 허용 (slow_mo 환경에서 수 시간 소요 방지)
+        cell_count = sum(len(row) for row in processed_rows)
+        if cell_count <= UPLOAD_CONFIG.get("max_type_cells", 12):
+            tiers.append(("type", lambda: (first_cell.click(force=True), self.page.keyboard.type(paste_text))))
+
+        for name, action in tiers:
+            started = time.time()
             try:
-                first_cell = popup.locator('tr[data-index="0"] td').first
-                if not first_cell.is_visible():
-                    first_cell = popup.locator('input.form-control').first
-                
-                first_cell.click(force=True)
+                action()
                 time.sleep(1)
-                logger.info("   [FOCUS] 그리드 포커스 확보 완료")
+                ok = self.grid_has_data(popup, processed_rows)
             except Exception as e:
-                logger.warning(f"   [WARN] 포커스 확보 시도 중 예외(무시 가능): {e}")
+                logger.warning(f"   [FALLBACK] {name} 예외: {e}")
+                ok = False
+            logger.info(f"   [FALLBACK] {name}: {'성공' if ok else '실패'} ({time.time() - started:.2f}초)")
+            if ok:
+                return True
 
-            logger.info(f"   [KEY] Control+V 실행 (데이터 주입 방식: Virtual Clipboard)")
-            
-            # [V10.6/V10.7] 저레벨 키 입력 시퀀스
-            self.page.keyboard.down('Control')
-            self.page.keyboard.press('v')
-            self.page.keyboard.up('Control')
-            
-            time.sleep(3)
-            
-            # [V12.0] 붙여넣기 후 그리드 데이터 건수 검증
-            try:
-                grid_text = popup.inner_text()
-                # 첫 번째 행 데이터 확인
-                if processed_rows and processed_rows[0][0] not in grid_text:
-                    logger.warning("[WARN] 붙여넣기 후 그리드에서 데이터 미감지 -> 폴백(Type) 시도")
-                    first_cell.click()
-                    self.page.keyboard.type(paste_text)
-                    time.sleep(3)
-            except: pass
+        logger.error(f"[ERROR] 모든 붙여넣기 폴백 실패 (셀 {cell_count}개)")
+        return False
 
-            # 4. 저장 (F8) - [V12.1] 팝업 정리 후 저장
-            if TEST_MODE:
-                logger.warning("[TEST] 테스트 모드: F8 저장 생략")
-                return True
-            
-            logger.info("[SAVE] F8 저장 실행...")
-            
-            # [V12.1] F8 전에 현재 팝업 개수 확인
-            try:
-                existing_popups = self.page.locator('div.ui-dialog').count()
-                logger.info(f"   [COUNT] 저장 전 팝업 개수: {existing_popups}")
-            except:
-                existing_popups = 0
-            
-            self.page.keyboard.press('F8')
-            
-            # [V12.1] 저장 처리 시간 확보
-            logger.info("   [WAIT] 저장 처리 대기 중...")
-            time.sleep(3)
-            
-            # 5. 저장 결과 팝업 대기 및 분석 [V12.1 개선]
+    def _dispatch_paste_event(self, first_cell, paste_text: str):
+        """DataTransfer를 담은 합성 paste 이벤트를 그리드 셀에 전달"""
+        first_cell.evaluate(
+            """(el, text) => {
+                const dt = new DataTransfer();
+                dt.setData('text/plain', text);
+                const target = document.activeElement && el.contains(document.activeElement)
+                    ? document.activeElement : el;
+                target.dispatchEvent(new ClipboardEvent('paste', {clipboardData: dt, bubbles: true, cancelable: true}));
+            }""",
+            paste_text
+        )
+
+    def _fill_cells(self, popup, processed_rows: list):
+        """그리드 행/셀에 값을 한 번의 evaluate로 일괄 입력"""
+        popup.evaluate(
+            """(root, rows) => {
+                rows.forEach((row, i) => {
+                    const tr = root.querySelector(`tr[data-index="${i}"]`);
+                    if (!tr) return;
+                    const cells = tr.querySelectorAll('td');
+                    row.forEach((value, j) => {
+                        const td = cells[j];
+                        if (!td || value === '') return;
+                        const input = td.querySelector('input, textarea');
+                        if (input) {
+                            input.value = value;
+                            input.dispatchEvent(new Event('input', {bubbles: true}));
+                            input.dispatchEvent(new Event('change', {bubbles: true}));
+                        } else {
+                            td.textContent = value;
+                        }
+                    });
+                });
+            }""",
+            [[str(cell) for cell in row] for row in processed_rows]
+        )
+
+    @traced()
+    def save(self, popup, before_save=None, expected_rows: list = None) -> bool:
+        """F8 저장 및 저장 결과 팝업 검증
+
+        expected_rows: 주어지면 F8 전에 그리드 내용을 구조적으로 검증하고 불일치 시 저장하지 않음
+        """
+        row_count = len(expected_rows) if expected_rows else 0
+        self.last_result = {"status": "unknown", "failed_rows": {}}
+
+        if expected_rows and UPLOAD_CONFIG.get("verify_paste", True):
+            diff = self.verify_grid(popup, expected_rows)
+            if not diff["ok"]:
+                logger.error(
+                    f"[ERROR] 붙여넣기 검증 실패 -> F8 저장 중단: 행 {diff['grid_rows']}/{diff['expected_rows']}, "
+                    f"합계 {diff['grid_sum']:,}/{diff['expected_sum']:,}, "
+                    f"누락 행 {[i + 1 for i in diff['missing_rows']][:20]}, 예상 외 행 {diff['unexpected_rows']}건"
+                )
+                self.page.screenshot(path=f"logs/paste_mismatch_{int(time.time())}.png")
+                self.page.keyboard.press('Escape')
+                self.last_result = {"status": "not_saved", "failed_rows": {}, "reason": "붙여넣기 검증 실패"}
+                return False
+            logger.info(f"   [VERIFY] 붙여넣기 검증 통과: {diff['grid_rows']}행 / 합계 {diff['grid_sum']:,}원")
+
+        logger.info("[SAVE] F8 저장 실행...")
+        
+        # [V13.7] F8 전에 결과 팝업 감시자(MutationObserver) 설치
+        timeout_ms = UPLOAD_CONFIG.get("save_result_timeout", 18) * 1000
+        watcher_installed = False
+        try:
+            self.page.evaluate(SAVE_RESULT_WATCHER_JS, [FAIL_KEYWORDS, timeout_ms])
+            watcher_installed = True
+        except Exception as e:
+            logger.warning(f"   [WARN] 저장 결과 감시자 설치 실패: {e}")
             try:
-                # 새로운 팝업이 나타날 때까지 대기 (최대 15초)
-                for i in range(15):
-                    time.sleep(1)
-                    current_popups = self.page.locator('div.ui-dialog').count()
-                    if current_popups > existing_popups:
-                        logger.info(f"   [OK] 새 팝업 감지 ({i+1}초 후)")
-                        break
-                
-                # 가장 최근 팝업 선택
+                self.page.evaluate("() => { delete window.__ecSaveResult; }")
+            except Exception:
+                pass
+
+        if before_save:
+            before_save()
+
+        self.page.keyboard.press('F8')
+        started = time.time()
+
+        # 5. 저장 결과 팝업 대기 및 분석
+        try:
+            # 결과 팝업이 나타나는 즉시 resolve되는 Promise를 한 번의 evaluate로 대기
+            logger.info("   [WAIT] 저장 결과 팝업 대기 중...")
+            # 감시자 설치 실패 시 이전 청크의 결과를 읽지 않도록 대기하지 않고 기존 방식으로 확인
+            watched = self.page.evaluate("() => window.__ecSaveResult || null") if watcher_installed else None
+
+            if watched:
+                logger.info(f"   [OK] 결과 팝업 감지 ({time.time() - started:.2f}초 후)")
+                result_popup = self.page.locator('div.ui-dialog[data-ec-save-result]').last
+                msg = watched["text"]
+            else:
+                # 감시자 시간 초과 또는 미설치: 가장 최근 팝업 확인 (기존 방식)
                 result_popup = self.page.locator('div.ui-dialog').last
-                
                 if not result_popup.is_visible():
                     logger.warning("[WARN] 저장 결과 팝업을 찾을 수 없음 - 저장 성공으로 간주")
+                    self.last_result = {"status": "saved", "failed_rows": {}, "success": None}
                     return True
-                
                 msg = result_popup.inner_text()
-                logger.info(f"[RESULT] 저장 결과 팝업: {msg.replace(chr(10), ' ')[:200]}...")
-                
-                # [V12.1] 실패 키워드 우선 검사
-                fail_keywords = ["실패", "오류", "에러", "(필수)", "확인바랍니다", "입력하세"]
-                if any(k in msg for k in fail_keywords) and "실패 : 0건" not in msg:
-                    logger.error(f"[ERROR] 업로드 실패 감지!")
-                    self.page.screenshot(path=f"logs/upload_fail_{int(time.time())}.png")
-                    # 팝업 정리
-                    try:
-                        close_btn = result_popup.locator('button:has-text("닫기"), a:has-text("닫기")').first
-                        if close_btn.is_visible():
-                            close_btn.click()
-                    except: pass
-                    return False
-                
-                # [V12.1] 성공 패턴 확인: "성공 : N건" 또는 "성공: N건"
-                success_pattern = r"성공\s*[:：]\s*(\d+)\s*건"
-                match = re.search(success_pattern, msg)
-                
-                if match:
+            logger.info(f"[RESULT] 저장 결과 팝업: {msg.replace(chr(10), ' ')[:200]}...")
+            
+            # [V12.1] 실패 키워드 우선 검사
+            if any(k in msg for k in FAIL_KEYWORDS) and "실패 : 0건" not in msg:
+                logger.error(f"[ERROR] 업로드 실패 감지!")
+                self.page.screenshot(path=f"logs/upload_fail_{int(time.time())}.png")
 
-                    success_count = int(match.group(1))
-                    logger.info(f"[OK] 저장 성공 확정: {success_count}건 업로드 완료")
-                    
-                    # 닫기 버튼 클릭
-                    try:
-                        close_btn = result_popup.locator('button:has-text("닫기"), a:has-text("닫기"), .ui-dialog-titlebar-close').first
-                        if close_btn.is_visible():
-                            close_btn.click()
-                            logger.info("   [OK] 결과 팝업 닫기 완료")
-                    except: pass
-                    
-                    time.sleep(1)
-                    # 메인 팝업도 정리
-                    if popup.is_visible():
-                        self.page.keyboard.press('Escape')
-                    
-                    return True
+                # [V13.9] 행별 오류 사유 추출 → 성공 행만 기록, 실패 행만 재시도 대상
+                parsed = parse_save_result(msg, row_count)
+                failed_rows = parsed["failed_rows"]
+                expected_fail = parsed["fail"] if parsed["fail"] is not None else len(failed_rows)
+                if parsed["success"] and failed_rows and len(failed_rows) == expected_fail \
+                        and parsed["success"] + len(failed_rows) == row_count:
+                    status = "partial"
+                elif not parsed["success"]:
+                    status = "failed"
                 else:
-                    # [V12.0] 성공 메시지 없으면 무조건 실패 처리
-                    logger.error("[ERROR] 저장 실패: '성공 : N건' 메시지를 찾을 수 없음")
-                    self.page.screenshot(path=f"logs/save_no_success_{int(time.time())}.png")
-                    
-                    # 팝업 정리 시도
-                    try:
-                        close_btn = result_popup.locator('button:has-text("닫기"), a:has-text("닫기")').first
-                        if close_btn.is_visible():
-                            close_btn.click()
-                    except: pass
-                    
-                    return False
+                    status = "unknown"  # 성공 건이 있으나 실패 행을 특정할 수 없음
+                self.last_result = {"status": status, "failed_rows": failed_rows,
+                                    "success": parsed["success"], "reason": msg.strip()[:200]}
+                for idx, reason in sorted(failed_rows.items()):
+                    logger.error(f"   [ROW-FAIL] {idx+1}행: {reason}")
+                if status == "partial":
+                    logger.warning(f"[WARN] 부분 저장: 성공 {parsed['success']}건 / 실패 {len(failed_rows)}건")
+
+                # 팝업 정리
+                try:
+                    close_btn = result_popup.locator('button:has-text("닫기"), a:has-text("닫기")').first
+                    if close_btn.is_visible():
+                        close_btn.click()
+                except: pass
+                return False
+            
+            # [V12.1] 성공 패턴 확인: "성공 : N건" 또는 "성공: N건"
+            success_pattern = r"성공\s*[:：]\s*(\d+)\s*건"
+            match = re.search(success_pattern, msg)
+            
+            if match:
+
+                success_count = int(match.group(1))
+                logger.info(f"[OK] 저장 성공 확정: {success_count}건 업로드 완료")
+                self.last_result = {"status": "saved", "failed_rows": {}, "success": success_count}
                 
-            except Exception as e:
-                logger.error(f"[ERROR] 저장 결과 확인 실패: {e}")
-                self.page.screenshot(path=f"logs/save_error_{int(time.time())}.png")
+                # 닫기 버튼 클릭
+                try:
+                    close_btn = result_popup.locator('button:has-text("닫기"), a:has-text("닫기"), .ui-dialog-titlebar-close').first
+                    if close_btn.is_visible():
+                        close_btn.click()
+                        logger.info("   [OK] 결과 팝업 닫기 완료")
+                except: pass
                 
-                # ESC로 화면 정리
-                self.page.keyboard.press('Escape')
-                time.sleep(0.5)
-                self.page.keyboard.press('Escape')
+                time.sleep(1)
+                # 메인 팝업도 정리
+                if popup.is_visible():
+                    self.page.keyboard.press('Escape')
+                
+                return True
+            else:
+                # [V12.0] 성공 메시지 없으면 무조건 실패 처리
+                logger.error("[ERROR] 저장 실패: '성공 : N건' 메시지를 찾을 수 없음")
+                self.page.screenshot(path=f"logs/save_no_success_{int(time.time())}.png")
+                
+                # 팝업 정리 시도
+                try:
+                    close_btn = result_popup.locator('button:has-text("닫기"), a:has-text("닫기")').first
+                    if close_btn.is_visible():
+                        close_btn.click()
+                except: pass
                 
                 return False
-
+            
         except Exception as e:
-            logger.error(f"[ERROR] 업로드 과정 오류: {e}")
+            logger.error(f"[ERROR] 저장 결과 확인 실패: {e}")
+            self.page.screenshot(path=f"logs/save_error_{int(time.time())}.png")
+            
+            # ESC로 화면 정리
+            self.page.keyboard.press('Escape')
+            time.sleep(0.5)
+            self.page.keyboard.press('Escape')
+            
             return False
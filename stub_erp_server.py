@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""로컬 입금보고서 API 스텁 서버 (HttpUploaderModule 오프라인 벤치마크/테스트용)
+
+계약:
+    POST /api/deposits          헤더 Idempotency-Key, 본문 {"rows": [{열 이름: 값}, ...]}
+        -> {"success": N, "fail": M, "failed": [{"index": i, "reason": "..."}]}
+    GET  /api/deposits?date=YYYY/MM/DD  -> {"rows": [...]}
+    GET  /health                -> {"status": "ok", "saved": N}
+
+사용 예:
+    python stub_erp_server.py --port 8765 --latency-ms 50 --fail-rate 0.01
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+
+class StubState:
+    def __init__(self, latency_ms=0, fail_rate=0.0, seed=None):
+        self.latency = latency_ms / 1000
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.saved = []
+        self.responses = {}  # Idempotency-Key -> 응답 (재시도 시 중복 저장 방지)
+        self.lock = threading.Lock()
+
+    def validate(self, row: dict) -> str:
+        if not row.get("일자"):
+            return "일자(필수) 입력하세요"
+        if not row.get("거래처명"):
+            return "거래처명(필수) 입력하세요"
+        try:
+            int(str(row.get("금액", "")).replace(",", ""))
+        except ValueError:
+            return "금액 형식 오류"
+        if self.fail_rate and self.rng.random() < self.fail_rate:
+            return "임의 실패 (stub fail-rate)"
+        return ""
+
+    def save_batch(self, key: str, rows: list) -> dict:
+        with self.lock:
+            if key and key in self.responses:
+                return self.responses[key]
+        if self.latency:
+            time.sleep(self.latency)
+        failed, accepted = [], []
+        for i, row in enumerate(rows):
+            reason = self.validate(row)
+            if reason:
+                failed.append({"index": i, "reason": reason})
+            else:
+                accepted.append(row)
+        resp = {"success": len(accepted), "fail": len(failed), "failed": failed}
+        with self.lock:
+            self.saved.extend(accepted)
+            if key:
+                self.responses[key] = resp
+        return resp
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def _send(self, status: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/api/deposits":
+                return self._send(404, {"error": "not found"})
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                return self._send(400, {"error": "invalid json"})
+            self._send(200, state.save_batch(self.headers.get("Idempotency-Key", ""), body.get("rows", [])))
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path == "/health":
+                return self._send(200, {"status": "ok", "saved": len(state.saved)})
+            if parsed.path == "/api/deposits":
+                date = parse_qs(parsed.query).get("date", [None])[0]
+                with state.lock:
+                    rows = [r for r in state.saved if not date or r.get("일자") == date]
+                return self._send(200, {"rows": rows})
+            self._send(404, {"error": "not found"})
+
+        def log_message(self, format, *args):
+            pass  # 요청별 콘솔 로그 생략 (벤치마크 부하 방지)
+
+    return Handler
+
+
+def start_server(host="127.0.0.1", port=8765, latency_ms=0, fail_rate=0.0, seed=None):
+    """백그라운드 스레드로 스텁 서버 시작 → (server, state)"""
+    state = StubState(latency_ms, fail_rate, seed)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="입금보고서 API 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=0, help="배치당 처리 지연")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="행 단위 임의 실패 비율")
+    args = parser.parse_args()
+
+    server, state = start_server(args.host, args.port, args.latency_ms, args.fail_rate)
+    print(f"[STUB] http://{args.host}:{server.server_address[1]} (latency {args.latency_ms}ms, fail-rate {args.fail_rate})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"[STUB] 종료 (저장 {len(state.saved)}건)")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,10 +35,11 @@ def test_duplicate_prevention():
 
         print("3. 락 해제 테스트...")
         orchestrator1.release_lock()
-        if not orchestrator1.lock_file.exists():
-            print("   [OK] 락 파일 삭제 성공")
+        # OS 락은 해제만 하고 파일은 남겨 둠 (PID 기록만 비움)
+        if not orchestrator1.lock.locked and not orchestrator1.lock_file.read_text().strip():
+            print("   [OK] 락 해제 성공 (PID 기록 삭제)")
         else:
-            print("   [FAIL] 락 파일 삭제 실패")
+            print("   [FAIL] 락 해제 실패")
         print()
 
         print("4. 락 해제 후 새 인스턴스 생성 시도...")
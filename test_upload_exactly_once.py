@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""업로드 1회 보장(중복 저장 방지) 테스트 스크립트
+
+가짜 업로더로 upload_rows의 결과 반영(settle), 업로드 의도 로그 복구, 아웃박스 큐를 점검한다.
+브라우저/ERP 없이 임시 폴더에서 실행된다.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(tempfile.mkdtemp(prefix="exactly_once_"))  # 원장/의도 로그/아카이브를 임시 폴더에 기록
+
+from core.intent_log import UploadIntentLog
+from core.outbox import UploadOutbox
+from modules.transformer import TransformerModule
+from modules.uploader import BaseUploader
+from modules.upload_worker import upload_rows
+
+failures = []
+
+
+def check(name, condition, detail=""):
+    print(f"   [{'OK' if condition else 'FAIL'}] {name}" + (f" ({detail})" if detail and not condition else ""))
+    if not condition:
+        failures.append(name)
+
+
+class FakeUploader(BaseUploader):
+    """F8 저장을 흉내 내는 업로더 (저장 횟수 기록, fail_on 청크에서 저장 전 예외)"""
+
+    def __init__(self, fail_on=None):
+        super().__init__()
+        self.saved_rows = []
+        self.calls = 0
+        self.fail_on = fail_on
+
+    def upload(self, paste_rows, before_save=None):
+        self.calls += 1
+        if before_save:
+            before_save()
+        if self.calls == self.fail_on:
+            raise RuntimeError("저장 결과 확인 중 연결 끊김")
+        self.saved_rows.extend(row[0] for row in paste_rows)
+        self.last_result = {"status": "saved", "failed_rows": {}, "success": len(paste_rows)}
+        return True
+
+
+class RaisingReconciler:
+    """n번째 submit에서 예외 (저장 후 부가 기록 실패 흉내)"""
+
+    def __init__(self, fail_at):
+        self.calls = 0
+        self.fail_at = fail_at
+
+    def submit(self, cycle_id, paste_rows, record_keys):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise AttributeError("reconciler 오류")
+
+
+class FlakyLedger(TransformerModule):
+    """n번째 원장 기록에서 예외"""
+
+    def __init__(self, records_file, fail_at):
+        super().__init__(records_file=records_file)
+        self.calls = 0
+        self.fail_at = fail_at
+
+    def add_uploaded_records(self, keys):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise OSError("디스크 쓰기 실패")
+        super().add_uploaded_records(keys)
+
+
+def make_rows(count, prefix):
+    paste_rows = [[f"{prefix}-{i}", "", "", "카드사", "1089", "", f"거래처{i}", "1,000", "", "", "", ""]
+                  for i in range(count)]
+    keys = [f"{prefix}-key-{i}" for i in range(count)]
+    raw = [{"date_raw": key, "auth_no": f"{prefix}-auth-{i}"} for i, key in enumerate(keys)]
+    return paste_rows, keys, raw
+
+
+def test_side_effect_failure_keeps_saved_rows():
+    print("1. 저장 후 부가 기록(대사 예약) 예외 -> 저장된 청크는 확정 유지")
+    paste_rows, keys, raw = make_rows(6, "t1")
+    transformer = TransformerModule(records_file="t1_records.json")
+    intent_log = UploadIntentLog("t1_intents.jsonl")
+    uploader = FakeUploader()
+    saved, settled = upload_rows(uploader, transformer, intent_log, paste_rows, keys, raw, "t1",
+                                 reconciler=RaisingReconciler(fail_at=2), chunk_size=2)
+    check("모든 청크 저장 확정", saved == list(range(6)), f"saved={saved}")
+    check("모든 행 결과 확정", settled == list(range(6)), f"settled={settled}")
+    check("원장에 6건 기록", transformer.load_uploaded_records() == set(keys))
+    check("미해결 의도 없음", not intent_log.pending())
+    check("ERP 저장 1회씩", len(uploader.saved_rows) == 6)
+    print()
+
+
+def test_ledger_failure_mid_upload():
+    print("2. 두 번째 청크 원장 기록 예외 -> 앞 청크 유지, 의도는 복구 대상, 재시도 시 중복 없음")
+    paste_rows, keys, raw = make_rows(6, "t2")
+    transformer = FlakyLedger("t2_records.json", fail_at=2)
+    intent_log = UploadIntentLog("t2_intents.jsonl")
+    uploader = FakeUploader()
+    saved, settled = upload_rows(uploader, transformer, intent_log, paste_rows, keys, raw, "t2", chunk_size=2)
+    check("ERP에 저장된 청크 1~2 확정", saved == [0, 1, 2, 3], f"saved={saved}")
+    check("미시도 청크 3만 미확정", settled == [0, 1, 2, 3], f"settled={settled}")
+    pending = intent_log.pending()
+    check("원장 미기록 청크의 의도는 pending", len(pending) == 1 and pending[0]["keys"] == keys[2:4])
+
+    # 메인 사이클 재시도와 같은 방식: 미확정 행만 다시 업로드
+    retry = [i for i in range(6) if i not in settled]
+    upload_rows(uploader, transformer, intent_log, [paste_rows[i] for i in retry], [keys[i] for i in retry],
+                raw, "t2", chunk_size=2)
+    check("재시도 후 ERP 저장 1회씩", sorted(uploader.saved_rows) == sorted(r[0] for r in paste_rows),
+          f"saved_rows={uploader.saved_rows}")
+
+    # 다음 사이클 복구: 회계반영 승인번호로 의도 정리 후 원장 기록
+    recovered = intent_log.recover({r["auth_no"] for r in raw}, transformer)
+    check("복구 후 미해결 키 없음", recovered == set())
+    check("복구 후 원장에 6건", transformer.load_uploaded_records() == set(keys))
+    check("복구 후 미해결 의도 없음", not intent_log.pending())
+    print()
+
+
+def test_upload_exception_after_first_chunk():
+    print("3. 두 번째 청크 F8 후 예외 -> 첫 청크 저장 유지, 중단 청크는 결과 미상(의도 보류)")
+    paste_rows, keys, raw = make_rows(6, "t3")
+    transformer = TransformerModule(records_file="t3_records.json")
+    intent_log = UploadIntentLog("t3_intents.jsonl")
+    saved, settled = upload_rows(FakeUploader(fail_on=2), transformer, intent_log, paste_rows, keys, raw,
+                                 "t3", chunk_size=2)
+    check("첫 청크 저장 확정", saved == [0, 1], f"saved={saved}")
+    check("중단 청크는 다시 올리지 않음", settled == [0, 1, 2, 3], f"settled={settled}")
+    check("중단 청크 의도 pending", [p["keys"] for p in intent_log.pending()] == [keys[2:4]])
+
+    print("   - 승인번호 없는 행은 수동 확인(MANUAL) + 알림")
+    notes = []
+
+    class Notifier:
+        def send_error_notification(self, msg, detail=""):
+            notes.append(msg)
+
+    manual_log = UploadIntentLog("t3_manual.jsonl")
+    intent_id = manual_log.begin(["m-1", "m-2"], ["", ""])
+    manual_log.release(intent_id)
+    manual_log.recover({"other"}, transformer, notifier=Notifier())
+    check("MANUAL 행 원장 기록", {"m-1", "m-2"} <= transformer.load_uploaded_records())
+    check("MANUAL 알림 발송", len(notes) == 1)
+    print()
+
+
+def test_outbox_fold_and_compact():
+    print("4. 아웃박스 put/ack/fail 재생 및 압축")
+    outbox = UploadOutbox("t4_outbox.jsonl")
+    paste_rows, keys, raw = make_rows(4, "t4")
+    outbox.put(keys, paste_rows, raw)
+    outbox.fail(keys[:2], "저장 미수행")
+    outbox.ack([keys[0]])
+    pending = outbox.pending()
+    check("ack된 행 제외", [p["key"] for p in pending] == keys[1:])
+    check("실패 횟수 누적", pending[0]["attempts"] == 1 and pending[0]["reason"] == "저장 미수행")
+    outbox.compact()
+    check("압축 후 동일 상태", outbox.pending() == pending)
+    outbox.ack(keys[1:])
+    outbox.compact()
+    check("모두 ack 후 파일 삭제", not outbox.queue_file.exists())
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("업로드 1회 보장 테스트")
+    print("=" * 70)
+    print()
+    test_side_effect_failure_keeps_saved_rows()
+    test_ledger_failure_mid_upload()
+    test_upload_exception_after_first_chunk()
+    test_outbox_fold_and_compact()
+    print("=" * 70)
+    if failures:
+        print(f"테스트 실패: {len(failures)}건")
+        for name in failures:
+            print(f"   - {name}")
+    else:
+        print("테스트 완료: 모든 테스트 통과")
+    print("=" * 70)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""단계별 소요 시간 통계 (traces/ 구간 기록 기준 p50/p95/p99)
+
+사용 예:
+    python trace_report.py --date 2026-01-14
+    python trace_report.py --from 2026-01-10 --to 2026-01-14 --name stage.
+    python trace_report.py --name ReaderModule --csv reader.csv
+"""
+
+import argparse
+import csv
+import sys
+from datetime import date
+from core.tracing import tracer, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description="단계별 소요 시간 통계")
+    parser.add_argument("--date", type=date.fromisoformat, help="일자 (YYYY-MM-DD)")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="시작 일자")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="종료 일자")
+    parser.add_argument("--name", help="구간 이름 (앞부분 일치, 예: stage. / ReaderModule)")
+    parser.add_argument("--csv", help="결과를 CSV로 저장")
+    args = parser.parse_args()
+
+    records = tracer.load(args.date or args.date_from, args.date or args.date_to)
+    if args.name:
+        records = [r for r in records if r["name"].startswith(args.name)]
+    if not records:
+        print("조건에 맞는 구간 기록이 없습니다.")
+        return 0
+
+    rows = summarize(records)
+    header = ("name", "count", "errors", "p50_s", "p95_s", "p99_s", "max_s")
+    table = [(name, count, errors, *(round(ms / 1000, 2) for ms in stats)) for name, count, errors, *stats in rows]
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(table)
+        print(f"{len(table)}개 구간 저장: {args.csv}")
+        return 0
+
+    width = max(len(row[0]) for row in table)
+    print(f"{'구간':<{width}}  {'건수':>6}  {'오류':>4}  {'p50(s)':>8}  {'p95(s)':>8}  {'p99(s)':>8}  {'최대(s)':>8}")
+    for name, count, errors, p50, p95, p99, longest in table:
+        print(f"{name:<{width}}  {count:>6}  {errors:>4}  {p50:>8.2f}  {p95:>8.2f}  {p99:>8.2f}  {longest:>8.2f}")
+    print()
+    print(f"사이클 {len({r['cycle'] for r in records if r.get('cycle')})}회 / 구간 {len(records)}건")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,11 +29,23 @@ URLS = config.get("urls", {})
 LOGIN_URL = URLS.get("login", "https://login.ecount.com/")
 PAYMENT_QUERY_HASH = URLS.get("payment_query_hash", "menuType=MENUTREE_000004&menuSeq=MENUTREE_002905&groupSeq=MENUTREE_000030&prgId=E040254&depth=4")
 DEPOSIT_REPORT_HASH = URLS.get("deposit_report_hash", "menuType=MENUTREE_000001&menuSeq=MENUTREE_000069&groupSeq=MENUTREE_000010&prgId=E010403&depth=3")
+CUSTOMER_LIST_HASH = URLS.get("customer_list_hash", "")  # 거래처등록 목록 (비어 있으면 캐시만 사용)
 
 # 모드별 설정
 BROWSER_CONFIG = config.get("browser", {})
 SCHEDULE_CONFIG = config.get("schedule", {})
 NOTIFICATION_CONFIG = config.get("notification", {})
+CUSTOMER_MASTER_CONFIG = config.get("customer_master", {})
+TRANSFORM_CONFIG = config.get("transform", {})
+ARCHIVE_CONFIG = config.get("archive", {})
+UPLOAD_CONFIG = config.get("upload", {})
+RECONCILE_CONFIG = config.get("reconcile", {})
+TENANTS = config.get("tenants", [])  # 다중 회사 모드: [{"name", "credentials", "data_dir"}, ...]
+MULTI_TENANT_CONFIG = config.get("multi_tenant", {})
+CYCLE_CONFIG = config.get("cycle", {})  # 단계별 재시도 / 체크포인트
+BACKFILL_CONFIG = config.get("backfill", {})  # 기간 일괄 처리 (backfill.py)
+TRACING_CONFIG = config.get("tracing", {})  # 단계별 구간 기록 (trace_report.py)
+METRICS_CONFIG = config.get("metrics", {})  # Prometheus 지표 엔드포인트
 
 # 레거시 호환 및 간축 변수
 # mode가 'production'인 경우에만 headless를 기본값으로 하거나 명시적 설정 따름
@@ -14,6 +14,7 @@ from datetime import datetime, timedelta
 
 # 설정
 HEARTBEAT_FILE = Path("heartbeat.txt")
+LOCK_FILE = Path("runtime.lock")
 CHECK_INTERVAL = 300  # 5분마다 체크
 TIMEOUT_MINUTES = 60  # 60분 동안 업데이트 없으면 정지로 판단
 
@@ -35,15 +36,32 @@ def check_heartbeat():
     except Exception as e:
         return None, f"하트비트 파일 읽기 실패: {e}"
 
+def read_orchestrator_pid():
+    """하트비트(PID: n) 또는 runtime.lock에서 오케스트레이터 PID 확인"""
+    try:
+        for line in HEARTBEAT_FILE.read_text(encoding='utf-8').splitlines():
+            if line.startswith("PID:"):
+                return int(line.split(":", 1)[1])
+    except (OSError, ValueError):
+        pass
+    try:
+        return int(LOCK_FILE.read_text().strip())
+    except (OSError, ValueError):
+        return None
+
 def kill_and_restart():
     """프로세스 종료 및 재시작"""
     print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 프로세스 재시작 시도...")
 
     try:
-        # 모든 pythonw 프로세스 종료
-        subprocess.run(['taskkill', '/F', '/IM', 'pythonw.exe', '/T'],
-                      capture_output=True, text=True)
-        print("  - 기존 프로세스 종료 완료")
+        # 오케스트레이터 PID 트리만 종료 (브라우저 워커 포함, 다른 Python 프로세스는 유지)
+        pid = read_orchestrator_pid()
+        if pid:
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)],
+                          capture_output=True, text=True)
+            print(f"  - 기존 프로세스 종료 완료 (PID: {pid})")
+        else:
+            print("  - 종료할 프로세스 PID를 찾지 못함")
 
         # 5초 대기
         time.sleep(5)